@@ -5,16 +5,23 @@ Provides comprehensive configuration with validation, secrets management,
 environment-specific settings, and feature flags.
 """
 
+import copy
 import os
 import secrets
 from enum import Enum
-from functools import lru_cache
+from functools import cache, cached_property, lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Union
 
-from pydantic import Field, SecretStr, field_validator, model_validator
+from dotenv import dotenv_values
+from pydantic import Field, PrivateAttr, SecretStr, field_validator, model_validator
 from pydantic.networks import AnyHttpUrl, PostgresDsn
-from pydantic_settings import BaseSettings
+from pydantic_settings import (
+    BaseSettings,
+    DotEnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
 
 from .exceptions import InvalidConfigurationError, MissingConfigurationError
 
@@ -36,7 +43,57 @@ class LogLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
-class FeatureFlags(BaseSettings):
+ENV_FILE = ".env"
+
+
+@lru_cache(maxsize=1)
+def _load_env() -> Dict[str, Optional[str]]:
+    """Parse the dotenv file once per process for all settings classes."""
+    if not Path(ENV_FILE).is_file():
+        return {}
+    return dotenv_values(ENV_FILE, encoding="utf-8")
+
+
+class _CachedDotEnvSource(DotEnvSettingsSource):
+    """Dotenv source that reads from the shared ``_load_env`` cache."""
+    
+    def _load_env_vars(self) -> Dict[str, Optional[str]]:
+        env_vars = _load_env()
+        if self.case_sensitive:
+            return dict(env_vars)
+        return {key.lower(): value for key, value in env_vars.items()}
+
+
+class _BaseEnvSettings(BaseSettings):
+    """Base for all settings classes; swaps in the cached dotenv source."""
+    
+    # Shared by every settings class; subclasses only set their env_prefix.
+    # They all read the same .env, so keys owned by other prefixes are ignored.
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE,
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
+    
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return (
+            init_settings,
+            env_settings,
+            _CachedDotEnvSource(settings_cls),
+            file_secret_settings,
+        )
+
+
+class FeatureFlags(_BaseEnvSettings):
     """Feature flags for runtime configuration."""
     
     # Data processing features
@@ -68,12 +125,24 @@ class FeatureFlags(BaseSettings):
     enable_audit_logging: bool = True
     enable_input_validation: bool = True
     
-    class Config:
-        env_prefix = "FEATURE_"
-        env_file = ".env"
+    _enabled_count: int = PrivateAttr(default=0)
+    
+    @model_validator(mode='after')
+    def count_enabled_features(self):
+        """Count enabled flags once; flags don't change after construction."""
+        self._enabled_count = sum(
+            1 for name in type(self).model_fields if getattr(self, name) is True
+        )
+        return self
+    
+    def enabled_count(self) -> int:
+        """Number of feature flags that are switched on."""
+        return self._enabled_count
+    
+    model_config = SettingsConfigDict(env_prefix="FEATURE_")
 
 
-class SecuritySettings(BaseSettings):
+class SecuritySettings(_BaseEnvSettings):
     """Security-related configuration."""
     
     # API Security
@@ -92,12 +161,10 @@ class SecuritySettings(BaseSettings):
     jwt_secret: Optional[SecretStr] = None
     encryption_key: Optional[SecretStr] = None
     
-    class Config:
-        env_prefix = "SECURITY_"
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_prefix="SECURITY_")
 
 
-class DatabaseSettings(BaseSettings):
+class DatabaseSettings(_BaseEnvSettings):
     """Database configuration with validation."""
     
     # PostgreSQL connection
@@ -109,15 +176,30 @@ class DatabaseSettings(BaseSettings):
     postgres_schema: str = "public"
     
     # Connection pool settings
+    # One process opens up to max + read_max + max(5, max // 2) (queue
+    # worker) connections; size these against Postgres max_connections
+    # times the number of replicas
     postgres_min_connections: int = Field(2, ge=1, le=50)
     postgres_max_connections: int = Field(10, ge=1, le=100)
     postgres_connection_timeout: float = Field(30.0, ge=1.0, le=300.0)
     postgres_command_timeout: float = Field(60.0, ge=1.0, le=3600.0)
+    postgres_statement_cache_size: int = Field(1024, ge=0, le=100000)
+    postgres_max_inactive_connection_lifetime: float = Field(300.0, ge=0.0, le=3600.0)
+    
+    # Separate pool for read-only lineage queries
+    postgres_read_min_connections: int = Field(2, ge=1, le=50)
+    postgres_read_max_connections: int = Field(10, ge=1, le=100)
+    lineage_listing_cache_ttl: float = Field(10.0, ge=0.0, le=300.0)  # Used when FEATURE_ENABLE_REQUEST_CACHING is on
     
     # DuckDB settings
+    duckdb_database_path: str = ":memory:"  # A file path keeps the database across restarts
     duckdb_memory_limit: str = "75%"
     duckdb_threads: int = Field(4, ge=1, le=32)
     duckdb_enable_optimizer: bool = True
+    duckdb_query_cache_size: int = Field(1024, ge=0, le=100000)  # Used when FEATURE_ENABLE_REQUEST_CACHING is on
+    duckdb_query_cache_ttl: float = Field(60.0, ge=1.0, le=3600.0)
+    # Bounds how long DDL from another replica or client can go unseen; 0 disables
+    duckdb_schema_cache_ttl: float = Field(5.0, ge=0.0, le=300.0)
     
     # DuckLake specific settings
     ducklake_metadata_schema: str = "main"
@@ -140,6 +222,13 @@ class DatabaseSettings(BaseSettings):
             raise ValueError("max_connections must be >= min_connections")
         return v
     
+    @field_validator("postgres_read_max_connections")
+    @classmethod
+    def validate_read_max_connections(cls, v, info):
+        if info.data and "postgres_read_min_connections" in info.data and v < info.data["postgres_read_min_connections"]:
+            raise ValueError("read_max_connections must be >= read_min_connections")
+        return v
+    
     @field_validator("ducklake_snapshot_version")
     @classmethod
     def validate_snapshot_version(cls, v):
@@ -162,7 +251,7 @@ class DatabaseSettings(BaseSettings):
         
         return self
     
-    @property
+    @cached_property
     def postgres_dsn(self) -> str:
         """Build PostgreSQL DSN."""
         return f"postgresql://{self.postgres_user}:{self.postgres_password.get_secret_value()}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
@@ -182,12 +271,10 @@ class DatabaseSettings(BaseSettings):
             "connection_timeout": self.ducklake_connection_timeout
         }
     
-    class Config:
-        env_prefix = "DB_"
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_prefix="DB_")
 
 
-class StorageSettings(BaseSettings):
+class StorageSettings(_BaseEnvSettings):
     """Storage configuration for MinIO/S3."""
     
     # MinIO/S3 connection
@@ -206,10 +293,15 @@ class StorageSettings(BaseSettings):
     max_file_size: int = Field(100 * 1024 * 1024, ge=1024)  # 100MB default
     allowed_extensions: Set[str] = {".parquet", ".csv", ".json", ".txt", ".log"}
     upload_timeout: float = Field(300.0, ge=10.0, le=3600.0)  # 5 minutes
+    presigned_url_expiry: int = Field(900, ge=60, le=7 * 24 * 3600)  # 15 minutes
     
     # Performance settings
-    multipart_threshold: int = Field(8 * 1024 * 1024, ge=1024 * 1024)  # 8MB
+    multipart_threshold: int = Field(16 * 1024 * 1024, ge=1024 * 1024)  # 16MB
+    multipart_chunksize: int = Field(16 * 1024 * 1024, ge=5 * 1024 * 1024)  # 16MB, S3 minimum part is 5MB
     max_concurrency: int = Field(10, ge=1, le=50)
+    max_pool_connections: int = Field(100, ge=1, le=1000)
+    keepalive_timeout: float = Field(60.0, ge=1.0, le=3600.0)  # Idle pooled connection lifetime
+    max_retry_attempts: int = Field(3, ge=0, le=10)
     
     @field_validator("minio_endpoint")
     @classmethod
@@ -218,12 +310,10 @@ class StorageSettings(BaseSettings):
             raise ValueError("MinIO endpoint must include port (e.g., localhost:9000)")
         return v
     
-    class Config:
-        env_prefix = "STORAGE_"
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_prefix="STORAGE_")
 
 
-class MonitoringSettings(BaseSettings):
+class MonitoringSettings(_BaseEnvSettings):
     """Monitoring and observability configuration."""
     
     # OpenLineage
@@ -249,12 +339,10 @@ class MonitoringSettings(BaseSettings):
     slow_query_threshold: float = Field(1.0, ge=0.1, le=10.0)  # seconds
     request_timeout: float = Field(30.0, ge=1.0, le=300.0)  # seconds
     
-    class Config:
-        env_prefix = "MONITORING_"
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_prefix="MONITORING_")
 
 
-class QueueSettings(BaseSettings):
+class QueueSettings(_BaseEnvSettings):
     """Queue processing configuration."""
     
     # PGMQ settings
@@ -263,6 +351,11 @@ class QueueSettings(BaseSettings):
     queue_retry_attempts: int = Field(3, ge=1, le=10)
     queue_retry_delay: float = Field(1.0, ge=0.1, le=60.0)
     
+    # Lineage enqueue batching
+    async_insert_max_rows: int = Field(100, ge=1, le=10000)
+    # Events held while sends fail; further enqueues are refused once full
+    lineage_buffer_max_events: int = Field(10000, ge=1, le=1000000)
+    
     # Dead letter queue settings
     dlq_enabled: bool = True
     dlq_max_age: int = Field(7 * 24 * 3600, ge=3600)  # 7 days in seconds
@@ -271,12 +364,10 @@ class QueueSettings(BaseSettings):
     worker_count: int = Field(2, ge=1, le=10)
     worker_timeout: float = Field(60.0, ge=10.0, le=600.0)
     
-    class Config:
-        env_prefix = "QUEUE_"
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_prefix="QUEUE_")
 
 
-class Settings(BaseSettings):
+class Settings(_BaseEnvSettings):
     """Main application settings with comprehensive validation."""
     
     # Environment
@@ -303,10 +394,19 @@ class Settings(BaseSettings):
     security: SecuritySettings = Field(default_factory=SecuritySettings)
     features: FeatureFlags = Field(default_factory=FeatureFlags)
     
+    # Environment checks resolved once at construction
+    _is_dev: bool = PrivateAttr(default=False)
+    _is_prod: bool = PrivateAttr(default=False)
+    _is_test: bool = PrivateAttr(default=False)
+    
     @model_validator(mode='after')
     def validate_environment_settings(self):
         """Validate settings based on environment."""
-        if self.environment == Environment.PRODUCTION:
+        self._is_dev = self.environment is Environment.DEVELOPMENT
+        self._is_prod = self.environment is Environment.PRODUCTION
+        self._is_test = self.environment is Environment.TESTING
+        
+        if self._is_prod:
             # Production-specific validations
             if self.debug:
                 raise ValueError("Debug mode must be disabled in production")
@@ -316,28 +416,29 @@ class Settings(BaseSettings):
         
         return self
     
-    @field_validator("debug")
-    @classmethod
-    def validate_debug_in_production(cls, v, info):
-        """Ensure debug is disabled in production."""
-        if info.data and info.data.get("environment") == Environment.PRODUCTION and v:
-            raise ValueError("Debug mode must be disabled in production")
-        return v
-    
     def is_development(self) -> bool:
         """Check if running in development mode."""
-        return self.environment == Environment.DEVELOPMENT
+        return self._is_dev
     
     def is_production(self) -> bool:
         """Check if running in production mode."""
-        return self.environment == Environment.PRODUCTION
+        return self._is_prod
     
     def is_testing(self) -> bool:
         """Check if running in testing mode."""
-        return self.environment == Environment.TESTING
+        return self._is_test
     
     def get_config_summary(self) -> Dict[str, Any]:
-        """Get a summary of configuration (without secrets)."""
+        """Get a summary of configuration (without secrets).
+        
+        The cached summary itself, shared by every caller: serialize it,
+        don't modify it.
+        """
+        return self.config_summary
+    
+    @cached_property
+    def config_summary(self) -> Dict[str, Any]:
+        """Configuration summary, built once per Settings instance."""
         return {
             "environment": self.environment.value,
             "debug": self.debug,
@@ -356,17 +457,12 @@ class Settings(BaseSettings):
                 "secure": self.storage.minio_secure,
                 "default_bucket": self.storage.default_bucket
             },
-            "features_enabled": sum(1 for v in self.features.__dict__.values() if v is True),
+            "features_enabled": self.features.enabled_count(),
             "monitoring_enabled": self.monitoring.metrics_enabled
         }
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
 
 
-@lru_cache()
+@cache
 def get_settings() -> Settings:
     """Get cached settings instance with validation."""
     try:
@@ -378,19 +474,37 @@ def get_settings() -> Settings:
             raise InvalidConfigurationError("general", str(e), "valid configuration")
 
 
+def clear_settings_cache() -> None:
+    """Drop the cached settings and parsed ``.env`` so the next call re-reads them."""
+    global _validation_status
+    _load_env.cache_clear()
+    get_settings.cache_clear()
+    _validation_status = None
+
+
+# Only a successful validation is kept; failures are re-checked on each call
+_validation_status: Optional[Dict[str, Any]] = None
+
+
 def validate_configuration() -> Dict[str, Any]:
     """Validate current configuration and return status."""
-    try:
-        settings = get_settings()
-        return {
-            "valid": True,
-            "environment": settings.environment.value,
-            "config_summary": settings.get_config_summary(),
-            "validation_errors": []
-        }
-    except Exception as e:
-        return {
-            "valid": False,
-            "error": str(e),
-            "validation_errors": [str(e)]
-        }
\ No newline at end of file
+    global _validation_status
+    if _validation_status is None:
+        try:
+            settings = get_settings()
+            _validation_status = {
+                "valid": True,
+                "environment": settings.environment.value,
+                "config_summary": settings.get_config_summary(),
+                "validation_errors": []
+            }
+        except Exception as e:
+            # Not cached, so a transient failure doesn't stick for the process lifetime
+            return {
+                "valid": False,
+                "error": str(e),
+                "validation_errors": [str(e)]
+            }
+    
+    # A copy: callers may modify it, the cached status is shared
+    return copy.deepcopy(_validation_status)
\ No newline at end of file
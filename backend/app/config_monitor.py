@@ -13,8 +13,6 @@ from datetime import datetime, timedelta
 
 import asyncpg
 from loguru import logger
-from minio import Minio
-from minio.error import S3Error
 
 from .config import get_settings, validate_configuration
 from .exceptions import (
@@ -23,6 +21,7 @@ from .exceptions import (
     MinIOConnectionError,
     InvalidConfigurationError
 )
+from .storage import storage_manager
 
 
 class ConfigurationMonitor:
@@ -37,7 +36,7 @@ class ConfigurationMonitor:
         
     def get_config_hash(self) -> str:
         """Generate hash of current configuration for change detection."""
-        config_dict = self.settings.dict()
+        config_dict = self.settings.model_dump()
         # Remove dynamic fields that shouldn't trigger config change detection
         config_dict.pop('features', None)  # Feature flags can change dynamically
         
@@ -90,17 +89,15 @@ class ConfigurationMonitor:
         """Check MinIO/S3 storage connectivity."""
         start_time = time.time()
         try:
-            # Create MinIO client
-            client = Minio(
-                self.settings.storage.minio_endpoint,
-                access_key=self.settings.storage.minio_access_key,
-                secret_key=self.settings.storage.minio_secret_key.get_secret_value(),
-                secure=self.settings.storage.minio_secure
-            )
+            # Reuse the app's async S3 client; a sync client here would
+            # block the event loop for the whole round trip
+            if storage_manager.client is None:
+                await storage_manager.initialize()
             
             # Test connectivity by listing buckets
-            buckets = list(client.list_buckets())
-            bucket_names = [bucket.name for bucket in buckets]
+            response = await storage_manager.client.list_buckets()
+            buckets = response.get("Buckets", [])
+            bucket_names = [bucket["Name"] for bucket in buckets]
             
             duration = time.time() - start_time
             
@@ -1,13 +1,89 @@
 from __future__ import annotations
+import asyncio
+import contextvars
 import duckdb
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterator, Optional
 
 from .config import get_settings
 from .main import log_event  # reuse structured logger
 
-# Global DuckDB connection
-con = duckdb.connect(database=":memory:", read_only=False)
+# Global DuckDB connection (in-memory unless DUCKDB_DATABASE_PATH points at a file)
+con = duckdb.connect(database=get_settings().database.duckdb_database_path, read_only=False)
+
+# DuckDB work gets its own threads, sized to DuckDB's thread budget, instead
+# of competing with every other sync handler for the anyio threadpool
+_duckdb_executor = ThreadPoolExecutor(
+    max_workers=get_settings().database.duckdb_threads,
+    thread_name_prefix="duckdb"
+)
+
+# Catalog selected with USE on the global connection; cursors don't inherit it
+_default_catalog: Optional[str] = None
+
+
+def use_catalog(name: str) -> None:
+    """USE a catalog on the global connection and on every cursor opened later."""
+    global _default_catalog
+    con.execute(f"USE {name};")
+    _default_catalog = name
+
+
+# One reusable cursor per thread, plus the catalog it has been switched to
+_thread_cursors = threading.local()
+
+
+def new_cursor() -> duckdb.DuckDBPyConnection:
+    """Open a fresh cursor on the shared database.
+
+    Each cursor has its own transaction and registered views, so concurrent
+    requests don't share (or race on) the global connection.
+    """
+    cursor = con.cursor()
+    if _default_catalog:
+        cursor.execute(f"USE {_default_catalog};")
+    return cursor
+
+
+@contextmanager
+def get_cursor() -> Iterator[duckdb.DuckDBPyConnection]:
+    """Borrow the calling thread's cursor on the shared database.
+
+    Worker threads are long-lived, so keeping one cursor per thread skips
+    cursor setup (and the USE) on every request. Statements that may leave
+    session state behind (arbitrary SQL) should use new_cursor() instead.
+    """
+    cursor = getattr(_thread_cursors, "cursor", None)
+    if cursor is None:
+        cursor = _thread_cursors.cursor = con.cursor()
+        _thread_cursors.catalog = None
+    if _thread_cursors.catalog != _default_catalog:
+        cursor.execute(f"USE {_default_catalog};")
+        _thread_cursors.catalog = _default_catalog
+    yield cursor
+
+
+async def run_duckdb(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking DuckDB call on the DuckDB executor."""
+    ctx = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_duckdb_executor, functools.partial(ctx.run, fn, *args, **kwargs))
+
+
+def duckdb_endpoint(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Make a blocking route handler async, running its body on the DuckDB executor.
+
+    functools.wraps keeps the original signature, so FastAPI still sees the
+    handler's parameters and return annotation.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await run_duckdb(fn, *args, **kwargs)
+    return wrapper
 
 
 def install_and_load_extensions() -> None:
@@ -99,11 +175,12 @@ def setup_ducklake() -> Dict[str, Any]:
     settings = get_settings()
     try:
         install_and_load_extensions()
+        con.execute(f"SET threads = {settings.database.duckdb_threads};")
         _create_postgres_secret(settings)
         data_path = _create_s3_secret(settings)
         _create_ducklake_secret(data_path)
         con.execute(_build_attach_clause(settings))
-        con.execute("USE ducklake;")
+        use_catalog("ducklake")
         log_event("INFO", "DuckLake attached (Postgres catalog)", data_path=data_path,
                   host=settings.database.postgres_host, db=settings.database.postgres_db)
         # Basic validation
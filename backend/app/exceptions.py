@@ -5,13 +5,28 @@ Provides specific exception classes for different error categories to improve
 error handling, debugging, and user experience.
 """
 
-from typing import Any, Dict, Optional, List
+from typing import Any, ClassVar, Dict, Optional, List
 from uuid import UUID
 
 
 class DuckLakeException(Exception):
     """Base exception for all DuckLake-specific errors."""
     
+    __slots__ = ("message", "error_code", "context", "cause")
+    
+    _CODE: ClassVar[Optional[str]] = None
+    _TEMPLATE: ClassVar[Dict[str, Any]] = {
+        "error_type": "DuckLakeException",
+        "message": None,
+        "error_code": None,
+        "context": None,
+        "cause": None
+    }
+    
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._TEMPLATE = {**DuckLakeException._TEMPLATE, "error_type": cls.__name__, "error_code": cls._CODE}
+    
     def __init__(
         self, 
         message: str, 
@@ -21,34 +36,38 @@ class DuckLakeException(Exception):
     ):
         super().__init__(message)
         self.message = message
-        self.error_code = error_code
+        self.error_code = error_code if error_code is not None else self._CODE
         self.context = context or {}
         self.cause = cause
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to dictionary for JSON serialization."""
-        return {
-            "error_type": self.__class__.__name__,
+        result = {
+            **self._TEMPLATE,
             "message": self.message,
-            "error_code": self.error_code,
             "context": self.context,
-            "cause": str(self.cause) if self.cause else None
+            "cause": None if self.cause is None else str(self.cause)
         }
+        if self.error_code != self._CODE:
+            result["error_code"] = self.error_code
+        return result
 
 
 # Database-related exceptions
 class DatabaseException(DuckLakeException):
     """Base class for database-related errors."""
-    pass
+    __slots__ = ()
 
 
 class DatabaseConnectionError(DatabaseException):
     """Raised when database connection fails."""
     
+    __slots__ = ()
+    _CODE = "DB_CONNECTION_FAILED"
+    
     def __init__(self, database: str, cause: Optional[Exception] = None):
         super().__init__(
             f"Failed to connect to database: {database}",
-            error_code="DB_CONNECTION_FAILED",
             context={"database": database},
             cause=cause
         )
@@ -57,20 +76,28 @@ class DatabaseConnectionError(DatabaseException):
 class DatabaseQueryError(DatabaseException):
     """Raised when database query execution fails."""
     
+    __slots__ = ()
+    _CODE = "DB_QUERY_FAILED"
+    
     def __init__(
         self, 
         query: str, 
         table_name: Optional[str] = None,
-        cause: Optional[Exception] = None
+        cause: Optional[Exception] = None,
+        log_query: bool = False
     ):
+        query_length = len(query)
+        preview = query if query_length <= 100 else f"{query[:100]}..."
+        context = {
+            "table_name": table_name,
+            "query_length": query_length,
+            "query_preview": preview
+        }
+        if log_query:
+            context["query"] = query
         super().__init__(
-            f"Database query failed: {query[:100]}{'...' if len(query) > 100 else ''}",
-            error_code="DB_QUERY_FAILED",
-            context={
-                "query": query,
-                "table_name": table_name,
-                "query_length": len(query)
-            },
+            f"Database query failed: {preview}",
+            context=context,
             cause=cause
         )
 
@@ -78,10 +105,12 @@ class DatabaseQueryError(DatabaseException):
 class TableNotFoundError(DatabaseException):
     """Raised when requested table does not exist."""
     
+    __slots__ = ()
+    _CODE = "TABLE_NOT_FOUND"
+    
     def __init__(self, table_name: str):
         super().__init__(
             f"Table '{table_name}' not found",
-            error_code="TABLE_NOT_FOUND",
             context={"table_name": table_name}
         )
 
@@ -89,10 +118,12 @@ class TableNotFoundError(DatabaseException):
 class TableAlreadyExistsError(DatabaseException):
     """Raised when trying to create a table that already exists."""
     
+    __slots__ = ()
+    _CODE = "TABLE_ALREADY_EXISTS"
+    
     def __init__(self, table_name: str):
         super().__init__(
             f"Table '{table_name}' already exists",
-            error_code="TABLE_ALREADY_EXISTS",
             context={"table_name": table_name}
         )
 
@@ -100,6 +131,9 @@ class TableAlreadyExistsError(DatabaseException):
 class SchemaValidationError(DatabaseException):
     """Raised when data doesn't match expected schema."""
     
+    __slots__ = ()
+    _CODE = "SCHEMA_VALIDATION_FAILED"
+    
     def __init__(
         self, 
         table_name: str, 
@@ -108,7 +142,6 @@ class SchemaValidationError(DatabaseException):
     ):
         super().__init__(
             f"Schema validation failed for table '{table_name}': {'; '.join(validation_errors)}",
-            error_code="SCHEMA_VALIDATION_FAILED",
             context={
                 "table_name": table_name,
                 "expected_schema": expected_schema,
@@ -120,16 +153,18 @@ class SchemaValidationError(DatabaseException):
 # Storage-related exceptions
 class StorageException(DuckLakeException):
     """Base class for storage-related errors."""
-    pass
+    __slots__ = ()
 
 
 class MinIOConnectionError(StorageException):
     """Raised when MinIO connection fails."""
     
+    __slots__ = ()
+    _CODE = "MINIO_CONNECTION_FAILED"
+    
     def __init__(self, endpoint: str, cause: Optional[Exception] = None):
         super().__init__(
             f"Failed to connect to MinIO at {endpoint}",
-            error_code="MINIO_CONNECTION_FAILED",
             context={"endpoint": endpoint},
             cause=cause
         )
@@ -138,10 +173,12 @@ class MinIOConnectionError(StorageException):
 class BucketNotFoundError(StorageException):
     """Raised when requested bucket does not exist."""
     
+    __slots__ = ()
+    _CODE = "BUCKET_NOT_FOUND"
+    
     def __init__(self, bucket_name: str):
         super().__init__(
             f"Bucket '{bucket_name}' not found",
-            error_code="BUCKET_NOT_FOUND",
             context={"bucket_name": bucket_name}
         )
 
@@ -149,10 +186,12 @@ class BucketNotFoundError(StorageException):
 class ObjectNotFoundError(StorageException):
     """Raised when requested object does not exist."""
     
+    __slots__ = ()
+    _CODE = "OBJECT_NOT_FOUND"
+    
     def __init__(self, bucket_name: str, object_name: str):
         super().__init__(
             f"Object '{object_name}' not found in bucket '{bucket_name}'",
-            error_code="OBJECT_NOT_FOUND",
             context={"bucket_name": bucket_name, "object_name": object_name}
         )
 
@@ -160,11 +199,13 @@ class ObjectNotFoundError(StorageException):
 class StorageQuotaExceededError(StorageException):
     """Raised when storage quota is exceeded."""
     
+    __slots__ = ()
+    _CODE = "STORAGE_QUOTA_EXCEEDED"
+    
     def __init__(self, bucket_name: str, requested_size: int, available_size: int):
         super().__init__(
             f"Storage quota exceeded for bucket '{bucket_name}': "
             f"requested {requested_size} bytes, available {available_size} bytes",
-            error_code="STORAGE_QUOTA_EXCEEDED",
             context={
                 "bucket_name": bucket_name,
                 "requested_size": requested_size,
@@ -176,16 +217,18 @@ class StorageQuotaExceededError(StorageException):
 # Lineage-related exceptions
 class LineageException(DuckLakeException):
     """Base class for lineage-related errors."""
-    pass
+    __slots__ = ()
 
 
 class LineageEventValidationError(LineageException):
     """Raised when lineage event validation fails."""
     
+    __slots__ = ()
+    _CODE = "LINEAGE_VALIDATION_FAILED"
+    
     def __init__(self, event_type: str, validation_errors: List[str]):
         super().__init__(
             f"Lineage event validation failed for {event_type}: {'; '.join(validation_errors)}",
-            error_code="LINEAGE_VALIDATION_FAILED",
             context={
                 "event_type": event_type,
                 "validation_errors": validation_errors
@@ -196,17 +239,23 @@ class LineageEventValidationError(LineageException):
 class JobRunNotFoundError(LineageException):
     """Raised when requested job run does not exist."""
     
+    __slots__ = ()
+    _CODE = "JOB_RUN_NOT_FOUND"
+    
     def __init__(self, job_name: str, run_id: UUID):
+        run_id_str = str(run_id)
         super().__init__(
-            f"Job run '{run_id}' not found for job '{job_name}'",
-            error_code="JOB_RUN_NOT_FOUND",
-            context={"job_name": job_name, "run_id": str(run_id)}
+            f"Job run '{run_id_str}' not found for job '{job_name}'",
+            context={"job_name": job_name, "run_id": run_id_str}
         )
 
 
 class LineageProcessingError(LineageException):
     """Raised when lineage event processing fails."""
     
+    __slots__ = ()
+    _CODE = "LINEAGE_PROCESSING_FAILED"
+    
     def __init__(
         self, 
         event_type: str, 
@@ -214,13 +263,13 @@ class LineageProcessingError(LineageException):
         run_id: UUID,
         cause: Optional[Exception] = None
     ):
+        run_id_str = str(run_id)
         super().__init__(
-            f"Failed to process {event_type} event for job '{job_name}', run '{run_id}'",
-            error_code="LINEAGE_PROCESSING_FAILED",
+            f"Failed to process {event_type} event for job '{job_name}', run '{run_id_str}'",
             context={
                 "event_type": event_type,
                 "job_name": job_name,
-                "run_id": str(run_id)
+                "run_id": run_id_str
             },
             cause=cause
         )
@@ -229,16 +278,18 @@ class LineageProcessingError(LineageException):
 # Queue-related exceptions
 class QueueException(DuckLakeException):
     """Base class for queue-related errors."""
-    pass
+    __slots__ = ()
 
 
 class QueueConnectionError(QueueException):
     """Raised when queue connection fails."""
     
+    __slots__ = ()
+    _CODE = "QUEUE_CONNECTION_FAILED"
+    
     def __init__(self, queue_name: str, cause: Optional[Exception] = None):
         super().__init__(
             f"Failed to connect to queue: {queue_name}",
-            error_code="QUEUE_CONNECTION_FAILED",
             context={"queue_name": queue_name},
             cause=cause
         )
@@ -247,6 +298,9 @@ class QueueConnectionError(QueueException):
 class MessageProcessingError(QueueException):
     """Raised when message processing fails."""
     
+    __slots__ = ()
+    _CODE = "MESSAGE_PROCESSING_FAILED"
+    
     def __init__(
         self, 
         queue_name: str, 
@@ -255,7 +309,6 @@ class MessageProcessingError(QueueException):
     ):
         super().__init__(
             f"Failed to process message {message_id} from queue {queue_name}",
-            error_code="MESSAGE_PROCESSING_FAILED",
             context={
                 "queue_name": queue_name,
                 "message_id": message_id
@@ -267,6 +320,9 @@ class MessageProcessingError(QueueException):
 class DeadLetterQueueError(QueueException):
     """Raised when dead letter queue operations fail."""
     
+    __slots__ = ()
+    _CODE = "DLQ_OPERATION_FAILED"
+    
     def __init__(
         self, 
         original_queue: str,
@@ -276,7 +332,6 @@ class DeadLetterQueueError(QueueException):
     ):
         super().__init__(
             f"Failed to move message {message_id} from {original_queue} to DLQ {dlq_name}",
-            error_code="DLQ_OPERATION_FAILED",
             context={
                 "original_queue": original_queue,
                 "dlq_name": dlq_name,
@@ -289,17 +344,19 @@ class DeadLetterQueueError(QueueException):
 # Configuration-related exceptions
 class ConfigurationException(DuckLakeException):
     """Base class for configuration-related errors."""
-    pass
+    __slots__ = ()
 
 
 class InvalidConfigurationError(ConfigurationException):
     """Raised when configuration is invalid."""
     
+    __slots__ = ()
+    _CODE = "INVALID_CONFIGURATION"
+    
     def __init__(self, config_key: str, config_value: Any, expected_type: str):
         super().__init__(
             f"Invalid configuration for '{config_key}': "
             f"expected {expected_type}, got {type(config_value).__name__}",
-            error_code="INVALID_CONFIGURATION",
             context={
                 "config_key": config_key,
                 "config_value": str(config_value),
@@ -312,10 +369,12 @@ class InvalidConfigurationError(ConfigurationException):
 class MissingConfigurationError(ConfigurationException):
     """Raised when required configuration is missing."""
     
+    __slots__ = ()
+    _CODE = "MISSING_CONFIGURATION"
+    
     def __init__(self, config_key: str):
         super().__init__(
             f"Missing required configuration: {config_key}",
-            error_code="MISSING_CONFIGURATION",
             context={"config_key": config_key}
         )
 
@@ -323,17 +382,19 @@ class MissingConfigurationError(ConfigurationException):
 # Resource-related exceptions
 class ResourceException(DuckLakeException):
     """Base class for resource-related errors."""
-    pass
+    __slots__ = ()
 
 
 class MemoryLimitExceededError(ResourceException):
     """Raised when memory limit is exceeded."""
     
+    __slots__ = ()
+    _CODE = "MEMORY_LIMIT_EXCEEDED"
+    
     def __init__(self, current_usage: int, limit: int, component: str):
         super().__init__(
             f"Memory limit exceeded for {component}: "
             f"using {current_usage} bytes, limit {limit} bytes",
-            error_code="MEMORY_LIMIT_EXCEEDED",
             context={
                 "current_usage": current_usage,
                 "limit": limit,
@@ -347,10 +408,12 @@ class MemoryLimitExceededError(ResourceException):
 class TimeoutError(ResourceException):
     """Raised when operation times out."""
     
+    __slots__ = ()
+    _CODE = "OPERATION_TIMEOUT"
+    
     def __init__(self, operation: str, timeout_seconds: float):
         super().__init__(
             f"Operation '{operation}' timed out after {timeout_seconds} seconds",
-            error_code="OPERATION_TIMEOUT",
             context={
                 "operation": operation,
                 "timeout_seconds": timeout_seconds
@@ -361,6 +424,9 @@ class TimeoutError(ResourceException):
 class RateLimitExceededError(ResourceException):
     """Raised when rate limit is exceeded."""
     
+    __slots__ = ()
+    _CODE = "RATE_LIMIT_EXCEEDED"
+    
     def __init__(
         self, 
         operation: str, 
@@ -371,7 +437,6 @@ class RateLimitExceededError(ResourceException):
         super().__init__(
             f"Rate limit exceeded for {operation}: "
             f"{current_rate:.2f} ops/sec exceeds limit of {limit:.2f} ops/sec",
-            error_code="RATE_LIMIT_EXCEEDED",
             context={
                 "operation": operation,
                 "current_rate": current_rate,
@@ -384,12 +449,15 @@ class RateLimitExceededError(ResourceException):
 # Validation-related exceptions
 class ValidationException(DuckLakeException):
     """Base class for validation-related errors."""
-    pass
+    __slots__ = ()
 
 
 class DataValidationError(ValidationException):
     """Raised when data validation fails."""
     
+    __slots__ = ()
+    _CODE = "DATA_VALIDATION_FAILED"
+    
     def __init__(
         self, 
         field_name: str, 
@@ -399,7 +467,6 @@ class DataValidationError(ValidationException):
     ):
         super().__init__(
             f"Data validation failed for field '{field_name}': {validation_rule}",
-            error_code="DATA_VALIDATION_FAILED",
             context={
                 "field_name": field_name,
                 "field_value": str(field_value),
@@ -412,10 +479,12 @@ class DataValidationError(ValidationException):
 class RequestValidationError(ValidationException):
     """Raised when request validation fails."""
     
+    __slots__ = ()
+    _CODE = "REQUEST_VALIDATION_FAILED"
+    
     def __init__(self, errors: List[Dict[str, Any]]):
         error_messages = [f"{err['field']}: {err['message']}" for err in errors]
         super().__init__(
             f"Request validation failed: {'; '.join(error_messages)}",
-            error_code="REQUEST_VALIDATION_FAILED",
             context={"validation_errors": errors}
         ) 
\ No newline at end of file
@@ -2,14 +2,39 @@
 Instrumentation package for DuckLake application.
 
 Provides memory monitoring, performance tracking, and metrics collection.
+Submodules are imported on first attribute access (PEP 562), so consumers
+that only need one monitor don't pay for the other's dependencies.
 """
 
-from .memory import MemoryMonitor, memory_monitor
-from .performance import PerformanceMonitor, performance_monitor
+from importlib import import_module
+
+_LAZY_ATTRS = {
+    "MemoryMonitor": ".memory",
+    "memory_monitor": ".memory",
+    "setup_memory_monitoring": ".memory",
+    "PerformanceMonitor": ".performance",
+    "performance_monitor": ".performance",
+    "setup_performance_monitoring": ".performance",
+}
 
 __all__ = [
     "MemoryMonitor",
     "memory_monitor", 
+    "setup_memory_monitoring",
     "PerformanceMonitor",
-    "performance_monitor"
-] 
\ No newline at end of file
+    "performance_monitor",
+    "setup_performance_monitoring"
+]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -7,7 +7,9 @@ and comprehensive metrics collection.
 
 import time
 import asyncio
-from typing import Dict, Any, Optional, List, Callable, Set
+import itertools
+from collections import deque
+from typing import Dict, Any, Optional, List, Callable, Set, Deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from contextlib import asynccontextmanager, contextmanager
@@ -19,6 +21,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+from ..config import get_settings
+
 
 # Prometheus metrics
 REQUEST_COUNT = Counter('ducklake_requests_total', 'Total HTTP requests', ['method', 'endpoint', 'status'])
@@ -208,8 +212,15 @@ class PerformanceMonitor:
     """
     
     def __init__(self):
-        self.request_history: List[RequestMetrics] = []
-        self.active_requests: Dict[str, RequestMetrics] = {}
+        # Oldest first, so expiry is a popleft rather than a rebuild
+        self.request_history: Deque[RequestMetrics] = deque()
+        self.keep_history = get_settings().features.enable_performance_tracking
+        # In-flight requests are counted, not tracked: next() on a count is
+        # atomic under the GIL, and the request's own metrics travel with it
+        self._started = itertools.count(1)
+        self._finished = itertools.count(1)
+        self.requests_started = 0
+        self.requests_finished = 0
         self.throughput_stats: List[ThroughputStats] = []
         
         self.db_monitor = DatabasePerformanceMonitor()
@@ -218,16 +229,21 @@ class PerformanceMonitor:
         # Start throughput calculation task
         self._start_throughput_calculation()
     
-    def start_request(self, request_id: str, method: str, endpoint: str, request_size: int = 0) -> None:
-        """Start tracking a request."""
+    @property
+    def active_requests(self) -> int:
+        """Number of requests started but not yet finished."""
+        return self.requests_started - self.requests_finished
+    
+    def start_request(self, request_id: str, method: str, endpoint: str, request_size: int = 0) -> RequestMetrics:
+        """Start tracking a request; pass the result back to finish_request."""
         metrics = RequestMetrics(
             method=method,
             endpoint=endpoint,
             request_size=request_size
         )
         
-        self.active_requests[request_id] = metrics
-        ACTIVE_REQUESTS.set(len(self.active_requests))
+        self.requests_started = next(self._started)
+        ACTIVE_REQUESTS.inc()
         
         logger.debug(
             "Request started",
@@ -235,9 +251,12 @@ class PerformanceMonitor:
             method=method,
             endpoint=endpoint
         )
+        
+        return metrics
     
     def finish_request(
         self, 
+        metrics: RequestMetrics,
         request_id: str, 
         status_code: int, 
         response_size: int = 0,
@@ -245,11 +264,9 @@ class PerformanceMonitor:
         query_duration: float = 0.0
     ) -> float:
         """Finish tracking a request and return duration."""
-        if request_id not in self.active_requests:
-            logger.warning("Request not found in active requests", request_id=request_id)
-            return 0.0
+        self.requests_finished = next(self._finished)
+        ACTIVE_REQUESTS.dec()
         
-        metrics = self.active_requests.pop(request_id)
         metrics.duration = time.time() - metrics.start_time
         metrics.status_code = status_code
         metrics.response_size = response_size
@@ -278,17 +295,14 @@ class PerformanceMonitor:
             endpoint=metrics.endpoint
         ).observe(metrics.response_size)
         
-        ACTIVE_REQUESTS.set(len(self.active_requests))
-        
-        # Store in history
-        self.request_history.append(metrics)
-        
-        # Clean up old history
-        cutoff_time = time.time() - 3600  # 1 hour
-        self.request_history = [
-            r for r in self.request_history 
-            if r.start_time >= cutoff_time
-        ]
+        if self.keep_history:
+            history = self.request_history
+            history.append(metrics)
+            
+            # Clean up old history
+            cutoff_time = time.time() - 3600  # 1 hour
+            while history and history[0].start_time < cutoff_time:
+                history.popleft()
         
         logger.info(
             "Request completed",
@@ -337,9 +351,10 @@ class PerformanceMonitor:
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get comprehensive performance statistics."""
         # Recent request stats
+        cutoff_time = time.time() - 300  # Last 5 minutes
         recent_requests = [
-            r for r in self.request_history
-            if r.start_time >= time.time() - 300  # Last 5 minutes
+            r for r in list(self.request_history)
+            if r.start_time >= cutoff_time
         ]
         
         request_stats = {}
@@ -357,7 +372,8 @@ class PerformanceMonitor:
         return {
             "requests": request_stats,
             "database": self.db_monitor.get_stats(),
-            "active_requests": len(self.active_requests),
+            "active_requests": self.active_requests,
+            "requests_started": self.requests_started,
             "throughput": self.throughput_stats[-1].__dict__ if self.throughput_stats else {}
         }
     
@@ -368,8 +384,9 @@ class PerformanceMonitor:
                 try:
                     # Calculate throughput for last minute
                     cutoff_time = time.time() - 60
+                    # Snapshot first; the deque is appended to from the event loop
                     recent_requests = [
-                        r for r in self.request_history
+                        r for r in list(self.request_history)
                         if r.start_time >= cutoff_time
                     ]
                     
@@ -387,7 +404,7 @@ class PerformanceMonitor:
                         requests_per_second=rps,
                         avg_response_time=avg_response_time,
                         error_rate=error_rate,
-                        active_requests=len(self.active_requests)
+                        active_requests=self.active_requests
                     )
                     
                     self.throughput_stats.append(stats)
@@ -431,7 +448,7 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         endpoint = str(request.url.path)
         
         # Start tracking
-        self.performance_monitor.start_request(
+        metrics = self.performance_monitor.start_request(
             request_id=request_id,
             method=request.method,
             endpoint=endpoint,
@@ -448,6 +465,7 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
             
             # Finish tracking
             self.performance_monitor.finish_request(
+                metrics,
                 request_id=request_id,
                 status_code=response.status_code,
                 response_size=response_size
@@ -458,6 +476,7 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         except Exception as e:
             # Finish tracking with error
             self.performance_monitor.finish_request(
+                metrics,
                 request_id=request_id,
                 status_code=500
             )
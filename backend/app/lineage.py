@@ -4,75 +4,224 @@ Handles lineage event creation, queuing, and processing
 """
 
 import asyncio
+import itertools
 import orjson
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Union
+from functools import cache
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
 from uuid import UUID
 
 import asyncpg
 from loguru import logger
 from openlineage.client import OpenLineageClient
 from openlineage.client.run import RunEvent, RunState
-from openlineage.client.facet import (
-    BaseFacet,
-    DatasetFacet,
-    JobFacet,
-    RunFacet,
-    DocumentationJobFacet,
-    SchemaDatasetFacet,
-    SourceCodeLocationJobFacet,
-)
 from openlineage.client.uuid import generate_new_uuid
-from pydantic import BaseModel, Field
 
 from .config import get_settings
 
 settings = get_settings()
 
+# Terminal run states are never coalesced away by the enqueue batcher
+TERMINAL_EVENT_TYPES = frozenset({"COMPLETE", "FAIL", "ABORT"})
 
-class LineageEvent(BaseModel):
-    """OpenLineage event model for API validation"""
-    eventType: str = Field(..., description="Event type: START, RUNNING, COMPLETE, FAIL, ABORT")
-    eventTime: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    run: Dict[str, Any] = Field(..., description="Run information")
-    job: Dict[str, Any] = Field(..., description="Job information")
-    inputs: List[Dict[str, Any]] = Field(default_factory=list, description="Input datasets")
-    outputs: List[Dict[str, Any]] = Field(default_factory=list, description="Output datasets")
-    producer: str = Field(default="ducklake-backend", description="Producer URI")
-    schemaURL: str = Field(default="https://openlineage.io/spec/1-0-5/OpenLineage.json")
+# NOTIFY channel that wakes the queue worker when messages are enqueued
+QUEUE_NOTIFY_CHANNEL = "ducklake_queues"
+
+# URI prefix for datasets backed by DuckLake tables
+DUCKLAKE_TABLE_URI_PREFIX = "ducklake://tables/"
+
+DATASOURCE_FACET_SCHEMA_URL = "https://openlineage.io/spec/facets/1-0-0/DatasourceDatasetFacet.json"
+
+
+@dataclass(slots=True)
+class LineageEvent:
+    """OpenLineage event built by trusted code (API input is validated upstream)"""
+    eventType: str
+    run: Dict[str, Any]
+    job: Dict[str, Any]
+    eventTime: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    inputs: List[Dict[str, Any]] = field(default_factory=list)
+    outputs: List[Dict[str, Any]] = field(default_factory=list)
+    producer: str = "ducklake-backend"
+    schemaURL: str = "https://openlineage.io/spec/1-0-5/OpenLineage.json"
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LineageEvent":
+        """Rebuild an event from its serialized form (e.g. a queue message)"""
+        event = cls(
+            eventType=data["eventType"],
+            run=data["run"],
+            job=data["job"],
+            inputs=data.get("inputs") or [],
+            outputs=data.get("outputs") or []
+        )
+        if data.get("eventTime"):
+            event.eventTime = datetime.fromisoformat(data["eventTime"].replace("Z", "+00:00"))
+        if data.get("producer"):
+            event.producer = data["producer"]
+        if data.get("schemaURL"):
+            event.schemaURL = data["schemaURL"]
+        return event
+
+
+def serialize_event(event: LineageEvent) -> bytes:
+    """Serialize an event to JSON with orjson (dataclasses and datetimes natively)"""
+    return orjson.dumps(event)
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    """Binary jsonb encoder; already-serialized bytes pass through untouched"""
+    return b"\x01" + (value if isinstance(value, bytes) else orjson.dumps(value))
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    """Binary jsonb decoder (strips the format version byte)"""
+    return orjson.loads(data[1:])
+
+
+def _decode_jsonb_raw(data: bytes) -> bytes:
+    """Binary jsonb decoder that keeps the JSON text as bytes"""
+    return data[1:]
+
+
+async def init_queue_connection(conn: asyncpg.Connection) -> None:
+    """Hand jsonb queue messages over as raw JSON bytes
+    
+    Consumers parse each message once and can store the same bytes back
+    into a jsonb column without re-encoding them.
+    """
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb_raw,
+        schema='pg_catalog',
+        format='binary'
+    )
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Route every jsonb parameter and result through orjson"""
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema='pg_catalog',
+        format='binary'
+    )
+
+
+@cache
+def get_openlineage_client() -> OpenLineageClient:
+    """Build the OpenLineage client once, on first use"""
+    return OpenLineageClient(
+        url=str(settings.monitoring.openlineage_url) if settings.monitoring.openlineage_url else None,
+        api_key=settings.monitoring.openlineage_api_key.get_secret_value() if settings.monitoring.openlineage_api_key else None
+    )
+
+
+class _IdCache:
+    """Bounded LRU map of (namespace, name) -> database row id"""
+    
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+    
+    def get(self, key: Tuple[str, str]) -> Optional[int]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+    
+    def put(self, key: Tuple[str, str], value: int) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def discard(self, key: Tuple[str, str]) -> None:
+        self._data.pop(key, None)
 
 
 class LineageManager:
     """Manages OpenLineage event creation and processing"""
     
     def __init__(self) -> None:
-        self.client = OpenLineageClient(
-            url=str(settings.monitoring.openlineage_url) if settings.monitoring.openlineage_url else None,
-            api_key=settings.monitoring.openlineage_api_key.get_secret_value() if settings.monitoring.openlineage_api_key else None
-        )
         self.producer_uri = "ducklake-backend"
         self.namespace = settings.monitoring.openlineage_namespace
-        self.db_pool: Optional[asyncpg.Pool] = None
+        self.write_pool: Optional[asyncpg.Pool] = None
+        self.read_pool: Optional[asyncpg.Pool] = None
+        # Keyed by (runId, eventType) so bursts keep only the latest event per key
+        self._current_batch: Dict[Hashable, bytes] = {}
+        self._terminal_seq = itertools.count()
+        self._batch_ready = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        # Set by close(): the flush loop drains the buffer, then exits
+        self._closing = False
+        # Only ids of rows that already existed are cached, so a rolled-back
+        # insert can never leave a dangling id behind
+        self._job_id_cache = _IdCache()
+        self._dataset_id_cache = _IdCache()
+    
+    @property
+    def client(self) -> OpenLineageClient:
+        """Shared OpenLineage client, constructed lazily"""
+        return get_openlineage_client()
     
     async def initialize(self) -> None:
-        """Initialize database connection pool"""
-        self.db_pool = await asyncpg.create_pool(
+        """Initialize database connection pools and the enqueue flusher"""
+        if self.write_pool is None:
+            self.write_pool = await self._create_pool(
+                settings.database.postgres_min_connections,
+                settings.database.postgres_max_connections,
+                'ducklake-lineage'
+            )
+        if self.read_pool is None:
+            self.read_pool = await self._create_pool(
+                settings.database.postgres_read_min_connections,
+                settings.database.postgres_read_max_connections,
+                'ducklake-lineage-read'
+            )
+        
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    @staticmethod
+    async def _create_pool(min_size: int, max_size: int, application_name: str) -> asyncpg.Pool:
+        """Create an asyncpg pool against the lineage database"""
+        return await asyncpg.create_pool(
             host=settings.database.postgres_host,
             port=settings.database.postgres_port,
             database=settings.database.postgres_db,
             user=settings.database.postgres_user,
             password=settings.database.postgres_password.get_secret_value(),
-            min_size=settings.database.postgres_min_connections,
-            max_size=settings.database.postgres_max_connections,
+            min_size=min_size,
+            max_size=max_size,
             command_timeout=settings.database.postgres_command_timeout,
-            server_settings={'application_name': 'ducklake-lineage'}
+            statement_cache_size=settings.database.postgres_statement_cache_size,
+            max_inactive_connection_lifetime=settings.database.postgres_max_inactive_connection_lifetime,
+            init=_init_connection,
+            server_settings={'application_name': application_name}
         )
     
     async def close(self) -> None:
-        """Close database connection pool"""
-        if self.db_pool:
-            await self.db_pool.close()
+        """Flush pending events and close database connection pools"""
+        if self._flush_task is not None:
+            # Let the loop send what it holds rather than cancelling it
+            # mid-send, which would lose the batch it already took
+            self._closing = True
+            self._batch_ready.set()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+            self._closing = False
+        
+        for attr in ("write_pool", "read_pool"):
+            pool = getattr(self, attr)
+            if pool:
+                await pool.close()
+                setattr(self, attr, None)
     
     async def create_job_start_event(
         self,
@@ -158,7 +307,7 @@ class LineageManager:
                     "name": uri,
                     "uri": uri,
                     "_producer": self.producer_uri,
-                    "_schemaURL": "https://openlineage.io/spec/facets/1-0-0/DatasourceDatasetFacet.json"
+                    "_schemaURL": DATASOURCE_FACET_SCHEMA_URL
                 }
             }
         }
@@ -172,172 +321,330 @@ class LineageManager:
         
         return dataset
     
+    def create_dataset_facets_bulk(self, namespace: str, names: List[str], uri_prefix: str) -> List[Dict[str, Any]]:
+        """Create dataset facets for several datasets whose URIs share a prefix"""
+        producer = self.producer_uri
+        return [
+            {
+                "namespace": namespace,
+                "name": name,
+                "facets": {
+                    "dataSource": {
+                        "name": uri,
+                        "uri": uri,
+                        "_producer": producer,
+                        "_schemaURL": DATASOURCE_FACET_SCHEMA_URL
+                    }
+                }
+            }
+            for name in names
+            for uri in (uri_prefix + name,)
+        ]
+    
     async def enqueue_event(self, event: LineageEvent) -> bool:
         """Enqueue a lineage event for processing"""
+        return await self.enqueue_events_batch([event])
+    
+    async def enqueue_events_batch(self, events: List[LineageEvent]) -> bool:
+        """Enqueue several lineage events for processing
+        
+        Events are buffered and sent to PGMQ in batches by the flush loop.
+        Within a batch, a newer non-terminal event for the same run and
+        event type replaces the older one. While sends keep failing the
+        buffer fills up; once full, the whole batch is refused.
+        """
+        if self._flush_task is None or self._flush_task.done():
+            logger.error("Failed to enqueue lineage event", error="lineage manager not initialized")
+            return False
+        
+        backlog = len(self._current_batch)
+        if backlog + len(events) > settings.queue.lineage_buffer_max_events:
+            logger.error("Failed to enqueue lineage event", error="enqueue buffer full",
+                         backlog=backlog, count=len(events))
+            return False
+        
         try:
-            async with self.db_pool.acquire() as conn:
-                # Convert event to JSON for queuing
-                event_json = event.model_dump_json()
-                
-                # Enqueue using PGMQ
+            for event in events:
+                key = (event.run.get("runId"), event.eventType)
+                if event.eventType in TERMINAL_EVENT_TYPES:
+                    # Unique key: terminal events must always reach the queue
+                    key += (next(self._terminal_seq),)
+                self._current_batch[key] = serialize_event(event)
+            self._batch_ready.set()
+            return True
+        except Exception as e:
+            logger.error("Failed to enqueue lineage event", error=str(e))
+            return False
+    
+    async def _flush_loop(self) -> None:
+        """Send buffered events with pgmq.send_batch
+        
+        No timer: while one send is in flight, new events pile up in the
+        next batch, so batch size follows load on its own. Once close() has
+        been called the loop returns as soon as the buffer is empty.
+        
+        A failed send puts its events back and is retried with backoff;
+        they have already been acknowledged to the caller.
+        """
+        max_rows = settings.queue.async_insert_max_rows
+        failures = 0
+        
+        while True:
+            await self._batch_ready.wait()
+            self._batch_ready.clear()
+            items, self._current_batch = list(self._current_batch.items()), {}
+            
+            for start in range(0, len(items), max_rows):
+                if not await self._send_batch([raw for _, raw in items[start:start + max_rows]]):
+                    # Unsent events go back ahead of anything queued since;
+                    # a newer event for the same key still replaces its value
+                    unsent = dict(items[start:])
+                    unsent.update(self._current_batch)
+                    self._current_batch = unsent
+                    failures += 1
+                    break
+            else:
+                failures = 0
+            
+            if failures:
+                if self._closing and failures >= settings.queue.queue_retry_attempts:
+                    logger.error(
+                        "Dropping lineage events at shutdown after repeated send failures",
+                        count=len(self._current_batch)
+                    )
+                    self._current_batch = {}
+                    return
+                await asyncio.sleep(min(settings.queue.queue_retry_delay * 2 ** (failures - 1), 30.0))
+                self._batch_ready.set()
+            elif self._closing and not self._current_batch:
+                return
+    
+    async def _send_batch(self, batch: List[bytes]) -> bool:
+        """Send a batch of serialized events to the lineage queue; False on failure"""
+        try:
+            async with self.write_pool.acquire() as conn:
+                # Same statement (and transaction) as the send, so the worker
+                # is woken exactly when the messages become visible
                 await conn.execute(
-                    "SELECT pgmq.send('lineage_events', $1)",
-                    event_json
+                    "WITH sent AS (SELECT pgmq.send_batch('lineage_events', $1::jsonb[])) "
+                    f"SELECT pg_notify('{QUEUE_NOTIFY_CHANNEL}', count(*)::text) FROM sent",
+                    batch
                 )
-                return True
+            return True
         except Exception as e:
-            logger.error("Failed to enqueue lineage event", error=str(e))
+            logger.error("Failed to enqueue lineage events, will retry", error=str(e), count=len(batch))
             return False
     
-    async def process_event(self, event: LineageEvent) -> bool:
-        """Process a lineage event and store in database"""
+    async def process_event(
+        self,
+        event: LineageEvent,
+        conn: Optional[asyncpg.Connection] = None,
+        raw: Optional[bytes] = None
+    ) -> bool:
+        """Process a lineage event and store in database
+        
+        Long-lived callers (the queue workers) pass their own connection to
+        skip the per-event pool acquire, and the JSON bytes the event was
+        read from so they are stored as-is instead of re-serialized.
+        """
+        if conn is not None:
+            return await self._process_with_conn(conn, event, raw)
+        
         try:
-            async with self.db_pool.acquire() as conn:
-                # Start transaction
-                async with conn.transaction():
-                    # Ensure job exists
-                    job_id = await self._ensure_job_exists(
-                        conn,
-                        event.job["namespace"],
-                        event.job["name"]
-                    )
-                    
-                    # Ensure run exists
-                    run_uuid = UUID(event.run["runId"])
-                    await self._ensure_run_exists(
-                        conn,
-                        run_uuid,
-                        job_id,
-                        event.eventType
-                    )
-                    
-                    # Store event
+            async with self.write_pool.acquire() as conn:
+                return await self._process_with_conn(conn, event, raw)
+        except Exception as e:
+            logger.error("Failed to process lineage event", error=str(e))
+            return False
+    
+    async def _process_with_conn(
+        self,
+        conn: asyncpg.Connection,
+        event: LineageEvent,
+        raw: Optional[bytes] = None
+    ) -> bool:
+        """Store a lineage event in one transaction on the given connection"""
+        try:
+            # Start transaction
+            async with conn.transaction():
+                # Ensure job exists
+                job_id = await self._ensure_job_exists(
+                    conn,
+                    event.job["namespace"],
+                    event.job["name"]
+                )
+                
+                # Ensure run exists
+                run_uuid = UUID(event.run["runId"])
+                await self._ensure_run_exists(
+                    conn,
+                    run_uuid,
+                    job_id,
+                    event.eventType
+                )
+                
+                # Store event
+                await conn.execute(
+                    """
+                    INSERT INTO openlineage.run_events 
+                    (run_id, event_type, event_time, producer_uri, schema_url, event_data)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    """,
+                    run_uuid,
+                    event.eventType,
+                    event.eventTime,
+                    event.producer,
+                    event.schemaURL,
+                    raw if raw is not None else serialize_event(event)
+                )
+                
+                # Upsert datasets and link them to the run in one round trip
+                await self._process_datasets(conn, run_uuid, event)
+                
+                # Update run state if complete
+                if event.eventType in TERMINAL_EVENT_TYPES:
                     await conn.execute(
                         """
-                        INSERT INTO openlineage.run_events 
-                        (run_id, event_type, event_time, producer_uri, schema_url, event_data)
-                        VALUES ($1, $2, $3, $4, $5, $6)
+                        UPDATE openlineage.runs 
+                        SET state = $1, ended_at = $2
+                        WHERE run_id = $3
                         """,
-                        run_uuid,
                         event.eventType,
                         event.eventTime,
-                        event.producer,
-                        event.schemaURL,
-                        orjson.dumps(event.model_dump()).decode('utf-8')
+                        run_uuid
                     )
-                    
-                    # Process datasets
-                    for dataset in event.inputs:
-                        await self._process_dataset(conn, run_uuid, dataset, "INPUT")
-                    
-                    for dataset in event.outputs:
-                        await self._process_dataset(conn, run_uuid, dataset, "OUTPUT")
-                    
-                    # Update run state if complete
-                    if event.eventType in ["COMPLETE", "FAIL", "ABORT"]:
-                        await conn.execute(
-                            """
-                            UPDATE openlineage.runs 
-                            SET state = $1, ended_at = $2
-                            WHERE run_id = $3
-                            """,
-                            event.eventType,
-                            event.eventTime,
-                            run_uuid
-                        )
                 
-                return True
+            return True
         except Exception as e:
+            # Drop the cached ids in case one went stale
+            self._job_id_cache.discard((event.job.get("namespace"), event.job.get("name")))
+            for dataset in event.inputs + event.outputs:
+                self._dataset_id_cache.discard((dataset.get("namespace"), dataset.get("name")))
             logger.error("Failed to process lineage event", error=str(e))
             return False
     
     async def _ensure_job_exists(self, conn: asyncpg.Connection, namespace: str, name: str) -> int:
         """Ensure job exists in database and return job_id"""
-        # Try to get existing job
-        row = await conn.fetchrow(
-            "SELECT id FROM openlineage.jobs WHERE namespace = $1 AND name = $2",
-            namespace, name
-        )
-        
-        if row:
-            return row["id"]
+        job_id = self._job_id_cache.get((namespace, name))
+        if job_id is not None:
+            return job_id
         
-        # Create new job
+        # Single race-free upsert; xmax = 0 means this statement inserted the row
         row = await conn.fetchrow(
             """
             INSERT INTO openlineage.jobs (namespace, name, metadata)
             VALUES ($1, $2, $3)
-            RETURNING id
+            ON CONFLICT (namespace, name) DO UPDATE SET namespace = EXCLUDED.namespace
+            RETURNING id, (xmax = 0) AS inserted
             """,
-            namespace, name, orjson.dumps({}).decode('utf-8')
+            namespace, name, {}
         )
         
+        if not row["inserted"]:
+            self._job_id_cache.put((namespace, name), row["id"])
         return row["id"]
     
     async def _ensure_run_exists(self, conn: asyncpg.Connection, run_id: UUID, job_id: int, event_type: str) -> None:
         """Ensure run exists in database"""
-        # Check if run exists
-        row = await conn.fetchrow(
-            "SELECT id FROM openlineage.runs WHERE run_id = $1",
-            run_id
+        await conn.execute(
+            """
+            INSERT INTO openlineage.runs (run_id, job_id, state, producer_uri)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (run_id) DO NOTHING
+            """,
+            run_id, job_id, event_type, self.producer_uri
         )
-        
-        if not row:
-            # Create new run
-            await conn.execute(
-                """
-                INSERT INTO openlineage.runs (run_id, job_id, state, producer_uri)
-                VALUES ($1, $2, $3, $4)
-                """,
-                run_id, job_id, event_type, self.producer_uri
-            )
     
-    async def _process_dataset(self, conn: asyncpg.Connection, run_id: UUID, dataset: Dict[str, Any], direction: str) -> None:
-        """Process a dataset and create lineage relationships"""
-        # Ensure dataset exists
-        dataset_id = await self._ensure_dataset_exists(
-            conn,
-            dataset["namespace"],
-            dataset["name"],
-            dataset.get("facets", {}).get("dataSource", {}).get("uri", "")
-        )
+    async def _process_datasets(self, conn: asyncpg.Connection, run_id: UUID, event: LineageEvent) -> None:
+        """Upsert all input/output datasets of an event and create lineage relationships"""
+        datasets = [(dataset, "INPUT") for dataset in event.inputs]
+        datasets += [(dataset, "OUTPUT") for dataset in event.outputs]
+        if not datasets:
+            return
+        
+        keys = [(dataset["namespace"], dataset["name"]) for dataset, _ in datasets]
+        source_uris: Dict[Tuple[str, str], str] = {}
+        for key, (dataset, _) in zip(keys, datasets):
+            source_uris.setdefault(key, dataset.get("facets", {}).get("dataSource", {}).get("uri", ""))
+        dataset_ids = await self._resolve_dataset_ids(conn, source_uris)
         
-        # Create lineage relationship
         await conn.execute(
             """
             INSERT INTO openlineage.lineage_graph (run_id, dataset_id, direction, metadata)
-            VALUES ($1, $2, $3, $4)
+            SELECT $1, dataset_id, direction, facets
+            FROM unnest($2::integer[], $3::text[], $4::jsonb[]) AS t(dataset_id, direction, facets)
             ON CONFLICT DO NOTHING
             """,
-            run_id, dataset_id, direction, orjson.dumps(dataset.get("facets", {})).decode('utf-8')
+            run_id,
+            [dataset_ids[key] for key in keys],
+            [direction for _, direction in datasets],
+            [dataset.get("facets", {}) for dataset, _ in datasets]
         )
     
-    async def _ensure_dataset_exists(self, conn: asyncpg.Connection, namespace: str, name: str, uri: str) -> int:
-        """Ensure dataset exists in database and return dataset_id"""
-        # Try to get existing dataset
-        row = await conn.fetchrow(
-            "SELECT id FROM openlineage.datasets WHERE namespace = $1 AND name = $2",
-            namespace, name
-        )
+    async def _resolve_dataset_ids(
+        self,
+        conn: asyncpg.Connection,
+        source_uris: Dict[Tuple[str, str], str]
+    ) -> Dict[Tuple[str, str], int]:
+        """Return the id of each (namespace, name), inserting the missing datasets
         
-        if row:
-            return row["id"]
+        Existing rows are only read, never rewritten, so a popular dataset
+        doesn't cost a row lock and a dead tuple on every event. Ids of rows
+        that already existed are cached, so repeat datasets skip the query.
+        """
+        dataset_ids: Dict[Tuple[str, str], int] = {}
+        pending: Dict[Tuple[str, str], str] = {}
+        for key, uri in source_uris.items():
+            dataset_id = self._dataset_id_cache.get(key)
+            if dataset_id is None:
+                pending[key] = uri
+            else:
+                dataset_ids[key] = dataset_id
+        if not pending:
+            return dataset_ids
         
-        # Create new dataset
-        row = await conn.fetchrow(
-            """
-            INSERT INTO openlineage.datasets (namespace, name, source_uri, metadata)
-            VALUES ($1, $2, $3, $4)
-            RETURNING id
-            """,
-            namespace, name, uri, orjson.dumps({}).decode('utf-8')
-        )
+        # A row committed concurrently after this statement's snapshot is
+        # neither inserted (DO NOTHING) nor visible to it; the second pass
+        # takes a fresh snapshot and finds it
+        for _ in range(2):
+            rows = await conn.fetch(
+                """
+                WITH src AS (
+                    SELECT * FROM unnest($1::text[], $2::text[], $3::text[])
+                        AS t(namespace, name, source_uri)
+                ),
+                ins AS (
+                    INSERT INTO openlineage.datasets (namespace, name, source_uri, metadata)
+                    SELECT namespace, name, source_uri, '{}'::jsonb FROM src
+                    ON CONFLICT (namespace, name) DO NOTHING
+                    RETURNING id, namespace, name
+                )
+                SELECT id, namespace, name, true AS inserted FROM ins
+                UNION ALL
+                -- Rows that already existed: the snapshot predates ins
+                SELECT d.id, d.namespace, d.name, false
+                FROM openlineage.datasets d JOIN src USING (namespace, name)
+                """,
+                [namespace for namespace, _ in pending],
+                [name for _, name in pending],
+                list(pending.values())
+            )
+            for row in rows:
+                key = (row["namespace"], row["name"])
+                dataset_ids[key] = row["id"]
+                # Like jobs: a row inserted here could still be rolled back
+                if not row["inserted"]:
+                    self._dataset_id_cache.put(key, row["id"])
+            
+            pending = {key: uri for key, uri in pending.items() if key not in dataset_ids}
+            if not pending:
+                return dataset_ids
         
-        return row["id"]
+        raise RuntimeError(f"Could not resolve dataset ids for {sorted(pending)}")
     
     async def get_job_runs(self, job_name: str) -> List[Dict[str, Any]]:
         """Get all runs for a job"""
-        async with self.db_pool.acquire() as conn:
+        async with self.read_pool.acquire() as conn:
             rows = await conn.fetch(
                 """
                 SELECT r.run_id, r.state, r.started_at, r.ended_at, r.metadata
@@ -353,36 +660,33 @@ class LineageManager:
     
     async def get_run_lineage(self, run_id: UUID) -> Dict[str, Any]:
         """Get complete lineage for a run"""
-        async with self.db_pool.acquire() as conn:
-            # Get run info
-            run_row = await conn.fetchrow(
+        async with self.read_pool.acquire() as conn:
+            # Run info and its datasets in one round trip
+            rows = await conn.fetch(
                 """
-                SELECT r.run_id, r.state, r.started_at, r.ended_at, j.name as job_name
+                SELECT r.run_id, r.state, r.started_at, r.ended_at, j.name as job_name,
+                       lg.direction, d.namespace, d.name, d.source_uri
                 FROM openlineage.runs r
                 JOIN openlineage.jobs j ON r.job_id = j.id
+                LEFT JOIN (
+                    openlineage.lineage_graph lg
+                    JOIN openlineage.datasets d ON lg.dataset_id = d.id
+                ) ON lg.run_id = r.run_id
                 WHERE r.run_id = $1
                 """,
                 run_id
             )
             
-            if not run_row:
+            if not rows:
                 return {}
             
-            # Get inputs and outputs
-            lineage_rows = await conn.fetch(
-                """
-                SELECT lg.direction, d.namespace, d.name, d.source_uri
-                FROM openlineage.lineage_graph lg
-                JOIN openlineage.datasets d ON lg.dataset_id = d.id
-                WHERE lg.run_id = $1
-                """,
-                run_id
-            )
-            
             inputs = []
             outputs = []
             
-            for row in lineage_rows:
+            for row in rows:
+                if row["direction"] is None:
+                    continue
+                
                 dataset_info = {
                     "namespace": row["namespace"],
                     "name": row["name"],
@@ -394,6 +698,7 @@ class LineageManager:
                 else:
                     outputs.append(dataset_info)
             
+            run_row = rows[0]
             return {
                 "run_id": str(run_row["run_id"]),
                 "job_name": run_row["job_name"],
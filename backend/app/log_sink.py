@@ -0,0 +1,87 @@
+"""
+Loguru sink that writes records as JSON lines with orjson
+"""
+
+import atexit
+import io
+import sys
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+
+# Records are written on loguru's enqueue thread, so buffering there costs
+# request handlers nothing and turns many lines into one write syscall
+LOG_BUFFER_SIZE = 64 * 1024
+
+_stdout: Optional[io.BufferedWriter] = None
+
+
+def _output() -> io.BufferedWriter:
+    """Buffered writer over stdout's file descriptor, opened on first use"""
+    global _stdout
+    if _stdout is None:
+        _stdout = io.BufferedWriter(
+            io.FileIO(sys.stdout.fileno(), "wb", closefd=False),
+            buffer_size=LOG_BUFFER_SIZE
+        )
+    return _stdout
+
+
+def flush_log_sink() -> None:
+    """Write out buffered log lines (at shutdown, after logger.complete())"""
+    if _stdout is not None:
+        _stdout.flush()
+
+
+atexit.register(flush_log_sink)
+
+
+@lru_cache(maxsize=256)
+def _call_site_fields(
+    file_name: str, file_path: str, function: str,
+    level_icon: str, level_name: str, level_no: int,
+    line: int, module: str, name: str,
+    process_id: int, process_name: str, thread_id: int, thread_name: str
+) -> bytes:
+    """Pre-serialized record fields that never change for a given call site and thread"""
+    return orjson.dumps({
+        "file": {"name": file_name, "path": file_path},
+        "function": function,
+        "level": {"icon": level_icon, "name": level_name, "no": level_no},
+        "line": line,
+        "module": module,
+        "name": name,
+        "process": {"id": process_id, "name": process_name},
+        "thread": {"id": thread_id, "name": thread_name},
+    })[1:-1]
+
+
+def orjson_sink(message: Any) -> None:
+    """Write a record as JSON with orjson, in the same layout as loguru's serialize=True"""
+    record = message.record
+    exception = record["exception"]
+    if exception is not None:
+        exception = {
+            "type": None if exception.type is None else exception.type.__name__,
+            "value": exception.value,
+            "traceback": bool(exception.traceback),
+        }
+    level, file, process, thread = record["level"], record["file"], record["process"], record["thread"]
+    call_site = _call_site_fields(
+        file.name, file.path, record["function"],
+        level.icon, level.name, level.no,
+        record["line"], record["module"], record["name"],
+        process.id, process.name, thread.id, thread.name
+    )
+    # Only the per-record values are serialized; the call-site part is reused
+    dynamic = orjson.dumps({
+        "elapsed": {"repr": str(record["elapsed"]), "seconds": record["elapsed"].total_seconds()},
+        "exception": exception,
+        "extra": record["extra"],
+    }, default=str)[:-1]
+    timestamp = orjson.dumps({"repr": str(record["time"]), "timestamp": record["time"].timestamp()})
+    _output().write(
+        b'{"text":' + orjson.dumps(str(message)) + b',"record":' + dynamic + b"," + call_site
+        + b',"message":' + orjson.dumps(record["message"]) + b',"time":' + timestamp + b"}}\n"
+    )
@@ -5,13 +5,15 @@ from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional, Union
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import duckdb  # used indirectly via ducklake_conn setup
 import pyarrow as pa
 import pyarrow.parquet as pq
-import boto3
 from botocore.exceptions import ClientError
+import asyncio
 import io
 import os
+import random
 import orjson
 import uuid
 from datetime import datetime
@@ -21,56 +23,98 @@ import pyarrow.ipc as ipc
 from fastapi.responses import StreamingResponse
 from enum import Enum
 
-from .lineage import lineage_manager
+from .lineage import DUCKLAKE_TABLE_URI_PREFIX, lineage_manager
 from .queue_worker import queue_worker
 from .routers.lineage import router as lineage_router
 from .routers.admin import router as admin_router
 from .routers.jobs_events import router as jobs_events_router
-from .routers.tables_datasets import router as tables_datasets_router
+from .routers.tables_datasets import router as tables_datasets_router, validate_column_type, validate_identifier
 from .instrumentation import memory_monitor, performance_monitor, setup_memory_monitoring, setup_performance_monitoring
 from .instrumentation.performance import PerformanceMiddleware
+from .log_sink import flush_log_sink, orjson_sink
+from .responses import ORJSONResponse
+from .storage import S3_DOWNLOAD_CHUNK_SIZE, storage_manager, stream_s3_object
+
+LOG_LEVEL = "INFO"
 
 # Configure loguru for structured logging
 logger.configure(
     handlers=[
         {
-            "sink": "sys.stdout",
+            "sink": orjson_sink,  # JSON output
             "format": "{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-            "serialize": True,  # JSON output
-            "level": "INFO"
+            "level": LOG_LEVEL,
+            # Serialization and writes happen on loguru's writer thread,
+            # so request handlers only pay for a queue put
+            "enqueue": True
         }
-    ]
+    ],
+    # Attached to every record, so log_event doesn't add it per call
+    extra={"service": "ducklake-backend"}
 )
 
+# Request ids only need to be unique, not unpredictable: draw them from a
+# urandom-seeded PRNG instead of paying a urandom read per request
+_request_id_rng = random.Random(os.urandom(16))
+os.register_at_fork(after_in_child=lambda: _request_id_rng.seed(os.urandom(16)))
+
+def new_request_id() -> str:
+    """Random (version 4) UUID string for correlating a request's log lines"""
+    return str(uuid.UUID(int=_request_id_rng.getrandbits(128), version=4))
+
+# None outside of requests; "" inside a request until something asks for the id
+_request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+def current_request_id() -> str:
+    """The current request's id, allocated on first use"""
+    request_id = _request_id_var.get()
+    if not request_id:
+        request_id = new_request_id()
+        _request_id_var.set(request_id)
+    return request_id
+
+class RequestIdMiddleware:
+    """Marks each HTTP request as needing its own (lazily allocated) request id"""
+    
+    def __init__(self, app) -> None:
+        self.app = app
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http":
+            _request_id_var.set("")
+        await self.app(scope, receive, send)
+
+_LEVEL_NOS = {name: logger.level(name).no for name in ("DEBUG", "INFO", "WARNING", "ERROR")}
+_MIN_LEVEL_NO = logger.level(LOG_LEVEL).no
+
 def log_event(level: str, message: str, **kwargs: Any) -> None:
     """Log structured events using loguru with orjson serialization"""
-    log_data = {
-        "service": "ducklake-backend",
-        "message": message,
-        **kwargs
-    }
+    level = level.upper()
+    if level not in _LEVEL_NOS:
+        level = "INFO"
+    if _LEVEL_NOS[level] < _MIN_LEVEL_NO:
+        # Filtered out anyway; skip building the record
+        return
     
-    if level.upper() == "DEBUG":
-        logger.debug(message, **log_data)
-    elif level.upper() == "INFO":
-        logger.info(message, **log_data)
-    elif level.upper() == "WARNING":
-        logger.warning(message, **log_data)
-    elif level.upper() == "ERROR":
-        logger.error(message, **log_data)
-    else:
-        logger.info(message, **log_data)
+    if _request_id_var.get() is not None:
+        kwargs["request_id"] = current_request_id()
+    # Fields go in via bind(): passing them to log() as kwargs would also run
+    # message.format(**kwargs), which breaks on messages containing braces
+    logger.bind(message=message, **kwargs).log(level, message)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events."""
     # Startup
-    log_event("INFO", "Initializing services...")
+    # uvicorn picks uvloop automatically when it is installed (not on Windows)
+    loop = asyncio.get_running_loop()
+    log_event("INFO", "Initializing services...", event_loop=f"{type(loop).__module__}.{type(loop).__name__}")
     try:
         # Initialize SSE manager first
         from .sse_manager import sse_manager
         await sse_manager.start()
         
+        await storage_manager.initialize()
         await lineage_manager.initialize()
         await queue_worker.initialize()
         await queue_worker.start()
@@ -86,6 +130,7 @@ async def lifespan(app: FastAPI):
     try:
         await queue_worker.stop()
         await lineage_manager.close()
+        await storage_manager.close()
         
         # Stop SSE manager last
         from .sse_manager import sse_manager
@@ -94,6 +139,10 @@ async def lifespan(app: FastAPI):
         log_event("INFO", "Services shut down successfully")
     except Exception as e:
         log_event("ERROR", "Error during shutdown", error=str(e))
+    
+    # Drain records still queued for the log writer thread, then its buffer
+    await logger.complete()
+    flush_log_sink()
 
 
 def custom_openapi():
@@ -145,6 +194,7 @@ app = FastAPI(
     description="Data lake with OpenLineage integration", 
     version="1.0.2",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url=None,  # Disable default docs
     redoc_url=None  # Disable default redoc
 )
@@ -415,6 +465,7 @@ setup_performance_monitoring()
 
 # Add performance monitoring middleware
 app.add_middleware(PerformanceMiddleware, performance_monitor=performance_monitor)
+app.add_middleware(RequestIdMiddleware)
 
 # Include all routers with proper organization
 app.include_router(admin_router)
@@ -422,26 +473,32 @@ app.include_router(jobs_events_router)
 app.include_router(tables_datasets_router)
 app.include_router(lineage_router)
 
+# Root payloads are static apart from the request id, so serialize them once
+# and splice the id in per request
+_ROOT_INFO_PREFIX = orjson.dumps({
+    "message": "🌊 Welcome to DuckLake API",
+    "version": "1.0.2",
+    "description": "High-performance data lake with OpenLineage integration",
+    "docs": "/docs",
+    "health": "/admin/health"
+})[:-1] + b',"request_id":"'
+_ROOT_HELLO_PREFIX = b'{"Hello":"World","request_id":"'
+_ROOT_SUFFIX = b'"}'
+
 # Add root endpoint
-@app.get("/", tags=["Root"])
-def read_root() -> Dict[str, str]:
+@app.get("/", tags=["Root"], response_class=Response)
+def read_root() -> Response:
     """Root endpoint with API information."""
-    request_id = str(uuid.uuid4())
-    log_event("INFO", "Root endpoint accessed", request_id=request_id, endpoint="/")
-    return {
-        "message": "🌊 Welcome to DuckLake API",
-        "version": "1.0.2",
-        "description": "High-performance data lake with OpenLineage integration",
-        "docs": "/docs",
-        "health": "/admin/health",
-        "request_id": request_id
-    }
+    request_id = current_request_id()
+    log_event("INFO", "Root endpoint accessed", endpoint="/")
+    return Response(_ROOT_INFO_PREFIX + request_id.encode() + _ROOT_SUFFIX, media_type="application/json")
 
 # Log application startup
 log_event("INFO", "FastAPI application starting", version="1.0.2")
 
 # Initialize DuckLake connection (DuckDB + DuckLake + Postgres catalog)
-from .ducklake_conn import con, setup_ducklake
+from .ducklake_conn import con, get_cursor, new_cursor, setup_ducklake, use_catalog
+from .query_cache import is_read_only, query_cache, schema_cache
 
 # Get application settings
 from .config import get_settings
@@ -518,7 +575,7 @@ def setup_ducklake_connection_legacy():
         attach_sql += ";"
         
         con.execute(attach_sql)
-        con.execute("USE ducklake;")
+        use_catalog("ducklake")
         
         log_event("INFO", "DuckLake attached successfully with secrets",
                   postgres_host=settings.database.postgres_host,
@@ -552,7 +609,7 @@ def setup_ducklake_fallback():
         
         # Attach using fallback
         con.execute("ATTACH 'ducklake:ducklake_fallback' AS ducklake;")
-        con.execute("USE ducklake;")
+        use_catalog("ducklake")
         
         log_event("WARNING", "DuckLake fallback connection established",
                   catalog=fallback_catalog,
@@ -609,24 +666,16 @@ _ducklake_connection_status = {
     "environment": settings.environment.value
 }
 
-# Initialize MinIO client using centralized configuration
-s3_client = boto3.client(
-    's3',
-    endpoint_url=f"{'https' if settings.storage.minio_secure else 'http'}://{settings.storage.minio_endpoint}",
-    aws_access_key_id=settings.storage.minio_access_key,
-    aws_secret_access_key=settings.storage.minio_secret_key.get_secret_value(),
-    region_name=settings.storage.minio_region,
-    config=boto3.session.Config(signature_version='s3v4')
-)
+# MinIO access goes through the async client in storage.py (opened in lifespan)
 
 
 
-@app.get("/")
-def read_root() -> Dict[str, str]:
+@app.get("/", response_class=Response)
+def read_root() -> Response:
     """Root endpoint for API health check."""
-    request_id = str(uuid.uuid4())
-    log_event("INFO", "Root endpoint accessed", request_id=request_id, endpoint="/")
-    return {"Hello": "World", "request_id": request_id}
+    request_id = current_request_id()
+    log_event("INFO", "Root endpoint accessed", endpoint="/")
+    return Response(_ROOT_HELLO_PREFIX + request_id.encode() + _ROOT_SUFFIX, media_type="application/json")
 
 
 
@@ -642,22 +691,30 @@ def read_root() -> Dict[str, str]:
 @app.post("/tables")
 def create_table(table: Table) -> Dict[str, str]:
     """Create a new DuckLake table with specified schema."""
-    request_id = str(uuid.uuid4())
-    log_event("INFO", "Creating DuckLake table", request_id=request_id, table_name=table.name, schema=table.schema)
+    request_id = current_request_id()
+    log_event("INFO", "Creating DuckLake table", table_name=table.name, schema=table.schema)
+    validate_identifier(table.name)
+    columns_sql = ", ".join(
+        f"{validate_identifier(col_name)} {validate_column_type(col_type)}"
+        for col_name, col_type in table.schema.items()
+    )
     try:
-        columns_sql = ", ".join([f"{col_name} {col_type}" for col_name, col_type in table.schema.items()])
         create_table_sql = f"CREATE TABLE ducklake.{table.name} ({columns_sql})"
-        con.execute(create_table_sql)
-        log_event("INFO", "DuckLake table created successfully", request_id=request_id, table_name=table.name)
+        with get_cursor() as cursor:
+            cursor.execute(create_table_sql)
+        query_cache.invalidate()
+        schema_cache.discard(table.name)
+        log_event("INFO", "DuckLake table created successfully", table_name=table.name)
         return {"message": f"DuckLake table '{table.name}' created successfully.", "request_id": request_id}
     except Exception as e:
-        log_event("ERROR", "Failed to create DuckLake table", request_id=request_id, table_name=table.name, error=str(e))
+        log_event("ERROR", "Failed to create DuckLake table", table_name=table.name, error=str(e))
         raise HTTPException(status_code=400, detail=f"Error creating table: {e}")
 
 # DuckDB query operations
 @app.put("/tables/{table_name}")
 def append_to_table(table_name: str, data: Union[TableData, UploadFile]):
     """Append data with multiple input formats (JSON, Arrow, Parquet)."""
+    validate_identifier(table_name)
     try:
         if isinstance(data, UploadFile):
             # Handle Arrow/Parquet uploads directly
@@ -675,9 +732,9 @@ def append_to_table(table_name: str, data: Union[TableData, UploadFile]):
         
         # Zero-copy insert into DuckLake table
         with performance_monitor.db_monitor.track_query("INSERT", f"INSERT INTO ducklake.{table_name}"):
-            con.register("temp_data", arrow_table)
-            con.execute(f"INSERT INTO ducklake.{table_name} SELECT * FROM temp_data")
-            con.unregister("temp_data")
+            with get_cursor() as cursor:
+                cursor.from_arrow(arrow_table).insert_into(f"ducklake.{table_name}")
+            query_cache.invalidate()
         
         return {"message": f"Data appended successfully", "rows": len(arrow_table)}
     except Exception as e:
@@ -686,8 +743,12 @@ def append_to_table(table_name: str, data: Union[TableData, UploadFile]):
 @app.delete("/tables/{table_name}")
 def delete_table(table_name: str) -> Dict[str, str]:
     """Delete a DuckLake table."""
+    validate_identifier(table_name)
     try:
-        con.execute(f"DROP TABLE ducklake.{table_name}")
+        with get_cursor() as cursor:
+            cursor.execute(f"DROP TABLE ducklake.{table_name}")
+        query_cache.invalidate()
+        schema_cache.discard(table_name)
         return {"message": f"DuckLake table '{table_name}' deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error deleting table: {e}")
@@ -697,9 +758,10 @@ def get_table(table_name: str) -> Dict[str, Union[str, Dict[str, str]]]:
     """Get DuckLake table schema information."""
     try:
         # Get table schema using DuckDB's information_schema for DuckLake tables
-        schema_query = f"SELECT column_name, data_type FROM information_schema.columns WHERE table_name = '{table_name}' AND table_schema = 'ducklake'"
-        schema_result = con.execute(schema_query).fetch_arrow_table()
-        schema = {row["column_name"]: row["data_type"] for row in schema_result.to_pylist()}
+        # Bound parameter: one statement text for every table, and no quoting of the name
+        schema_query = "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = ? AND table_schema = 'ducklake' ORDER BY ordinal_position"
+        with get_cursor() as cursor:
+            schema = dict(cursor.execute(schema_query, [table_name]).fetchall())
         return {"name": table_name, "schema": schema, "type": "ducklake"}
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"DuckLake table '{table_name}' not found or error retrieving schema: {e}")
@@ -710,7 +772,8 @@ def list_tables() -> Dict[str, Union[List[str], str]]:
     try:
         # Get all tables from DuckLake schema
         tables_query = "SELECT table_name FROM information_schema.tables WHERE table_schema = 'ducklake'"
-        tables_result = con.execute(tables_query).fetch_arrow_table()
+        with get_cursor() as cursor:
+            tables_result = cursor.execute(tables_query).fetch_arrow_table()
         tables = [row["table_name"] for row in tables_result.to_pylist()]
         return {"tables": tables, "type": "ducklake"}
     except Exception as e:
@@ -720,8 +783,17 @@ def list_tables() -> Dict[str, Union[List[str], str]]:
 def query_table(table_name: str, query: Query, request: Request):
     """Execute a query with content negotiation based on Accept header."""
     try:
+        # Single-statement reads share the thread's cursor; anything else
+        # (including a read followed by BEGIN, SET...) gets its own so session
+        # state can't leak into later requests
+        read_only = is_read_only(query.query)
+        cursor_scope = get_cursor() if read_only else new_cursor()
         # Get Arrow table directly from DuckDB (zero-copy)
-        arrow_table = con.execute(query.query).fetch_arrow_table()
+        with cursor_scope as cursor:
+            arrow_table = cursor.execute(query.query).fetch_arrow_table()
+        if not read_only:
+            query_cache.invalidate()
+            schema_cache.clear()
         
         # Get Accept header for content negotiation
         accept_header = request.headers.get("accept", "application/json")
@@ -839,16 +911,16 @@ def stream_csv(table: pa.Table):
 
 # MinIO dataset operations
 @app.post("/datasets/{bucket_name}")
-def create_bucket(bucket_name: str) -> Dict[str, str]:
+async def create_bucket(bucket_name: str) -> Dict[str, str]:
     """Create a new MinIO bucket."""
     try:
-        s3_client.create_bucket(Bucket=bucket_name)
+        await storage_manager.client.create_bucket(Bucket=bucket_name)
         return {"message": f"Bucket '{bucket_name}' created successfully."}
     except ClientError as e:
         raise HTTPException(status_code=400, detail=f"Error creating bucket: {e}")
 
 @app.put("/datasets/{bucket_name}/{object_name}")
-def upload_object(bucket_name: str, object_name: str, file: UploadFile = File(...)) -> Dict[str, str]:
+async def upload_object(bucket_name: str, object_name: str, file: UploadFile = File(...)) -> Dict[str, str]:
     """Upload an object to a MinIO bucket."""
     try:
         with performance_monitor.minio_monitor.track_operation("upload"):
@@ -856,7 +928,9 @@ def upload_object(bucket_name: str, object_name: str, file: UploadFile = File(..
             file_size = file.size if hasattr(file, 'size') else 0
             memory_monitor.track_allocation("minio_upload", file_size or 1024)
             
-            s3_client.upload_fileobj(file.file, bucket_name, object_name)
+            await storage_manager.client.upload_fileobj(
+                file.file, bucket_name, object_name, Config=storage_manager.transfer_config
+            )
             
             log_event("INFO", "Object uploaded successfully", 
                      bucket=bucket_name, object=object_name, size_bytes=file_size)
@@ -868,39 +942,39 @@ def upload_object(bucket_name: str, object_name: str, file: UploadFile = File(..
         raise HTTPException(status_code=400, detail=f"Error uploading object: {e}")
 
 @app.get("/datasets/{bucket_name}/{object_name}")
-def download_object(bucket_name: str, object_name: str) -> Response:
+async def download_object(bucket_name: str, object_name: str) -> Response:
     """Download an object from a MinIO bucket."""
     try:
         with performance_monitor.minio_monitor.track_operation("download"):
-            response = s3_client.get_object(Bucket=bucket_name, Key=object_name)
-            content = response['Body'].read()
+            response = await storage_manager.client.get_object(Bucket=bucket_name, Key=object_name)
+            size_bytes = response.get('ContentLength', 0)
             
-            # Track downloaded data size
-            memory_monitor.track_allocation("minio_download", len(content))
+            # Only one chunk is held in memory at a time
+            memory_monitor.track_allocation("minio_download", min(size_bytes, S3_DOWNLOAD_CHUNK_SIZE))
             
-            log_event("INFO", "Object downloaded successfully", 
-                     bucket=bucket_name, object=object_name, size_bytes=len(content))
+            log_event("INFO", "Object download started", 
+                     bucket=bucket_name, object=object_name, size_bytes=size_bytes)
             
-            return Response(content=content, media_type=response['ContentType'])
+            return stream_s3_object(response)
     except ClientError as e:
         log_event("ERROR", "Failed to download object", 
                  bucket=bucket_name, object=object_name, error=str(e))
         raise HTTPException(status_code=404, detail=f"Error downloading object: {e}")
 
 @app.delete("/datasets/{bucket_name}/{object_name}")
-def delete_object(bucket_name: str, object_name: str) -> Dict[str, str]:
+async def delete_object(bucket_name: str, object_name: str) -> Dict[str, str]:
     """Delete an object from a MinIO bucket."""
     try:
-        s3_client.delete_object(Bucket=bucket_name, Key=object_name)
+        await storage_manager.client.delete_object(Bucket=bucket_name, Key=object_name)
         return {"message": f"Object '{object_name}' from bucket '{bucket_name}' deleted successfully."}
     except ClientError as e:
         raise HTTPException(status_code=400, detail=f"Error deleting object: {e}")
 
 @app.get("/datasets/{bucket_name}")
-def list_objects(bucket_name: str) -> Dict[str, Union[str, List[str]]]:
+async def list_objects(bucket_name: str) -> Dict[str, Union[str, List[str]]]:
     """List objects in a MinIO bucket."""
     try:
-        response = s3_client.list_objects_v2(Bucket=bucket_name)
+        response = await storage_manager.client.list_objects_v2(Bucket=bucket_name)
         objects = [obj['Key'] for obj in response.get('Contents', [])]
         return {"bucket": bucket_name, "objects": objects}
     except ClientError as e:
@@ -911,14 +985,14 @@ def list_objects(bucket_name: str) -> Dict[str, Union[str, List[str]]]:
 @app.post("/jobs")
 async def create_job(job: Job) -> Dict[str, str]:
     """Create a new job definition"""
-    request_id = str(uuid.uuid4())
-    log_event("INFO", "Creating job", request_id=request_id, job_name=job.name)
+    request_id = current_request_id()
+    log_event("INFO", "Creating job", job_name=job.name)
     try:
         # Job creation doesn't generate lineage events, just log it
-        log_event("INFO", "Job created successfully", request_id=request_id, job_name=job.name)
+        log_event("INFO", "Job created successfully", job_name=job.name)
         return {"message": f"Job '{job.name}' created successfully.", "request_id": request_id}
     except Exception as e:
-        log_event("ERROR", "Failed to create job", request_id=request_id, job_name=job.name, error=str(e))
+        log_event("ERROR", "Failed to create job", job_name=job.name, error=str(e))
         raise HTTPException(status_code=400, detail=f"Error creating job: {e}")
 
 
@@ -926,10 +1000,10 @@ async def create_job(job: Job) -> Dict[str, str]:
 async def start_job_run(job_name: str, job_run: JobRun) -> Dict[str, str]:
     """Start a new job run with OpenLineage tracking"""
     run_id = uuid.uuid4()
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     
     log_event("INFO", "Starting job run", 
-              request_id=request_id, job_name=job_name, run_id=str(run_id))
+              job_name=job_name, run_id=str(run_id))
     
     try:
         # Broadcast job start via SSE
@@ -960,7 +1034,7 @@ async def start_job_run(job_name: str, job_run: JobRun) -> Dict[str, str]:
         )
         
         log_event("INFO", "Job run started successfully", 
-                  request_id=request_id, job_name=job_name, run_id=str(run_id))
+                  job_name=job_name, run_id=str(run_id))
         
         return {
             "message": f"Job run started for '{job_name}'",
@@ -978,17 +1052,17 @@ async def start_job_run(job_name: str, job_run: JobRun) -> Dict[str, str]:
         )
         
         log_event("ERROR", "Failed to start job run", 
-                  request_id=request_id, job_name=job_name, error=str(e))
+                  job_name=job_name, error=str(e))
         raise HTTPException(status_code=400, detail=f"Error starting job run: {e}")
 
 
 @app.put("/jobs/{job_name}/runs/{run_id}/complete")
 async def complete_job_run(job_name: str, run_id: UUID, completion: JobRunComplete) -> Dict[str, str]:
     """Complete a job run with OpenLineage tracking"""
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     
     log_event("INFO", "Completing job run", 
-              request_id=request_id, job_name=job_name, run_id=str(run_id))
+              job_name=job_name, run_id=str(run_id))
     
     try:
         # Broadcast job completion progress via SSE
@@ -1007,21 +1081,12 @@ async def complete_job_run(job_name: str, run_id: UUID, completion: JobRunComple
         # TODO: This could be enhanced to track actual datasets used during the run
         # For now, we'll track any tables or datasets mentioned in metadata
         if completion.metadata:
-            if "inputs" in completion.metadata:
-                for input_name in completion.metadata["inputs"]:
-                    inputs.append(await lineage_manager.create_dataset_facet(
-                        namespace="ducklake",
-                        name=input_name,
-                        uri=f"ducklake://tables/{input_name}"
-                    ))
-            
-            if "outputs" in completion.metadata:
-                for output_name in completion.metadata["outputs"]:
-                    outputs.append(await lineage_manager.create_dataset_facet(
-                        namespace="ducklake", 
-                        name=output_name,
-                        uri=f"ducklake://tables/{output_name}"
-                    ))
+            inputs = lineage_manager.create_dataset_facets_bulk(
+                "ducklake", completion.metadata.get("inputs", []), DUCKLAKE_TABLE_URI_PREFIX
+            )
+            outputs = lineage_manager.create_dataset_facets_bulk(
+                "ducklake", completion.metadata.get("outputs", []), DUCKLAKE_TABLE_URI_PREFIX
+            )
         
         # Create OpenLineage COMPLETE event
         event_type = "COMPLETE" if completion.success else "FAIL"
@@ -1047,7 +1112,7 @@ async def complete_job_run(job_name: str, run_id: UUID, completion: JobRunComple
         )
         
         log_event("INFO", "Job run completed successfully", 
-                  request_id=request_id, job_name=job_name, run_id=str(run_id), 
+                  job_name=job_name, run_id=str(run_id), 
                   success=completion.success)
         
         return {
@@ -1066,46 +1131,46 @@ async def complete_job_run(job_name: str, run_id: UUID, completion: JobRunComple
         )
         
         log_event("ERROR", "Failed to complete job run", 
-                  request_id=request_id, job_name=job_name, run_id=str(run_id), error=str(e))
+                  job_name=job_name, run_id=str(run_id), error=str(e))
         raise HTTPException(status_code=400, detail=f"Error completing job run: {e}")
 
 
 @app.get("/jobs")
 async def list_jobs() -> Dict[str, Union[List[Any], str]]:
     """List all jobs"""
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     try:
         # This would typically come from database, for now return empty
-        log_event("INFO", "Listing jobs", request_id=request_id)
+        log_event("INFO", "Listing jobs")
         return {"jobs": [], "request_id": request_id}
     except Exception as e:
-        log_event("ERROR", "Failed to list jobs", request_id=request_id, error=str(e))
+        log_event("ERROR", "Failed to list jobs", error=str(e))
         raise HTTPException(status_code=500, detail=f"Error listing jobs: {e}")
 
 
 @app.get("/jobs/{job_name}")
 async def get_job(job_name: str) -> Dict[str, Union[str, List[Dict[str, Any]]]]:
     """Get job metadata and status"""
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     try:
         # Get job runs from lineage manager
         runs = await lineage_manager.get_job_runs(job_name)
         
-        log_event("INFO", "Retrieved job info", request_id=request_id, job_name=job_name)
+        log_event("INFO", "Retrieved job info", job_name=job_name)
         return {
             "name": job_name,
             "runs": runs,
             "request_id": request_id
         }
     except Exception as e:
-        log_event("ERROR", "Failed to get job", request_id=request_id, job_name=job_name, error=str(e))
+        log_event("ERROR", "Failed to get job", job_name=job_name, error=str(e))
         raise HTTPException(status_code=500, detail=f"Error getting job: {e}")
 
 
 @app.get("/jobs/{job_name}/runs/{run_id}")
 async def get_job_run(job_name: str, run_id: UUID) -> Dict[str, Any]:
     """Get details of a specific job run"""
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     try:
         # Get run lineage from lineage manager
         lineage = await lineage_manager.get_run_lineage(run_id)
@@ -1114,11 +1179,11 @@ async def get_job_run(job_name: str, run_id: UUID) -> Dict[str, Any]:
             raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
         
         log_event("INFO", "Retrieved job run info", 
-                  request_id=request_id, job_name=job_name, run_id=str(run_id))
+                  job_name=job_name, run_id=str(run_id))
         return {**lineage, "request_id": request_id}
     except HTTPException:
         raise
     except Exception as e:
         log_event("ERROR", "Failed to get job run", 
-                  request_id=request_id, job_name=job_name, run_id=str(run_id), error=str(e))
+                  job_name=job_name, run_id=str(run_id), error=str(e))
         raise HTTPException(status_code=500, detail=f"Error getting job run: {e}")
@@ -0,0 +1,151 @@
+"""
+Caches for DuckLake reads
+Query results expire after a TTL and are dropped wholesale on any table
+write; table schemas are kept until DDL touches the table or a short
+TTL runs out
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import duckdb
+
+from .config import get_settings
+
+settings = get_settings()
+
+@lru_cache(maxsize=1024)
+def is_read_only(sql: str) -> bool:
+    """True if sql is exactly one plain read statement
+    
+    Classified by DuckDB's own parser, so a read followed by anything else
+    ("SELECT 1; DROP TABLE ...", "SELECT 1; SET ...") is not a read.
+    DESCRIBE, SHOW, SUMMARIZE and table-valued PRAGMAs parse as SELECT.
+    Unparseable SQL isn't a read either; executing it reports the error.
+    """
+    try:
+        statements = duckdb.extract_statements(sql)
+    except duckdb.Error:
+        return False
+    return len(statements) == 1 and statements[0].type == duckdb.StatementType.SELECT
+
+
+class QueryResultCache:
+    """Bounded LRU of query results with per-entry TTL
+
+    Concurrent misses on the same key run the query once; the other
+    callers wait for that result instead of stampeding DuckDB.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, enabled: bool = True) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled and maxsize > 0
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        # Bumped on every write so results computed across a write aren't stored
+        self._version = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for key, computing it on a miss"""
+        if not self.enabled:
+            return compute()
+
+        while True:
+            with self._lock:
+                entry = self._data.get(key)
+                if entry is not None:
+                    if entry[0] > time.monotonic():
+                        self._data.move_to_end(key)
+                        return entry[1]
+                    del self._data[key]
+
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = self._inflight[key] = threading.Event()
+                    version = self._version
+                    break
+
+            # Another request is running this query; wait, then re-check
+            pending.wait()
+
+        try:
+            value = compute()
+            with self._lock:
+                if version == self._version:
+                    self._data[key] = (time.monotonic() + self.ttl, value)
+                    self._data.move_to_end(key)
+                    if len(self._data) > self.maxsize:
+                        self._data.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            pending.set()
+
+    def invalidate(self) -> None:
+        """Drop every cached result (called after table writes)"""
+        with self._lock:
+            self._version += 1
+            self._data.clear()
+
+
+class TableSchemaCache:
+    """Column name -> type per table, each kept for a short TTL
+
+    DDL through this process discards the entry at once; the TTL bounds
+    how long DDL from another replica or client can go unnoticed.
+    """
+
+    def __init__(self, ttl: float, enabled: bool = True) -> None:
+        self.ttl = ttl
+        self.enabled = enabled and ttl > 0
+        self._lock = threading.Lock()
+        self._data: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._version = 0
+
+    def get_or_load(self, table_name: str, load: Callable[[], Dict[str, str]]) -> Dict[str, str]:
+        """Return the cached schema, loading (and caching) it on a miss"""
+        if not self.enabled:
+            return load()
+
+        with self._lock:
+            entry = self._data.get(table_name)
+            version = self._version
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        schema = load()
+        with self._lock:
+            # Unknown tables aren't cached; nor is anything loaded across DDL
+            if schema and version == self._version:
+                self._data[table_name] = (time.monotonic() + self.ttl, schema)
+        return schema
+
+    def discard(self, table_name: str) -> None:
+        """Forget one table's schema (after CREATE/DROP)"""
+        with self._lock:
+            self._version += 1
+            self._data.pop(table_name, None)
+
+    def clear(self) -> None:
+        """Forget every schema (after statements that may have run DDL)"""
+        with self._lock:
+            self._version += 1
+            self._data.clear()
+
+
+# Global query result cache
+query_cache = QueryResultCache(
+    maxsize=settings.database.duckdb_query_cache_size,
+    ttl=settings.database.duckdb_query_cache_ttl,
+    enabled=settings.features.enable_request_caching
+)
+
+# Global table schema cache; on regardless of request caching, since JSON
+# appends need the schema on each call and its TTL bounds staleness
+schema_cache = TableSchemaCache(ttl=settings.database.duckdb_schema_cache_ttl)
@@ -5,15 +5,27 @@ Background worker for processing OpenLineage events from PGMQ
 import asyncio
 import time
 import orjson
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import asyncpg
 from loguru import logger
 from .config import get_settings
-from .lineage import LineageEvent, lineage_manager
+from .lineage import QUEUE_NOTIFY_CHANNEL, LineageEvent, init_queue_connection, lineage_manager
 
 settings = get_settings()
 
+# Both queues are read in one round trip; notifications use a short 1s setting
+PGMQ_READ_QUEUES_SQL = """
+    SELECT 'lineage_events' AS queue, msg_id, message FROM pgmq.read('lineage_events', $1, $2)
+    UNION ALL
+    SELECT 'lineage_notifications' AS queue, msg_id, message FROM pgmq.read('lineage_notifications', $1, 1)
+"""
+
+# PGMQ statements take the queue name as a parameter, so each is prepared once
+# per connection (asyncpg's statement cache) and shared by every queue
+PGMQ_DELETE_SQL = "SELECT pgmq.delete($1, $2::bigint[])"
+PGMQ_SEND_SQL = "SELECT pgmq.send($1, $2::jsonb)"
+
 
 class QueueWorker:
     """Background worker for processing queued OpenLineage events"""
@@ -35,6 +47,8 @@ class QueueWorker:
             min_size=max(1, settings.database.postgres_min_connections // 2),  # Use fewer connections for worker
             max_size=max(5, settings.database.postgres_max_connections // 2),
             command_timeout=settings.database.postgres_command_timeout,
+            statement_cache_size=settings.database.postgres_statement_cache_size,
+            init=init_queue_connection,
             server_settings={'application_name': 'ducklake-worker'}
         )
         
@@ -58,8 +72,7 @@ class QueueWorker:
         
         # Start processing tasks
         self.tasks = [
-            asyncio.create_task(self._process_lineage_events()),
-            asyncio.create_task(self._process_notifications()),
+            asyncio.create_task(self._poll_queues()),
             asyncio.create_task(self._broadcast_queue_metrics()),
         ]
         
@@ -89,163 +102,197 @@ class QueueWorker:
         
         logger.info("Queue worker stopped")
     
-    async def _process_lineage_events(self) -> None:
-        """Process OpenLineage events from the queue"""
-        while self.running:
-            try:
-                async with self.db_pool.acquire() as conn:
-                    # Read messages from queue
-                    rows = await conn.fetch(
-                        "SELECT msg_id, message FROM pgmq.read('lineage_events', $1, $2)",
-                        settings.queue.queue_batch_size,
-                        settings.queue.queue_poll_interval
-                    )
-                    
-                    for row in rows:
-                        msg_id = row['msg_id']
-                        message_data = row['message']
-                        
+    async def _poll_queues(self) -> None:
+        """Read both queues in one round trip and dispatch their messages
+        
+        Lineage events fan out to a fixed set of workers, each owning one
+        connection for its lifetime; notifications are broadcast inline while
+        the workers run. The next batch is read once the current one is done
+        so messages never outlive their visibility timeout. Handled messages
+        are deleted together, in one round trip per queue and batch.
+        
+        The poller keeps its own connection and LISTENs on it: when idle it
+        sleeps until a producer NOTIFYs, falling back to polling every
+        queue_poll_interval seconds for producers that don't.
+        """
+        event_queue: asyncio.Queue = asyncio.Queue()
+        acks: List[int] = []
+        workers = [
+            asyncio.create_task(self._lineage_worker(event_queue, acks))
+            for _ in range(settings.queue.worker_count)
+        ]
+        wakeup = asyncio.Event()
+        
+        def on_notify(*_: Any) -> None:
+            wakeup.set()
+        
+        try:
+            while self.running:
+                try:
+                    async with self.db_pool.acquire() as conn:
+                        await conn.add_listener(QUEUE_NOTIFY_CHANNEL, on_notify)
                         try:
-                            # Parse the lineage event
-                            event_dict = orjson.loads(message_data) if isinstance(message_data, str) else message_data
-                            event = LineageEvent(**event_dict)
-                            
-                            # Broadcast event start via SSE
-                            if self.sse_manager:
-                                await self.sse_manager.broadcast_lineage_event(
-                                    event_type=event.eventType,
-                                    run_id=event.run['runId'],
-                                    job_name=event.job['name'],
-                                    status="processing",
-                                    metadata={
-                                        "msg_id": msg_id,
-                                        "namespace": event.job.get('namespace', 'default')
-                                    }
-                                )
-                            
-                            # Process the event with performance tracking
-                            start_time = time.time()
-                            success = await lineage_manager.process_event(event)
-                            processing_duration = time.time() - start_time
-                            
-                            # Track lineage processing performance
-                            from .instrumentation.performance import performance_monitor
-                            performance_monitor.track_lineage_event(
-                                event.eventType, 
-                                processing_duration, 
-                                success
-                            )
-                            
-                            if success:
-                                # Delete message from queue
-                                await conn.execute(
-                                    "SELECT pgmq.delete('lineage_events', $1)",
-                                    msg_id
-                                )
+                            while self.running and not conn.is_closed():
+                                # Cleared before the read, so a NOTIFY that lands
+                                # while this batch is processed triggers a re-poll
+                                wakeup.clear()
                                 
-                                # Broadcast successful processing via SSE
-                                if self.sse_manager:
-                                    await self.sse_manager.broadcast_lineage_event(
-                                        event_type=event.eventType,
-                                        run_id=event.run['runId'],
-                                        job_name=event.job['name'],
-                                        status="completed",
-                                        metadata={
-                                            "msg_id": msg_id,
-                                            "processing_duration": processing_duration,
-                                            "namespace": event.job.get('namespace', 'default')
-                                        }
-                                    )
+                                # Read messages from both queues
+                                rows = await conn.fetch(
+                                    PGMQ_READ_QUEUES_SQL,
+                                    settings.queue.queue_batch_size,
+                                    settings.queue.queue_poll_interval
+                                )
                                 
-                                logger.debug(f"Processed lineage event: {event.eventType} for run {event.run['runId']}")
-                            else:
-                                # Move to dead letter queue
-                                await self._move_to_dlq(conn, msg_id, message_data, "Processing failed")
+                                notification_ids = []
+                                for row in rows:
+                                    if row['queue'] == 'lineage_events':
+                                        event_queue.put_nowait((row['msg_id'], row['message']))
+                                        continue
+                                    
+                                    notification_ids.append(row['msg_id'])
+                                    try:
+                                        # Process notification and broadcast via SSE
+                                        await self._handle_notification(row['message'])
+                                    except Exception as e:
+                                        logger.error(f"Error processing notification {row['msg_id']}: {e}")
+                                await event_queue.join()
                                 
-                                # Broadcast failure via SSE
-                                if self.sse_manager:
-                                    await self.sse_manager.broadcast_lineage_event(
-                                        event_type=event.eventType,
-                                        run_id=event.run['runId'],
-                                        job_name=event.job['name'],
-                                        status="failed",
-                                        metadata={
-                                            "msg_id": msg_id,
-                                            "error": "Processing failed"
-                                        }
-                                    )
+                                if acks:
+                                    await conn.execute(PGMQ_DELETE_SQL, "lineage_events", acks)
+                                    acks.clear()
+                                if notification_ids:
+                                    # Failed notifications are dropped too (they're not critical)
+                                    await conn.execute(PGMQ_DELETE_SQL, "lineage_notifications", notification_ids)
                                 
-                        except Exception as e:
-                            logger.error(f"Error processing message {msg_id}: {e}")
-                            # Move to dead letter queue
-                            await self._move_to_dlq(conn, msg_id, message_data, str(e))
-                            
-                            # Broadcast error via SSE
-                            if self.sse_manager:
-                                await self.sse_manager.broadcast_error(
-                                    error_type="lineage_processing_error",
-                                    message=f"Failed to process lineage event: {str(e)}",
-                                    details={
-                                        "msg_id": msg_id,
-                                        "error": str(e)
-                                    }
-                                )
-                    
-                    if not rows:
-                        # No messages, wait before next poll
-                        await asyncio.sleep(1)
+                                if not rows:
+                                    # No messages: wait for a NOTIFY (or the fallback poll)
+                                    try:
+                                        await asyncio.wait_for(wakeup.wait(), settings.queue.queue_poll_interval)
+                                    except asyncio.TimeoutError:
+                                        pass
+                        finally:
+                            if not conn.is_closed():
+                                await conn.remove_listener(QUEUE_NOTIFY_CHANNEL, on_notify)
                         
-            except Exception as e:
-                logger.error(f"Error in lineage event processing: {e}")
-                if self.sse_manager:
-                    await self.sse_manager.broadcast_error(
-                        error_type="queue_processing_error",
-                        message=f"Queue processing error: {str(e)}",
-                        details={"component": "lineage_events"}
-                    )
-                await asyncio.sleep(5)  # Wait before retrying
+                except Exception as e:
+                    logger.error(f"Error in queue processing: {e}")
+                    if self.sse_manager:
+                        await self.sse_manager.broadcast_error(
+                            error_type="queue_processing_error",
+                            message=f"Queue processing error: {str(e)}",
+                            details={"component": "queue_worker"}
+                        )
+                    await asyncio.sleep(5)  # Wait before retrying
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
     
-    async def _process_notifications(self) -> None:
-        """Process real-time notifications"""
+    async def _lineage_worker(self, event_queue: asyncio.Queue, acks: List[int]) -> None:
+        """Process queued lineage messages on one dedicated connection"""
         while self.running:
             try:
-                async with self.db_pool.acquire() as conn:
-                    # Read notification messages
-                    rows = await conn.fetch(
-                        "SELECT msg_id, message FROM pgmq.read('lineage_notifications', $1, $2)",
-                        settings.queue.queue_batch_size,
-                        1  # Shorter poll interval for notifications
-                    )
-                    
-                    for row in rows:
-                        msg_id = row['msg_id']
-                        message_data = row['message']
-                        
+                async with lineage_manager.write_pool.acquire() as conn:
+                    while not conn.is_closed():
+                        msg_id, message_data = await event_queue.get()
                         try:
-                            # Process notification and broadcast via SSE
-                            await self._handle_notification(message_data)
-                            
-                            # Delete message from queue
-                            await conn.execute(
-                                "SELECT pgmq.delete('lineage_notifications', $1)",
-                                msg_id
-                            )
-                            
-                        except Exception as e:
-                            logger.error(f"Error processing notification {msg_id}: {e}")
-                            # Delete failed notifications (they're not critical)
-                            await conn.execute(
-                                "SELECT pgmq.delete('lineage_notifications', $1)",
-                                msg_id
-                            )
-                    
-                    if not rows:
-                        # No messages, wait before next poll
-                        await asyncio.sleep(2)
-                        
+                            if await self._handle_lineage_message(conn, msg_id, message_data):
+                                acks.append(msg_id)
+                        finally:
+                            event_queue.task_done()
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"Error in notification processing: {e}")
-                await asyncio.sleep(5)
+                logger.error(f"Lineage worker connection lost: {e}")
+                await asyncio.sleep(1)  # Wait before reacquiring
+    
+    async def _handle_lineage_message(self, conn: asyncpg.Connection, msg_id: int, message_data: Any) -> bool:
+        """Process one lineage message, dead-lettering it on failure
+        
+        Returns True once the message can be deleted from the queue.
+        """
+        try:
+            # Parse the raw message once; the same bytes become event_data
+            event = LineageEvent.from_dict(orjson.loads(message_data))
+            
+            # Broadcast event start via SSE
+            if self.sse_manager:
+                await self.sse_manager.broadcast_lineage_event(
+                    event_type=event.eventType,
+                    run_id=event.run['runId'],
+                    job_name=event.job['name'],
+                    status="processing",
+                    metadata={
+                        "msg_id": msg_id,
+                        "namespace": event.job.get('namespace', 'default')
+                    }
+                )
+            
+            # Process the event with performance tracking
+            start_time = time.time()
+            success = await lineage_manager.process_event(event, conn, raw=message_data)
+            processing_duration = time.time() - start_time
+            
+            # Track lineage processing performance
+            from .instrumentation.performance import performance_monitor
+            performance_monitor.track_lineage_event(
+                event.eventType, 
+                processing_duration, 
+                success
+            )
+            
+            if success:
+                # Broadcast successful processing via SSE
+                if self.sse_manager:
+                    await self.sse_manager.broadcast_lineage_event(
+                        event_type=event.eventType,
+                        run_id=event.run['runId'],
+                        job_name=event.job['name'],
+                        status="completed",
+                        metadata={
+                            "msg_id": msg_id,
+                            "processing_duration": processing_duration,
+                            "namespace": event.job.get('namespace', 'default')
+                        }
+                    )
+                
+                logger.debug("Processed lineage event: {} for run {}", event.eventType, event.run["runId"])
+                return True
+            else:
+                # Move to dead letter queue
+                moved = await self._move_to_dlq(conn, msg_id, message_data, "Processing failed")
+                
+                # Broadcast failure via SSE
+                if self.sse_manager:
+                    await self.sse_manager.broadcast_lineage_event(
+                        event_type=event.eventType,
+                        run_id=event.run['runId'],
+                        job_name=event.job['name'],
+                        status="failed",
+                        metadata={
+                            "msg_id": msg_id,
+                            "error": "Processing failed"
+                        }
+                    )
+                return moved
+                
+        except Exception as e:
+            logger.error(f"Error processing message {msg_id}: {e}")
+            # Move to dead letter queue
+            moved = await self._move_to_dlq(conn, msg_id, message_data, str(e))
+            
+            # Broadcast error via SSE
+            if self.sse_manager:
+                await self.sse_manager.broadcast_error(
+                    error_type="lineage_processing_error",
+                    message=f"Failed to process lineage event: {str(e)}",
+                    details={
+                        "msg_id": msg_id,
+                        "error": str(e)
+                    }
+                )
+            return moved
     
     async def _broadcast_queue_metrics(self) -> None:
         """Periodically broadcast queue metrics via SSE"""
@@ -265,39 +312,45 @@ class QueueWorker:
                 logger.error(f"Error broadcasting queue metrics: {e}")
                 await asyncio.sleep(30)
     
-    async def _move_to_dlq(self, conn: asyncpg.Connection, msg_id: int, message_data: Any, error: str) -> None:
-        """Move a failed message to dead letter queue"""
+    async def _move_to_dlq(self, conn: asyncpg.Connection, msg_id: int, message_data: Any, error: str) -> bool:
+        """Copy a failed message to the dead letter queue
+        
+        The caller deletes it from the original queue (batched with the
+        processed messages) once this returns True.
+        """
         try:
             # Create DLQ message with error info
-            dlq_message = {
-                "original_message": message_data,
+            error_info = {
                 "error": error,
                 "timestamp": "now()",
                 "msg_id": msg_id
             }
+            if isinstance(message_data, bytes):
+                # Raw jsonb text from the queue: splice it in as-is rather than
+                # decoding it into a str just to have orjson encode it again
+                dlq_message = b'{"original_message":' + message_data + b"," + orjson.dumps(error_info)[1:]
+            else:
+                dlq_message = orjson.dumps({"original_message": message_data, **error_info})
             
             # Send to dead letter queue
             await conn.execute(
-                "SELECT pgmq.send('lineage_events_dlq', $1)",
-                orjson.dumps(dlq_message).decode('utf-8')
-            )
-            
-            # Delete from original queue
-            await conn.execute(
-                "SELECT pgmq.delete('lineage_events', $1)",
-                msg_id
+                PGMQ_SEND_SQL,
+                "lineage_events_dlq",
+                dlq_message
             )
             
             logger.warning(f"Moved message {msg_id} to DLQ: {error}")
+            return True
             
         except Exception as e:
             logger.error(f"Failed to move message {msg_id} to DLQ: {e}")
+            return False
     
     async def _handle_notification(self, message_data: Any) -> None:
         """Handle real-time notification and broadcast via SSE"""
         try:
             # Parse notification data
-            if isinstance(message_data, str):
+            if isinstance(message_data, (str, bytes)):
                 notification = orjson.loads(message_data)
             else:
                 notification = message_data
@@ -326,7 +379,7 @@ class QueueWorker:
                         data=notification
                     )
             
-            logger.debug(f"Processed notification: {notification}")
+            logger.debug("Processed notification: {}", notification)
             
         except Exception as e:
             logger.error(f"Error handling notification: {e}")
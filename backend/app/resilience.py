@@ -25,6 +25,10 @@ from .exceptions import (
 
 T = TypeVar('T')
 
+# asyncio.timeout (3.11+) scopes the running task; wait_for wraps the call
+# in a new Task. Fall back to wait_for on older interpreters
+_asyncio_timeout = getattr(asyncio, "timeout", None)
+
 
 class CircuitState(Enum):
     """Circuit breaker states."""
@@ -39,7 +43,7 @@ class CircuitBreakerConfig:
     failure_threshold: int = 5              # Failures before opening
     recovery_timeout: float = 60.0          # Seconds before attempting recovery
     success_threshold: int = 3              # Successes needed to close from half-open
-    timeout: float = 30.0                   # Request timeout in seconds
+    timeout: float = 30.0                   # Request timeout in seconds (<= 0 disables)
     expected_exceptions: tuple = (Exception,)  # Exceptions that count as failures
 
 
@@ -49,7 +53,7 @@ class CircuitBreakerStats:
     state: CircuitState = CircuitState.CLOSED
     failure_count: int = 0
     success_count: int = 0
-    last_failure_time: Optional[datetime] = None
+    last_failure_time_ns: Optional[int] = None  # time.monotonic_ns()
     total_requests: int = 0
     total_failures: int = 0
     total_successes: int = 0
@@ -61,109 +65,136 @@ class CircuitBreaker(Generic[T]):
     
     Prevents cascading failures by monitoring operation success/failure rates
     and temporarily stopping requests when failures exceed threshold.
+    
+    A breaker belongs to one event loop, and none of its bookkeeping awaits,
+    so every state check and update already runs atomically; there's no lock
+    to take on the way in or out of a call.
     """
     
     def __init__(self, name: str, config: Optional[CircuitBreakerConfig] = None):
         self.name = name
         self.config = config or CircuitBreakerConfig()
         self.stats = CircuitBreakerStats()
-        self._lock = asyncio.Lock()
+        self._recovery_timeout_ns = int(self.config.recovery_timeout * 1_000_000_000)
+        # Earliest moment an OPEN breaker may try HALF_OPEN; moved on each failure
+        self._reopen_deadline_ns = 0
     
-    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
-        """Execute function with circuit breaker protection."""
-        async with self._lock:
-            self.stats.total_requests += 1
-            
-            # Check if circuit is open
-            if self.stats.state == CircuitState.OPEN:
-                if self._should_attempt_reset():
-                    logger.info("Circuit breaker attempting reset", circuit=self.name)
-                    self.stats.state = CircuitState.HALF_OPEN
-                    self.stats.success_count = 0
-                else:
-                    logger.warning("Circuit breaker is open, rejecting request", circuit=self.name)
-                    raise ResourceException(
-                        f"Circuit breaker '{self.name}' is open",
-                        error_code="CIRCUIT_BREAKER_OPEN",
-                        context={
-                            "circuit_name": self.name,
-                            "state": self.stats.state.value,
-                            "failure_count": self.stats.failure_count
-                        }
-                    )
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Execute func(*args, **kwargs) with circuit breaker protection."""
+        stats = self.stats
+        stats.total_requests += 1
+        
+        # Check if circuit is open
+        if stats.state is CircuitState.OPEN:
+            if self._should_attempt_reset():
+                logger.info("Circuit breaker attempting reset", circuit=self.name)
+                stats.state = CircuitState.HALF_OPEN
+                stats.success_count = 0
+            else:
+                logger.warning("Circuit breaker is open, rejecting request", circuit=self.name)
+                raise ResourceException(
+                    f"Circuit breaker '{self.name}' is open",
+                    error_code="CIRCUIT_BREAKER_OPEN",
+                    context={
+                        "circuit_name": self.name,
+                        "state": stats.state.value,
+                        "failure_count": stats.failure_count
+                    }
+                )
         
         # Execute the function
+        timeout = self.config.timeout
         try:
             # Apply timeout
-            result = await asyncio.wait_for(func(), timeout=self.config.timeout)
-            await self._record_success()
-            return result
+            if timeout <= 0:
+                result = await func(*args, **kwargs)
+            elif _asyncio_timeout is not None:
+                async with _asyncio_timeout(timeout):
+                    result = await func(*args, **kwargs)
+            else:
+                result = await asyncio.wait_for(func(*args, **kwargs), timeout=timeout)
         
         except asyncio.TimeoutError:
             timeout_error = TimeoutError(f"Circuit breaker {self.name}", self.config.timeout)
-            await self._record_failure(timeout_error)
+            self._record_failure(timeout_error)
             raise timeout_error
         
         except self.config.expected_exceptions as e:
-            await self._record_failure(e)
+            self._record_failure(e)
             raise
         
         except Exception as e:
             # Unexpected exceptions don't count as circuit breaker failures
             logger.error("Unexpected error in circuit breaker", circuit=self.name, error=str(e))
             raise
+        
+        # Closed-state success, inlined: it's what nearly every call records
+        stats.total_successes += 1
+        if stats.state is CircuitState.CLOSED:
+            stats.failure_count = 0
+        else:
+            self._record_recovery_success()
+        return result
     
-    async def _record_success(self) -> None:
+    def _record_success(self) -> None:
         """Record a successful operation."""
-        async with self._lock:
-            self.stats.total_successes += 1
-            
-            if self.stats.state == CircuitState.HALF_OPEN:
-                self.stats.success_count += 1
-                logger.debug("Circuit breaker recorded success", 
-                           circuit=self.name, 
-                           success_count=self.stats.success_count)
-                
-                if self.stats.success_count >= self.config.success_threshold:
-                    self.stats.state = CircuitState.CLOSED
-                    self.stats.failure_count = 0
-                    logger.info("Circuit breaker closed after successful recovery", circuit=self.name)
+        stats = self.stats
+        stats.total_successes += 1
+        
+        if stats.state is CircuitState.CLOSED:
+            # Reset failure count on success
+            stats.failure_count = 0
+        else:
+            self._record_recovery_success()
+    
+    def _record_recovery_success(self) -> None:
+        """Count a success towards closing a HALF_OPEN breaker."""
+        stats = self.stats
+        if stats.state is CircuitState.HALF_OPEN:
+            stats.success_count += 1
+            logger.debug("Circuit breaker recorded success", 
+                       circuit=self.name, 
+                       success_count=stats.success_count)
             
-            elif self.stats.state == CircuitState.CLOSED:
-                # Reset failure count on success
-                self.stats.failure_count = 0
+            if stats.success_count >= self.config.success_threshold:
+                stats.state = CircuitState.CLOSED
+                stats.failure_count = 0
+                logger.info("Circuit breaker closed after successful recovery", circuit=self.name)
     
-    async def _record_failure(self, error: Exception) -> None:
+    def _record_failure(self, error: Exception) -> None:
         """Record a failed operation."""
-        async with self._lock:
-            self.stats.total_failures += 1
-            self.stats.failure_count += 1
-            self.stats.last_failure_time = datetime.now()
-            
-            logger.warning("Circuit breaker recorded failure", 
-                         circuit=self.name, 
-                         failure_count=self.stats.failure_count,
-                         error=str(error))
+        stats = self.stats
+        stats.total_failures += 1
+        stats.failure_count += 1
+        stats.last_failure_time_ns = time.monotonic_ns()
+        self._reopen_deadline_ns = stats.last_failure_time_ns + self._recovery_timeout_ns
+        
+        logger.warning("Circuit breaker recorded failure", 
+                     circuit=self.name, 
+                     failure_count=stats.failure_count,
+                     error=str(error))
+        
+        if (stats.state is not CircuitState.OPEN and 
+            stats.failure_count >= self.config.failure_threshold):
             
-            if (self.stats.state in [CircuitState.CLOSED, CircuitState.HALF_OPEN] and 
-                self.stats.failure_count >= self.config.failure_threshold):
-                
-                self.stats.state = CircuitState.OPEN
-                logger.error("Circuit breaker opened due to failures", 
-                           circuit=self.name,
-                           failure_count=self.stats.failure_count,
-                           threshold=self.config.failure_threshold)
+            stats.state = CircuitState.OPEN
+            logger.error("Circuit breaker opened due to failures", 
+                       circuit=self.name,
+                       failure_count=stats.failure_count,
+                       threshold=self.config.failure_threshold)
     
     def _should_attempt_reset(self) -> bool:
         """Check if circuit should attempt to reset."""
-        if not self.stats.last_failure_time:
-            return True
-        
-        time_since_failure = datetime.now() - self.stats.last_failure_time
-        return time_since_failure.total_seconds() >= self.config.recovery_timeout
+        return time.monotonic_ns() >= self._reopen_deadline_ns
     
     def get_stats(self) -> Dict[str, Any]:
         """Get circuit breaker statistics."""
+        last_failure = None
+        if self.stats.last_failure_time_ns is not None:
+            # Map the monotonic stamp back onto the wall clock for display
+            elapsed_ns = time.monotonic_ns() - self.stats.last_failure_time_ns
+            last_failure = (datetime.now() - timedelta(microseconds=elapsed_ns // 1000)).isoformat()
+        
         return {
             "name": self.name,
             "state": self.stats.state.value,
@@ -176,7 +207,7 @@ class CircuitBreaker(Generic[T]):
                 self.stats.total_successes / self.stats.total_requests 
                 if self.stats.total_requests > 0 else 0.0
             ),
-            "last_failure": self.stats.last_failure_time.isoformat() if self.stats.last_failure_time else None
+            "last_failure": last_failure
         }
 
 
@@ -202,9 +233,11 @@ class RetryableOperation:
     def __init__(self, name: str, config: Optional[RetryConfig] = None):
         self.name = name
         self.config = config or RetryConfig()
+        # Capped backoff per attempt, built on the first retry (most calls never retry)
+        self._delay_caps: Optional[tuple] = None
     
-    async def execute(self, func: Callable[[], Awaitable[T]]) -> T:
-        """Execute function with retry logic."""
+    async def execute(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Execute func(*args, **kwargs) with retry logic."""
         last_exception = None
         
         for attempt in range(1, self.config.max_attempts + 1):
@@ -214,7 +247,7 @@ class RetryableOperation:
                            attempt=attempt,
                            max_attempts=self.config.max_attempts)
                 
-                result = await func()
+                result = await func(*args, **kwargs)
                 
                 if attempt > 1:
                     logger.info("Retryable operation succeeded after retry", 
@@ -255,15 +288,22 @@ class RetryableOperation:
     
     def _calculate_delay(self, attempt: int) -> float:
         """Calculate delay for next retry attempt."""
-        delay = self.config.base_delay * (self.config.exponential_base ** (attempt - 1))
-        delay = min(delay, self.config.max_delay)
+        caps = self._delay_caps
+        if caps is None:
+            config = self.config
+            caps = self._delay_caps = tuple(
+                min(config.base_delay * config.exponential_base ** i, config.max_delay)
+                for i in range(max(config.max_attempts, 1))
+            )
+        
+        cap = caps[min(attempt, len(caps)) - 1]
         
         if self.config.jitter:
-            # Add random jitter to prevent thundering herd
-            jitter = random.uniform(0, delay * 0.1)
-            delay += jitter
+            # Full jitter: anywhere in [0, cap) so retrying clients spread out
+            # instead of waking in lockstep
+            return random.random() * cap
         
-        return delay
+        return cap
 
 
 @dataclass
@@ -286,34 +326,39 @@ class TokenBucketRateLimiter:
         self.config = config
         self.burst_size = config.burst_size or config.max_requests
         self.tokens = float(self.burst_size)
-        self.last_refill = time.time()
-        self._lock = asyncio.Lock()
+        self.last_refill = time.monotonic()
+        # Derived once; acquire() sits in front of every limited call
+        self._refill_rate = config.max_requests / config.window_seconds
+        self._burst_size_f = float(self.burst_size)
     
     async def acquire(self, tokens_needed: int = 1) -> None:
-        """Acquire tokens from the bucket."""
-        async with self._lock:
-            now = time.time()
-            
-            # Refill tokens based on elapsed time
-            elapsed = now - self.last_refill
-            tokens_to_add = elapsed * (self.config.max_requests / self.config.window_seconds)
-            self.tokens = min(self.burst_size, self.tokens + tokens_to_add)
-            self.last_refill = now
-            
-            if self.tokens >= tokens_needed:
-                self.tokens -= tokens_needed
-                logger.debug("Rate limiter granted tokens", 
-                           rate_limiter=self.name, 
-                           tokens_used=tokens_needed,
-                           tokens_remaining=self.tokens)
-            else:
-                current_rate = self.config.max_requests / self.config.window_seconds
-                raise RateLimitExceededError(
-                    operation=self.name,
-                    current_rate=current_rate,
-                    limit=current_rate,
-                    window_seconds=self.config.window_seconds
-                )
+        """Acquire tokens from the bucket.
+        
+        Nothing here awaits, so the refill-and-take runs atomically on the
+        event loop without a lock.
+        """
+        now = time.monotonic()
+        
+        # Refill tokens based on elapsed time
+        tokens = self.tokens + (now - self.last_refill) * self._refill_rate
+        if tokens > self._burst_size_f:
+            tokens = self._burst_size_f
+        self.last_refill = now
+        
+        if tokens >= tokens_needed:
+            self.tokens = tokens - tokens_needed
+            logger.debug("Rate limiter granted tokens", 
+                       rate_limiter=self.name, 
+                       tokens_used=tokens_needed,
+                       tokens_remaining=self.tokens)
+        else:
+            self.tokens = tokens
+            raise RateLimitExceededError(
+                operation=self.name,
+                current_rate=self._refill_rate,
+                limit=self._refill_rate,
+                window_seconds=self.config.window_seconds
+            )
     
     def get_stats(self) -> Dict[str, Any]:
         """Get rate limiter statistics."""
@@ -321,7 +366,7 @@ class TokenBucketRateLimiter:
             "name": self.name,
             "tokens_available": self.tokens,
             "max_tokens": self.burst_size,
-            "refill_rate": self.config.max_requests / self.config.window_seconds,
+            "refill_rate": self._refill_rate,
             "window_seconds": self.config.window_seconds
         }
 
@@ -335,21 +380,30 @@ class ResilienceManager:
     """
     
     def __init__(self):
+        # Each breaker carries its own state, so calls through different
+        # operation names never contend; the registries are only read on the
+        # hot path (one dict probe), written once per new name
         self.circuit_breakers: Dict[str, CircuitBreaker] = {}
         self.rate_limiters: Dict[str, TokenBucketRateLimiter] = {}
         self.retry_configs: Dict[str, RetryConfig] = {}
+        # Scrapes within stats_cache_ttl of each other share one snapshot
+        self.stats_cache_ttl = 1.0
+        self._stats_snapshot: Optional[Dict[str, Any]] = None
+        self._stats_expires = 0.0
     
     def get_circuit_breaker(self, name: str, config: Optional[CircuitBreakerConfig] = None) -> CircuitBreaker:
         """Get or create a circuit breaker."""
-        if name not in self.circuit_breakers:
-            self.circuit_breakers[name] = CircuitBreaker(name, config)
-        return self.circuit_breakers[name]
+        breaker = self.circuit_breakers.get(name)
+        if breaker is None:
+            breaker = self.circuit_breakers.setdefault(name, CircuitBreaker(name, config))
+        return breaker
     
     def get_rate_limiter(self, name: str, config: RateLimiterConfig) -> TokenBucketRateLimiter:
         """Get or create a rate limiter."""
-        if name not in self.rate_limiters:
-            self.rate_limiters[name] = TokenBucketRateLimiter(name, config)
-        return self.rate_limiters[name]
+        limiter = self.rate_limiters.get(name)
+        if limiter is None:
+            limiter = self.rate_limiters.setdefault(name, TokenBucketRateLimiter(name, config))
+        return limiter
     
     def get_retry_operation(self, name: str, config: Optional[RetryConfig] = None) -> RetryableOperation:
         """Get a retry operation."""
@@ -374,23 +428,26 @@ class ResilienceManager:
         circuit_breaker = self.get_circuit_breaker(operation_name, circuit_config)
         retry_operation = self.get_retry_operation(operation_name, retry_config)
         
-        async def protected_func():
-            return await circuit_breaker.call(func)
-        
-        return await retry_operation.execute(protected_func)
+        return await retry_operation.execute(circuit_breaker.call, func)
     
     def get_all_stats(self) -> Dict[str, Any]:
         """Get statistics for all resilience components."""
-        return {
+        now = time.monotonic()
+        if self._stats_snapshot is not None and now < self._stats_expires:
+            return self._stats_snapshot
+        
+        self._stats_snapshot = {
             "circuit_breakers": {
                 name: cb.get_stats() 
-                for name, cb in self.circuit_breakers.items()
+                for name, cb in list(self.circuit_breakers.items())
             },
             "rate_limiters": {
                 name: rl.get_stats() 
-                for name, rl in self.rate_limiters.items()
+                for name, rl in list(self.rate_limiters.items())
             }
         }
+        self._stats_expires = now + self.stats_cache_ttl
+        return self._stats_snapshot
 
 
 # Global resilience manager
@@ -398,13 +455,16 @@ resilience_manager = ResilienceManager()
 
 
 # Decorators for easy usage
+# Each resolves its breaker/limiter/retry operation once, when it decorates,
+# rather than looking it up in resilience_manager on every call
 def circuit_breaker(name: str, config: Optional[CircuitBreakerConfig] = None):
     """Decorator to add circuit breaker protection to async functions."""
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        cb_call = resilience_manager.get_circuit_breaker(name, config).call
+        
         @wraps(func)
         async def wrapper(*args, **kwargs) -> T:
-            cb = resilience_manager.get_circuit_breaker(name, config)
-            return await cb.call(lambda: func(*args, **kwargs))
+            return await cb_call(func, *args, **kwargs)
         return wrapper
     return decorator
 
@@ -412,10 +472,11 @@ def circuit_breaker(name: str, config: Optional[CircuitBreakerConfig] = None):
 def retryable(name: str, config: Optional[RetryConfig] = None):
     """Decorator to add retry logic to async functions."""
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        execute = resilience_manager.get_retry_operation(name, config).execute
+        
         @wraps(func)
         async def wrapper(*args, **kwargs) -> T:
-            retry_op = resilience_manager.get_retry_operation(name, config)
-            return await retry_op.execute(lambda: func(*args, **kwargs))
+            return await execute(func, *args, **kwargs)
         return wrapper
     return decorator
 
@@ -423,10 +484,11 @@ def retryable(name: str, config: Optional[RetryConfig] = None):
 def rate_limited(name: str, config: RateLimiterConfig):
     """Decorator to add rate limiting to async functions."""
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        acquire = resilience_manager.get_rate_limiter(name, config).acquire
+        
         @wraps(func)
         async def wrapper(*args, **kwargs) -> T:
-            rate_limiter = resilience_manager.get_rate_limiter(name, config)
-            await rate_limiter.acquire()
+            await acquire()
             return await func(*args, **kwargs)
         return wrapper
     return decorator
@@ -440,14 +502,18 @@ def resilient(
 ):
     """Decorator to add full resilience patterns to async functions."""
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        # Same composition as ResilienceManager.resilient_call
+        acquire = (
+            resilience_manager.get_rate_limiter(operation_name, rate_limit_config).acquire
+            if rate_limit_config else None
+        )
+        cb_call = resilience_manager.get_circuit_breaker(operation_name, circuit_config).call
+        execute = resilience_manager.get_retry_operation(operation_name, retry_config).execute
+        
         @wraps(func)
         async def wrapper(*args, **kwargs) -> T:
-            return await resilience_manager.resilient_call(
-                lambda: func(*args, **kwargs),
-                operation_name,
-                circuit_config,
-                retry_config,
-                rate_limit_config
-            )
+            if acquire is not None:
+                await acquire()
+            return await execute(cb_call, func, *args, **kwargs)
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
@@ -0,0 +1,19 @@
+"""
+Response classes for the DuckLake API.
+
+ORJSONResponse is installed as the app-wide default so every JSON endpoint
+renders through orjson instead of the stdlib json encoder.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        # Non-str keys (e.g. int-keyed stats) are allowed, as with the stdlib encoder
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
@@ -1,12 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Any
 from datetime import datetime
-import uuid
 
 from ..instrumentation import memory_monitor, performance_monitor
 from ..config import get_settings
 from ..config_monitor import config_monitor
-from ..main import _ducklake_connection_status, setup_ducklake_connection, validate_ducklake_connection, setup_ducklake_fallback, log_event
+from ..main import _ducklake_connection_status, setup_ducklake_connection, validate_ducklake_connection, setup_ducklake_fallback, log_event, current_request_id
 
 router = APIRouter(
     prefix="/admin",
@@ -27,7 +26,7 @@ def health_check() -> Dict[str, Any]:
     - Memory usage metrics
     - Performance statistics
     """
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     try:
         # Test DuckLake connection using tracked status
         ducklake_status = _ducklake_connection_status.copy()
@@ -64,10 +63,11 @@ def health_check() -> Dict[str, Any]:
             "request_id": request_id
         }
         
-        log_event("INFO", "Health check passed", request_id=request_id, **health_data)
+        # Probes hit this constantly; only log successes when debugging
+        log_event("DEBUG", "Health check passed", **health_data)
         return health_data
     except Exception as e:
-        log_event("ERROR", "Health check failed", request_id=request_id, error=str(e))
+        log_event("ERROR", "Health check failed", error=str(e))
         raise HTTPException(status_code=503, detail=f"Health check failed: {e}")
 
 
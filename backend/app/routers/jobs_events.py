@@ -1,13 +1,14 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Body, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional, Union
+from typing import Annotated, Dict, Any, List, Optional, Union
 from uuid import UUID
+import asyncio
 import uuid
 
 from ..sse_manager import sse_manager, EventType, SSEEvent
-from ..lineage import lineage_manager
-from ..main import log_event # Assuming log_event is accessible
+from ..lineage import DUCKLAKE_TABLE_URI_PREFIX, lineage_manager
+from ..main import log_event, current_request_id
 
 router = APIRouter(
     prefix="/events",
@@ -15,6 +16,9 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Upper bound on runs started by one batch request
+MAX_BATCH_JOB_RUNS = 1000
+
 # Job and Run models (re-defined here for clarity, or import from a shared models file)
 class Job(BaseModel):
     name: str
@@ -256,14 +260,14 @@ async def create_job(job: Job) -> Dict[str, str]:
     - Success message with job name
     - Request ID for tracking
     """
-    request_id = str(uuid.uuid4())
-    log_event("INFO", "Creating job", request_id=request_id, job_name=job.name)
+    request_id = current_request_id()
+    log_event("INFO", "Creating job", job_name=job.name)
     try:
         # Job creation doesn't generate lineage events, just log it
-        log_event("INFO", "Job created successfully", request_id=request_id, job_name=job.name)
+        log_event("INFO", "Job created successfully", job_name=job.name)
         return {"message": f"Job '{job.name}' created successfully.", "request_id": request_id}
     except Exception as e:
-        log_event("ERROR", "Failed to create job", request_id=request_id, job_name=job.name, error=str(e))
+        log_event("ERROR", "Failed to create job", job_name=job.name, error=str(e))
         raise HTTPException(status_code=400, detail=f"Error creating job: {e}")
 
 
@@ -271,10 +275,10 @@ async def create_job(job: Job) -> Dict[str, str]:
 async def start_job_run(job_name: str, job_run: JobRun) -> Dict[str, str]:
     """Start a new job run with OpenLineage tracking"""
     run_id = uuid.uuid4()
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     
     log_event("INFO", "Starting job run", 
-              request_id=request_id, job_name=job_name, run_id=str(run_id))
+              job_name=job_name, run_id=str(run_id))
     
     try:
         # Broadcast job start via SSE
@@ -304,7 +308,7 @@ async def start_job_run(job_name: str, job_run: JobRun) -> Dict[str, str]:
         )
         
         log_event("INFO", "Job run started successfully", 
-                  request_id=request_id, job_name=job_name, run_id=str(run_id))
+                  job_name=job_name, run_id=str(run_id))
         
         return {
             "message": f"Job run started for '{job_name}'",
@@ -321,17 +325,67 @@ async def start_job_run(job_name: str, job_run: JobRun) -> Dict[str, str]:
         )
         
         log_event("ERROR", "Failed to start job run", 
-                  request_id=request_id, job_name=job_name, error=str(e))
+                  job_name=job_name, error=str(e))
         raise HTTPException(status_code=400, detail=f"Error starting job run: {e}")
 
 
+@router.post("/jobs/{job_name}/runs/batch")
+async def start_job_runs_batch(
+    job_name: str,
+    job_runs: Annotated[List[JobRun], Body(min_length=1, max_length=MAX_BATCH_JOB_RUNS)]
+) -> Dict[str, Union[List[str], str]]:
+    """Start many job runs at once (CI/backfill) with a single lineage enqueue"""
+    run_ids = [uuid.uuid4() for _ in job_runs]
+    request_id = current_request_id()
+    
+    log_event("INFO", "Starting job runs", 
+              job_name=job_name, count=len(run_ids))
+    
+    try:
+        start_events = [
+            await lineage_manager.create_job_start_event(
+                job_name=job_name,
+                run_id=run_id,
+                metadata=job_run.metadata
+            )
+            for run_id, job_run in zip(run_ids, job_runs)
+        ]
+        
+        # One enqueue for the whole batch
+        if not await lineage_manager.enqueue_events_batch(start_events):
+            raise RuntimeError("failed to enqueue lineage events")
+        
+        await asyncio.gather(*(
+            sse_manager.broadcast_job_status(
+                job_name=job_name,
+                run_id=str(run_id),
+                status="running",
+                progress=10
+            )
+            for run_id in run_ids
+        ))
+        
+        log_event("INFO", "Job runs started successfully", 
+                  job_name=job_name, count=len(run_ids))
+        
+        return {
+            "message": f"{len(run_ids)} job runs started for '{job_name}'",
+            "run_ids": [str(run_id) for run_id in run_ids],
+            "request_id": request_id
+        }
+    except Exception as e:
+        log_event("ERROR", "Failed to start job runs", 
+                  job_name=job_name, error=str(e))
+        raise HTTPException(status_code=400, detail=f"Error starting job runs: {e}")
+
+
 @router.put("/jobs/{job_name}/runs/{run_id}/complete")
 async def complete_job_run(job_name: str, run_id: UUID, completion: JobRunComplete) -> Dict[str, str]:
     """Complete a job run with OpenLineage tracking"""
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     
     log_event("INFO", "Completing job run", 
-              request_id=request_id, job_name=job_name, run_id=str(run_id))
+              job_name=job_name, run_id=str(run_id))
     
     try:
         # Broadcast job completion progress via SSE
@@ -349,21 +403,12 @@ async def complete_job_run(job_name: str, run_id: UUID, completion: JobRunComple
         # TODO: This could be enhanced to track actual datasets used during the run
         # For now, we'll track any tables or datasets mentioned in metadata
         if completion.metadata:
-            if "inputs" in completion.metadata:
-                for input_name in completion.metadata["inputs"]:
-                    inputs.append(await lineage_manager.create_dataset_facet(
-                        namespace="ducklake",
-                        name=input_name,
-                        uri=f"ducklake://tables/{input_name}"
-                    ))
-            
-            if "outputs" in completion.metadata:
-                for output_name in completion.metadata["outputs"]:
-                    outputs.append(await lineage_manager.create_dataset_facet(
-                        namespace="ducklake", 
-                        name=output_name,
-                        uri=f"ducklake://tables/{output_name}"
-                    ))
+            inputs = lineage_manager.create_dataset_facets_bulk(
+                "ducklake", completion.metadata.get("inputs", []), DUCKLAKE_TABLE_URI_PREFIX
+            )
+            outputs = lineage_manager.create_dataset_facets_bulk(
+                "ducklake", completion.metadata.get("outputs", []), DUCKLAKE_TABLE_URI_PREFIX
+            )
         
         # Create OpenLineage COMPLETE event
         event_type = "COMPLETE" if completion.success else "FAIL"
@@ -389,7 +434,7 @@ async def complete_job_run(job_name: str, run_id: UUID, completion: JobRunComple
         )
         
         log_event("INFO", "Job run completed successfully", 
-                  request_id=request_id, job_name=job_name, run_id=str(run_id), 
+                  job_name=job_name, run_id=str(run_id), 
                   success=completion.success)
         
         return {
@@ -407,46 +452,46 @@ async def complete_job_run(job_name: str, run_id: UUID, completion: JobRunComple
         )
         
         log_event("ERROR", "Failed to complete job run", 
-                  request_id=request_id, job_name=job_name, run_id=str(run_id), error=str(e))
+                  job_name=job_name, run_id=str(run_id), error=str(e))
         raise HTTPException(status_code=400, detail=f"Error completing job run: {e}")
 
 
 @router.get("/jobs")
 async def list_jobs() -> Dict[str, Union[List[Any], str]]:
     """List all jobs"""
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     try:
         # This would typically come from database, for now return empty
-        log_event("INFO", "Listing jobs", request_id=request_id)
+        log_event("INFO", "Listing jobs")
         return {"jobs": [], "request_id": request_id}
     except Exception as e:
-        log_event("ERROR", "Failed to list jobs", request_id=request_id, error=str(e))
+        log_event("ERROR", "Failed to list jobs", error=str(e))
         raise HTTPException(status_code=500, detail=f"Error listing jobs: {e}")
 
 
 @router.get("/jobs/{job_name}")
 async def get_job(job_name: str) -> Dict[str, Union[str, List[Dict[str, Any]]]]:
     """Get job metadata and status"""
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     try:
         # Get job runs from lineage manager
         runs = await lineage_manager.get_job_runs(job_name)
         
-        log_event("INFO", "Retrieved job info", request_id=request_id, job_name=job_name)
+        log_event("INFO", "Retrieved job info", job_name=job_name)
         return {
             "name": job_name,
             "runs": runs,
             "request_id": request_id
         }
     except Exception as e:
-        log_event("ERROR", "Failed to get job", request_id=request_id, job_name=job_name, error=str(e))
+        log_event("ERROR", "Failed to get job", job_name=job_name, error=str(e))
         raise HTTPException(status_code=500, detail=f"Error getting job: {e}")
 
 
 @router.get("/jobs/{job_name}/runs/{run_id}")
 async def get_job_run(job_name: str, run_id: UUID) -> Dict[str, Any]:
     """Get details of a specific job run"""
-    request_id = str(uuid.uuid4())
+    request_id = current_request_id()
     try:
         # Get run lineage from lineage manager
         lineage = await lineage_manager.get_run_lineage(run_id)
@@ -455,11 +500,11 @@ async def get_job_run(job_name: str, run_id: UUID) -> Dict[str, Any]:
             raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
         
         log_event("INFO", "Retrieved job run info", 
-                  request_id=request_id, job_name=job_name, run_id=str(run_id))
+                  job_name=job_name, run_id=str(run_id))
         return {**lineage, "request_id": request_id}
     except HTTPException:
         raise
     except Exception as e:
         log_event("ERROR", "Failed to get job run", 
-                  request_id=request_id, job_name=job_name, run_id=str(run_id), error=str(e))
+                  job_name=job_name, run_id=str(run_id), error=str(e))
         raise HTTPException(status_code=500, detail=f"Error getting job run: {e}")
\ No newline at end of file
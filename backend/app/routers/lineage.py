@@ -2,18 +2,140 @@
 OpenLineage API endpoints for DuckLake
 """
 
+import asyncio
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from ..config import get_settings
 from ..lineage import LineageEvent, lineage_manager
 from ..queue_worker import queue_worker
+from ..responses import ORJSONResponse
 
 router = APIRouter(prefix="/api/v1/lineage", tags=["lineage"])
 
+settings = get_settings()
+
+# Rows fetched per cursor round trip, and bytes buffered per response chunk
+STREAM_PREFETCH_ROWS = 500
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class ListingCache:
+    """Rendered listing bodies, each kept for a short TTL
+    
+    The job and dataset inventories are expensive aggregations that change
+    slowly, so for a few seconds every request can share one result.
+    Concurrent misses wait on the single refresh instead of all running it.
+    """
+    
+    def __init__(self, ttl: float, enabled: bool = True) -> None:
+        self.ttl = ttl
+        self.enabled = enabled and ttl > 0
+        self._data: Dict[str, Tuple[float, bytes]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Bumped on invalidation so a refresh that straddles it isn't stored
+        self._version = 0
+    
+    async def get_or_render(self, key: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Return the cached body for key, rendering it on a miss"""
+        entry = self._data.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Someone else may have refreshed it while we waited
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            
+            version = self._version
+            body = await render()
+            if version == self._version:
+                self._data[key] = (time.monotonic() + self.ttl, body)
+            return body
+    
+    def invalidate(self) -> None:
+        """Drop every cached listing (called when lineage is ingested)"""
+        self._version += 1
+        self._data.clear()
+
+
+listing_cache = ListingCache(
+    ttl=settings.database.lineage_listing_cache_ttl,
+    enabled=settings.features.enable_request_caching
+)
+
+
+async def iter_query_json(query: str, *args: Any) -> AsyncIterator[bytes]:
+    """Yield a query's rows as chunks of one JSON array, via a server-side cursor
+    
+    Postgres renders each row as JSON text, so rows go out without ever
+    becoming Python dicts.
+    """
+    async with lineage_manager.read_pool.acquire() as conn:
+        # Cursors only live inside a transaction
+        async with conn.transaction(readonly=True):
+            buffer = bytearray(b"[")
+            separator = b""
+            async for (row_json,) in conn.cursor(
+                f"SELECT row_to_json(q)::text FROM ({query}) q",
+                *args,
+                prefetch=STREAM_PREFETCH_ROWS
+            ):
+                buffer += separator
+                buffer += row_json.encode()
+                separator = b","
+                if len(buffer) >= STREAM_CHUNK_BYTES:
+                    yield bytes(buffer)
+                    buffer.clear()
+            buffer += b"]"
+            yield bytes(buffer)
+
+
+async def listing_response(cache_key: str, query: str) -> Response:
+    """Serve a listing query from listing_cache, or stream it when caching is off
+    
+    Streaming keeps memory flat however many rows the query returns; a
+    cached body is held whole anyway, so a refresh just collects the chunks.
+    The first chunk is fetched before the response starts, so connection and
+    query errors still surface as a 500 instead of a truncated 200 body.
+    """
+    if not listing_cache.enabled:
+        chunks = iter_query_json(query)
+        try:
+            first = await anext(chunks)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to list {cache_key}: {str(e)}"
+            )
+        
+        async def stream() -> AsyncIterator[bytes]:
+            yield first
+            async for chunk in chunks:
+                yield chunk
+        
+        return StreamingResponse(stream(), media_type="application/json")
+    
+    async def render() -> bytes:
+        return b"".join([chunk async for chunk in iter_query_json(query)])
+    
+    try:
+        body = await listing_cache.get_or_render(cache_key, render)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to list {cache_key}: {str(e)}"
+        )
+    return Response(content=body, media_type="application/json")
+
 
 class LineageEventRequest(BaseModel):
     """Request model for lineage events"""
@@ -74,6 +196,10 @@ async def ingest_lineage_event(
                 detail="Failed to enqueue lineage event"
             )
         
+        # The event is applied asynchronously; the TTL bounds how long a
+        # listing can miss it, this just avoids serving one rendered earlier
+        listing_cache.invalidate()
+        
         return {
             "status": "accepted",
             "run_id": event.run["runId"],
@@ -137,25 +263,17 @@ async def list_jobs() -> List[Dict[str, Any]]:
     
     Returns a list of all registered jobs in the lineage system.
     """
-    try:
-        async with lineage_manager.db_pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT namespace, name, created_at, updated_at, metadata,
-                       COUNT(r.id) as total_runs
-                FROM openlineage.jobs j
-                LEFT JOIN openlineage.runs r ON j.id = r.job_id
-                GROUP BY j.id, j.namespace, j.name, j.created_at, j.updated_at, j.metadata
-                ORDER BY j.updated_at DESC
-                """
-            )
-            
-            return [dict(row) for row in rows]
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to list jobs: {str(e)}"
-        )
+    return await listing_response(
+        "jobs",
+        """
+        SELECT namespace, name, created_at, updated_at, metadata,
+               COUNT(r.id) as total_runs
+        FROM openlineage.jobs j
+        LEFT JOIN openlineage.runs r ON j.id = r.job_id
+        GROUP BY j.id, j.namespace, j.name, j.created_at, j.updated_at, j.metadata
+        ORDER BY j.updated_at DESC
+        """
+    )
 
 
 @router.get("/datasets", response_model=List[Dict[str, Any]])
@@ -165,29 +283,21 @@ async def list_datasets() -> List[Dict[str, Any]]:
     
     Returns a list of all datasets that have been involved in lineage events.
     """
-    try:
-        async with lineage_manager.db_pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT d.namespace, d.name, d.physical_name, d.source_uri, 
-                       d.created_at, d.updated_at,
-                       COUNT(DISTINCT lg.run_id) as involved_runs,
-                       MAX(CASE WHEN lg.direction = 'INPUT' THEN lg.created_at END) as last_input,
-                       MAX(CASE WHEN lg.direction = 'OUTPUT' THEN lg.created_at END) as last_output
-                FROM openlineage.datasets d
-                LEFT JOIN openlineage.lineage_graph lg ON d.id = lg.dataset_id
-                GROUP BY d.id, d.namespace, d.name, d.physical_name, d.source_uri, 
-                         d.created_at, d.updated_at
-                ORDER BY d.updated_at DESC
-                """
-            )
-            
-            return [dict(row) for row in rows]
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to list datasets: {str(e)}"
-        )
+    return await listing_response(
+        "datasets",
+        """
+        SELECT d.namespace, d.name, d.physical_name, d.source_uri, 
+               d.created_at, d.updated_at,
+               COUNT(DISTINCT lg.run_id) as involved_runs,
+               MAX(CASE WHEN lg.direction = 'INPUT' THEN lg.created_at END) as last_input,
+               MAX(CASE WHEN lg.direction = 'OUTPUT' THEN lg.created_at END) as last_output
+        FROM openlineage.datasets d
+        LEFT JOIN openlineage.lineage_graph lg ON d.id = lg.dataset_id
+        GROUP BY d.id, d.namespace, d.name, d.physical_name, d.source_uri, 
+                 d.created_at, d.updated_at
+        ORDER BY d.updated_at DESC
+        """
+    )
 
 
 @router.get("/datasets/{namespace}/{name}/lineage")
@@ -198,60 +308,51 @@ async def get_dataset_lineage(namespace: str, name: str) -> Dict[str, Any]:
     Returns all jobs/runs that have used this dataset as input or output.
     """
     try:
-        async with lineage_manager.db_pool.acquire() as conn:
-            # Get dataset info
-            dataset_row = await conn.fetchrow(
+        async with lineage_manager.read_pool.acquire() as conn:
+            # Postgres splits the relationships by direction and renders the
+            # whole document, so no row is touched in Python
+            body = await conn.fetchval(
                 """
-                SELECT id, namespace, name, physical_name, source_uri
-                FROM openlineage.datasets
-                WHERE namespace = $1 AND name = $2
+                SELECT json_build_object(
+                    'dataset', json_build_object(
+                        'id', d.id, 'namespace', d.namespace, 'name', d.name,
+                        'physical_name', d.physical_name, 'source_uri', d.source_uri
+                    ),
+                    'consumed_by', COALESCE(rel.consumed_by, '[]'::json),
+                    'produced_by', COALESCE(rel.produced_by, '[]'::json)
+                )::text
+                FROM openlineage.datasets d
+                LEFT JOIN LATERAL (
+                    SELECT json_agg(x.obj ORDER BY x.created_at DESC)
+                               FILTER (WHERE x.direction = 'INPUT') AS consumed_by,
+                           json_agg(x.obj ORDER BY x.created_at DESC)
+                               FILTER (WHERE x.direction IS DISTINCT FROM 'INPUT') AS produced_by
+                    FROM (
+                        SELECT lg.direction, lg.created_at,
+                               json_build_object(
+                                   'run_id', r.run_id, 'job_name', j.name, 'state', r.state,
+                                   'started_at', r.started_at, 'ended_at', r.ended_at,
+                                   'lineage_created_at', lg.created_at
+                               ) AS obj
+                        FROM openlineage.lineage_graph lg
+                        JOIN openlineage.runs r ON lg.run_id = r.run_id
+                        JOIN openlineage.jobs j ON r.job_id = j.id
+                        WHERE lg.dataset_id = d.id
+                    ) x
+                ) rel ON true
+                WHERE d.namespace = $1 AND d.name = $2
                 """,
                 namespace, name
             )
-            
-            if not dataset_row:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Dataset {namespace}/{name} not found"
-                )
-            
-            # Get lineage relationships
-            lineage_rows = await conn.fetch(
-                """
-                SELECT lg.direction, lg.created_at, r.run_id, r.state, 
-                       r.started_at, r.ended_at, j.name as job_name
-                FROM openlineage.lineage_graph lg
-                JOIN openlineage.runs r ON lg.run_id = r.run_id
-                JOIN openlineage.jobs j ON r.job_id = j.id
-                WHERE lg.dataset_id = $1
-                ORDER BY lg.created_at DESC
-                """,
-                dataset_row["id"]
+        
+        if body is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Dataset {namespace}/{name} not found"
             )
-            
-            inputs = []
-            outputs = []
-            
-            for row in lineage_rows:
-                relationship = {
-                    "run_id": str(row["run_id"]),
-                    "job_name": row["job_name"],
-                    "state": row["state"],
-                    "started_at": row["started_at"],
-                    "ended_at": row["ended_at"],
-                    "lineage_created_at": row["created_at"]
-                }
-                
-                if row["direction"] == "INPUT":
-                    inputs.append(relationship)
-                else:
-                    outputs.append(relationship)
-            
-            return {
-                "dataset": dict(dataset_row),
-                "consumed_by": inputs,  # Jobs that read this dataset
-                "produced_by": outputs  # Jobs that write this dataset
-            }
+        
+        # consumed_by: jobs that read this dataset; produced_by: jobs that write it
+        return Response(content=body, media_type="application/json")
             
     except HTTPException:
         raise
@@ -270,26 +371,31 @@ async def get_lineage_stats() -> Dict[str, Any]:
     Returns overall statistics about the lineage system including queue status.
     """
     try:
-        # Get database stats
-        async with lineage_manager.db_pool.acquire() as conn:
-            stats_row = await conn.fetchrow(
-                """
-                SELECT 
-                    (SELECT COUNT(*) FROM openlineage.jobs) as total_jobs,
-                    (SELECT COUNT(*) FROM openlineage.runs) as total_runs,
-                    (SELECT COUNT(*) FROM openlineage.datasets) as total_datasets,
-                    (SELECT COUNT(*) FROM openlineage.run_events) as total_events,
-                    (SELECT COUNT(*) FROM openlineage.runs WHERE state = 'RUNNING') as active_runs
-                """
-            )
-        
-        # Get queue stats
-        queue_stats = await queue_worker.get_queue_stats()
+        # Each table is counted on its own pooled connection, so the scans
+        # run side by side (alongside the queue metrics) instead of in turn
+        pool = lineage_manager.read_pool
+        jobs, runs, datasets, events, queue_stats = await asyncio.gather(
+            pool.fetchval("SELECT COUNT(*) FROM openlineage.jobs"),
+            pool.fetchrow(
+                "SELECT COUNT(*) AS total, COUNT(*) FILTER (WHERE state = 'RUNNING') AS active"
+                " FROM openlineage.runs"
+            ),
+            pool.fetchval("SELECT COUNT(*) FROM openlineage.datasets"),
+            pool.fetchval("SELECT COUNT(*) FROM openlineage.run_events"),
+            queue_worker.get_queue_stats()
+        )
+        database_stats = {
+            "total_jobs": jobs,
+            "total_runs": runs["total"],
+            "total_datasets": datasets,
+            "total_events": events,
+            "active_runs": runs["active"]
+        }
         
-        return {
-            "database": dict(stats_row),
+        return ORJSONResponse({
+            "database": database_stats,
             "queues": queue_stats
-        }
+        })
         
     except Exception as e:
         raise HTTPException(
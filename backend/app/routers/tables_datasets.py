@@ -1,14 +1,14 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Response, Request
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional, Union
+from pydantic import BaseModel, SkipValidation
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
 import duckdb
 import pyarrow as pa
 import pyarrow.parquet as pq
-import boto3
 from botocore.exceptions import ClientError
 import io
 import os
 import orjson
+import re
 import uuid
 from datetime import datetime
 from uuid import UUID
@@ -16,7 +16,10 @@ import pyarrow.ipc as ipc
 from fastapi.responses import StreamingResponse
 from enum import Enum
 
-from ..main import con, s3_client, log_event # Assuming con and s3_client are accessible
+from ..main import log_event, current_request_id
+from ..ducklake_conn import duckdb_endpoint, get_cursor, new_cursor, run_duckdb
+from ..query_cache import is_read_only, query_cache, schema_cache
+from ..storage import S3_DOWNLOAD_CHUNK_SIZE, storage_manager, stream_s3_object
 from ..instrumentation import performance_monitor, memory_monitor
 from ..config import get_settings
 
@@ -28,17 +31,24 @@ router = APIRouter(
 
 settings = get_settings()
 
+# Rows per record batch when streaming query results straight from DuckDB
+STREAM_BATCH_ROWS = 65536
+
 # Models for DuckDB operations
 class Table(BaseModel):
     name: str
     schema: Dict[str, str] # e.g., {"col1": "INTEGER", "col2": "VARCHAR"}
 
 class TableData(BaseModel):
-    rows: List[Dict[str, Any]]
+    # Documented as a list of objects but not validated row by row: that would
+    # copy every row dict, and malformed rows fail the Arrow build anyway
+    rows: SkipValidation[List[Dict[str, Any]]]
 
 class Query(BaseModel):
     query: str
+    parameters: Optional[List[Any]] = None  # Bound to ? placeholders in query
     stream: bool = False  # Keep streaming as an option
+    columnar: bool = False  # JSON as {column: [values]} instead of one object per row
 
 # Job and Run models (simplified for this router, full models in jobs_events.py)
 class Job(BaseModel):
@@ -57,6 +67,62 @@ class JobRunComplete(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+# Table/column names can't be bound as parameters, so they are allowlisted instead
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,62}$")
+_COLUMN_TYPE_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_ ]*(\(\s*\d+\s*(,\s*\d+\s*)?\))?(\[\])?$")
+
+def validate_identifier(name: str) -> str:
+    """Reject table/column names that aren't plain SQL identifiers."""
+    if not _IDENTIFIER_RE.fullmatch(name):
+        raise HTTPException(status_code=400, detail=f"Invalid identifier: {name!r}")
+    return name
+
+def validate_column_type(column_type: str) -> str:
+    """Reject column types that aren't a plain (optionally sized) type name."""
+    if not _COLUMN_TYPE_RE.match(column_type.strip()):
+        raise HTTPException(status_code=400, detail=f"Invalid column type: {column_type!r}")
+    return column_type.strip()
+
+# Column types that map directly onto Arrow, so tables can be created
+# through the Relational API without DuckDB parsing any DDL
+_ARROW_TYPES = {
+    "BOOLEAN": pa.bool_(),
+    "TINYINT": pa.int8(),
+    "SMALLINT": pa.int16(),
+    "INTEGER": pa.int32(),
+    "INT": pa.int32(),
+    "BIGINT": pa.int64(),
+    "FLOAT": pa.float32(),
+    "REAL": pa.float32(),
+    "DOUBLE": pa.float64(),
+    "VARCHAR": pa.string(),
+    "TEXT": pa.string(),
+    "DATE": pa.date32(),
+    "TIMESTAMP": pa.timestamp("us"),
+    "TIMESTAMPTZ": pa.timestamp("us", tz="UTC"),
+    "BLOB": pa.binary(),
+}
+_DECIMAL_RE = re.compile(r"^DECIMAL\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)$", re.IGNORECASE)
+
+def arrow_type_for(column_type: str) -> Optional[pa.DataType]:
+    """Arrow type for a DuckDB column type, or None if there's no direct mapping."""
+    column_type = column_type.strip()
+    decimal = _DECIMAL_RE.match(column_type)
+    if decimal:
+        precision, scale = int(decimal.group(1)), int(decimal.group(2))
+        if 0 < precision <= 38 and scale <= precision:
+            return pa.decimal128(precision, scale)
+        return None  # out of range: leave it to DuckDB to accept or reject
+    return _ARROW_TYPES.get(column_type.upper())
+
+def _is_json_native(arrow_type: Optional[pa.DataType]) -> bool:
+    """True for Arrow types JSON values convert to without parsing (no dates/decimals)."""
+    return arrow_type is not None and (
+        pa.types.is_boolean(arrow_type) or pa.types.is_integer(arrow_type)
+        or pa.types.is_floating(arrow_type) or pa.types.is_string(arrow_type)
+    )
+
+
 # Helper functions for streaming (copied from main.py)
 def serialize_arrow_table(table: pa.Table) -> bytes:
     """Serialize Arrow table to IPC format (zero-copy)."""
@@ -66,15 +132,21 @@ def serialize_arrow_table(table: pa.Table) -> bytes:
     return sink.getvalue().to_pybytes()
 
 def stream_arrow_table(table: pa.Table):
-    """Stream Arrow table in batches."""
+    """Stream Arrow table in batches as one IPC stream."""
+    return stream_arrow_batches(table.schema, table.to_batches(max_chunksize=10000))
+
+def stream_arrow_batches(schema: pa.Schema, batches: Iterable[pa.RecordBatch]):
+    """Stream record batches as one IPC stream."""
     def generate():
-        sink = pa.BufferOutputStream()
-        with ipc.new_stream(sink, table.schema) as writer:
-            for batch in table.to_batches(max_chunksize=10000):
-                sink = pa.BufferOutputStream()
-                with ipc.new_stream(sink, table.schema) as batch_writer:
-                    batch_writer.write_batch(batch)
-                yield sink.getvalue().to_pybytes()
+        # One writer for the whole response; drain its buffer after each batch
+        buf = io.BytesIO()
+        with ipc.new_stream(buf, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()  # end-of-stream marker
     
     return StreamingResponse(
         generate(), 
@@ -85,7 +157,8 @@ def stream_parquet(table: pa.Table):
     """Stream table as Parquet (compressed)."""
     def generate():
         sink = pa.BufferOutputStream()
-        pq.write_table(table, sink, compression='snappy')
+        # zstd: noticeably smaller than snappy at similar encode cost
+        pq.write_table(table, sink, compression='zstd')
         yield sink.getvalue().to_pybytes()
     
     return StreamingResponse(
@@ -96,10 +169,14 @@ def stream_parquet(table: pa.Table):
 
 def stream_json_batches(table: pa.Table):
     """Stream JSON in batches to minimize memory."""
+    return stream_json_record_batches(table.to_batches(max_chunksize=1000))
+
+def stream_json_record_batches(batches: Iterable[pa.RecordBatch]):
+    """Stream record batches as one JSON document."""
     def generate():
         yield b'{"result": ['
         first = True
-        for batch in table.to_batches(max_chunksize=1000):
+        for batch in batches:
             batch_data = batch.to_pylist()
             for row in batch_data:
                 if not first:
@@ -139,9 +216,95 @@ def stream_csv(table: pa.Table):
         headers={"Content-Disposition": "attachment; filename=query_result.csv"}
     )
 
+def execute_query(query: Query, read_only: bool) -> pa.Table:
+    """Run a query and return its result as an Arrow table."""
+    # Only single-statement reads (see is_read_only) may use the thread's
+    # shared cursor; anything else, including a read with more statements
+    # after it (BEGIN, SET, USE...), gets a throwaway cursor so it can't
+    # leave session state behind for later requests
+    cursor_scope = get_cursor() if read_only else new_cursor()
+    # Get Arrow table directly from DuckDB (zero-copy)
+    with cursor_scope as cursor:
+        return cursor.execute(query.query, query.parameters).fetch_arrow_table()
+
+def open_query_stream(query: Query) -> Tuple[pa.Schema, Iterator[pa.RecordBatch]]:
+    """Run a read-only query and return its result as lazily fetched batches."""
+    # The stream outlives this call (and this thread's cursor), so it gets its
+    # own cursor, closed once the last batch has been read
+    cursor = new_cursor()
+    try:
+        reader = cursor.execute(query.query, query.parameters).fetch_record_batch(STREAM_BATCH_ROWS)
+    except Exception:
+        cursor.close()
+        raise
+    
+    def batches():
+        with cursor:
+            yield from reader
+    
+    return reader.schema, batches()
+
+def load_table_schema(table_name: str) -> Dict[str, str]:
+    """Column name -> DuckDB type for a DuckLake table, in column order."""
+    schema_query = (
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_name = ? AND table_schema = 'ducklake' ORDER BY ordinal_position"
+    )
+    with get_cursor() as cursor:
+        # A handful of rows: plain tuples are cheaper than an Arrow round trip
+        return dict(cursor.execute(schema_query, [table_name]).fetchall())
+
+def rows_to_arrow(table_name: str, rows: List[Dict[str, Any]]) -> pa.Table:
+    """Build an Arrow table from JSON rows, one column at a time.
+    
+    Columns follow the table's (cached) schema, so they line up with the
+    positional INSERT and JSON-native types skip per-value inference. Other
+    types (dates, decimals...) are inferred per column and cast by DuckDB.
+    Keys match columns case-insensitively, as DuckDB resolves identifiers;
+    keys that match no column are rejected rather than dropped.
+    """
+    schema = schema_cache.get_or_load(table_name, lambda: load_table_schema(table_name))
+    if not schema:
+        return pa.Table.from_pylist(rows)
+    
+    keys = set().union(*rows)
+    if not keys <= schema.keys():
+        columns = {column_name.lower(): column_name for column_name in schema}
+        unknown = sorted(key for key in keys if key.lower() not in columns)
+        if unknown:
+            raise ValueError(f"Unknown column(s) for table '{table_name}': {', '.join(unknown)}")
+        # Differently-cased keys: rename them to the schema's spelling
+        renamed = [{columns[key.lower()]: value for key, value in row.items()} for row in rows]
+        if any(len(new_row) != len(row) for new_row, row in zip(renamed, rows)):
+            raise ValueError("Row names the same column twice, in different case")
+        rows = renamed
+    
+    arrays = []
+    for column_name, column_type in schema.items():
+        values = [row.get(column_name) for row in rows]
+        arrow_type = arrow_type_for(column_type)
+        if _is_json_native(arrow_type):
+            try:
+                arrays.append(pa.array(values, type=arrow_type))
+                continue
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass  # e.g. numbers sent as strings; let DuckDB cast them
+        arrays.append(pa.array(values))
+    return pa.Table.from_arrays(arrays, names=list(schema))
+
+def insert_arrow_table(table_name: str, arrow_table: pa.Table) -> None:
+    """Insert an Arrow table into a DuckLake table."""
+    # Zero-copy insert: DuckDB scans the Arrow buffers directly, no pandas hop
+    # and no temporary view to register, bind and drop per call
+    with performance_monitor.db_monitor.track_query("INSERT", f"INSERT INTO ducklake.{table_name}"):
+        with get_cursor() as cursor:
+            cursor.from_arrow(arrow_table).insert_into(f"ducklake.{table_name}")
+    query_cache.invalidate()
+
 
 # DuckLake table operations
 @router.post("/tables", summary="🆕 Create DuckLake Table")
+@duckdb_endpoint
 def create_table(table: Table) -> Dict[str, str]:
     """
     Create a new DuckLake table with specified schema.
@@ -153,21 +316,35 @@ def create_table(table: Table) -> Dict[str, str]:
     - Success message with table name
     - Request ID for tracking
     """
-    request_id = str(uuid.uuid4())
-    log_event("INFO", "Creating DuckLake table", request_id=request_id, table_name=table.name, schema=table.schema)
+    request_id = current_request_id()
+    log_event("INFO", "Creating DuckLake table", table_name=table.name, schema=table.schema)
+    validate_identifier(table.name)
+    columns_sql = ", ".join(
+        f"{validate_identifier(col_name)} {validate_column_type(col_type)}"
+        for col_name, col_type in table.schema.items()
+    )
     try:
-        columns_sql = ", ".join([f"{col_name} {col_type}" for col_name, col_type in table.schema.items()])
-        create_table_sql = f"CREATE TABLE ducklake.{table.name} ({columns_sql})"
-        con.execute(create_table_sql)
-        log_event("INFO", "DuckLake table created successfully", request_id=request_id, table_name=table.name)
+        arrow_types = [arrow_type_for(col_type) for col_type in table.schema.values()]
+        with get_cursor() as cursor:
+            if table.schema and all(arrow_type is not None for arrow_type in arrow_types):
+                # Relational API: create from an empty Arrow table, no DDL text to parse
+                arrow_schema = pa.schema(list(zip(table.schema.keys(), arrow_types)))
+                cursor.from_arrow(arrow_schema.empty_table()).create(f"ducklake.{table.name}")
+            else:
+                cursor.execute(f"CREATE TABLE ducklake.{table.name} ({columns_sql})")
+        query_cache.invalidate()
+        schema_cache.discard(table.name)
+        log_event("INFO", "DuckLake table created successfully", table_name=table.name)
         return {"message": f"DuckLake table '{table.name}' created successfully.", "request_id": request_id}
     except Exception as e:
-        log_event("ERROR", "Failed to create DuckLake table", request_id=request_id, table_name=table.name, error=str(e))
+        log_event("ERROR", "Failed to create DuckLake table", table_name=table.name, error=str(e))
         raise HTTPException(status_code=400, detail=f"Error creating table: {e}")
 
 @router.put("/tables/{table_name}")
+@duckdb_endpoint
 def append_to_table(table_name: str, data: Union[TableData, UploadFile]):
     """Append data with multiple input formats (JSON, Arrow, Parquet)."""
+    validate_identifier(table_name)
     try:
         if isinstance(data, UploadFile):
             # Handle Arrow/Parquet uploads directly
@@ -180,41 +357,89 @@ def append_to_table(table_name: str, data: Union[TableData, UploadFile]):
             else:
                 raise HTTPException(400, "Unsupported file format")
         else:
-            # Convert JSON to Arrow (existing logic)
-            arrow_table = pa.Table.from_pylist(data.rows)
-        
-        # Zero-copy insert into DuckLake table
-        with performance_monitor.db_monitor.track_query("INSERT", f"INSERT INTO ducklake.{table_name}"):
-            con.register("temp_data", arrow_table)
-            con.execute(f"INSERT INTO ducklake.{table_name} SELECT * FROM temp_data")
-            con.unregister("temp_data")
+            # Nothing to insert; skip the Arrow build and DuckDB round trip
+            if not data.rows:
+                return {"message": "No rows to append", "rows": 0}
+            arrow_table = rows_to_arrow(table_name, data.rows)
         
+        insert_arrow_table(table_name, arrow_table)
         return {"message": f"Data appended successfully", "rows": len(arrow_table)}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error appending data: {e}")
 
+@router.put("/tables/{table_name}/arrow", summary="⚡ Append Arrow IPC Stream")
+async def append_arrow_stream(table_name: str, request: Request):
+    """
+    Append an Arrow IPC stream sent as the raw request body.
+    
+    Skips JSON parsing and multipart decoding entirely; the decoded
+    record batches are handed straight to DuckDB.
+    """
+    validate_identifier(table_name)
+    try:
+        body = await request.body()
+        arrow_table = ipc.open_stream(pa.BufferReader(body)).read_all()
+        # DuckDB calls block, so keep them off the event loop
+        await run_duckdb(insert_arrow_table, table_name, arrow_table)
+        return {"message": f"Data appended successfully", "rows": len(arrow_table)}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error appending data: {e}")
+
+@router.put("/tables/{table_name}/raw", summary="⚡ Append JSON Rows (unvalidated)")
+async def append_raw_rows(table_name: str, request: Request):
+    """
+    Append JSON rows without per-row Pydantic validation.
+    
+    Takes the same {"rows": [...]} body as PUT /tables/{table_name} (or a
+    bare array); orjson parses it once and the rows go straight into Arrow.
+    """
+    validate_identifier(table_name)
+    body = await request.body()
+    
+    def parse_and_insert() -> int:
+        payload = orjson.loads(body)
+        rows = payload.get("rows", []) if isinstance(payload, dict) else payload
+        if not rows:
+            return 0
+        arrow_table = rows_to_arrow(table_name, rows)
+        insert_arrow_table(table_name, arrow_table)
+        return len(arrow_table)
+    
+    try:
+        row_count = await run_duckdb(parse_and_insert)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error appending data: {e}")
+    if not row_count:
+        return {"message": "No rows to append", "rows": 0}
+    return {"message": f"Data appended successfully", "rows": row_count}
+
 @router.delete("/tables/{table_name}")
+@duckdb_endpoint
 def delete_table(table_name: str) -> Dict[str, str]:
     """Delete a DuckLake table."""
+    validate_identifier(table_name)
     try:
-        con.execute(f"DROP TABLE ducklake.{table_name}")
+        with get_cursor() as cursor:
+            cursor.execute(f"DROP TABLE ducklake.{table_name}")
+        query_cache.invalidate()
+        schema_cache.discard(table_name)
         return {"message": f"DuckLake table '{table_name}' deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error deleting table: {e}")
 
 @router.get("/tables/{table_name}")
+@duckdb_endpoint
 def get_table(table_name: str) -> Dict[str, Union[str, Dict[str, str]]]:
     """Get DuckLake table schema information."""
     try:
-        # Get table schema using DuckDB's information_schema for DuckLake tables
-        schema_query = f"SELECT column_name, data_type FROM information_schema.columns WHERE table_name = '{table_name}' AND table_schema = 'ducklake'"
-        schema_result = con.execute(schema_query).fetch_arrow_table()
-        schema = {row["column_name"]: row["data_type"] for row in schema_result.to_pylist()}
+        # Schemas only change on DDL, so repeat lookups skip the catalog scan
+        schema = schema_cache.get_or_load(table_name, lambda: load_table_schema(table_name))
         return {"name": table_name, "schema": schema, "type": "ducklake"}
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"DuckLake table '{table_name}' not found or error retrieving schema: {e}")
 
 @router.get("/tables", summary="📋 List DuckLake Tables")
+@duckdb_endpoint
 def list_tables() -> Dict[str, Union[List[str], str]]:
     """
     List all DuckLake tables.
@@ -226,34 +451,53 @@ def list_tables() -> Dict[str, Union[List[str], str]]:
     try:
         # Get all tables from DuckLake schema
         tables_query = "SELECT table_name FROM information_schema.tables WHERE table_schema = 'ducklake'"
-        tables_result = con.execute(tables_query).fetch_arrow_table()
-        tables = [row["table_name"] for row in tables_result.to_pylist()]
+        with get_cursor() as cursor:
+            tables = [row[0] for row in cursor.execute(tables_query).fetchall()]
         return {"tables": tables, "type": "ducklake"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing DuckLake tables: {e}")
 
 @router.post("/tables/{table_name}/query", summary="🔍 Query DuckLake Table")
+@duckdb_endpoint
 def query_table(table_name: str, query: Query, request: Request):
     """
     Execute a query with content negotiation based on Accept header.
     
     **Parameters:**
     - **table_name**: Name of the table to query
-    - **query**: SQL query and streaming options
+    - **query**: SQL query, streaming and JSON layout options
     - **Accept header**: Content type (json, arrow, parquet, csv)
     
     **Returns:**
     - Query results in requested format
     """
     try:
-        # Get Arrow table directly from DuckDB (zero-copy)
-        arrow_table = con.execute(query.query).fetch_arrow_table()
-        
         # Get Accept header for content negotiation
         accept_header = request.headers.get("accept", "application/json")
+        wants_arrow = "application/vnd.apache.arrow" in accept_header
+        wants_json = "application/json" in accept_header or "*/*" in accept_header
+        
+        read_only = is_read_only(query.query)
+        
+        if query.stream and (wants_arrow or wants_json) and read_only:
+            # Stream batches straight off the DuckDB result instead of materializing
+            # it: memory stays at one batch and the first bytes go out early
+            schema, batches = open_query_stream(query)
+            if wants_arrow:
+                return stream_arrow_batches(schema, batches)
+            return stream_json_record_batches(batches)
+        
+        if read_only:
+            # Identical reads (e.g. BI dashboards) are served from the result cache
+            cache_key = (query.query, orjson.dumps(query.parameters))
+            arrow_table = query_cache.get_or_compute(cache_key, lambda: execute_query(query, read_only=True))
+        else:
+            arrow_table = execute_query(query, read_only=False)
+            query_cache.invalidate()
+            schema_cache.clear()
         
         # Content negotiation based on Accept header
-        if "application/vnd.apache.arrow" in accept_header:
+        if wants_arrow:
             if query.stream:
                 return stream_arrow_table(arrow_table)
             else:
@@ -261,21 +505,30 @@ def query_table(table_name: str, query: Query, request: Request):
                     content=serialize_arrow_table(arrow_table),
                     media_type="application/vnd.apache.arrow.stream"
                 )
-        elif "application/parquet" in accept_header or "application/octet-stream" in accept_header:
+        elif "parquet" in accept_header or "application/octet-stream" in accept_header:
             return stream_parquet(arrow_table)
         elif "text/csv" in accept_header:
             return stream_csv(arrow_table)
-        elif "application/json" in accept_header or "*/*" in accept_header:
+        elif wants_json:
             if query.stream:
                 return stream_json_batches(arrow_table)
             else:
-                # Only convert to Python for JSON (unavoidable copy)
-                return {"result": arrow_table.to_pylist()}
+                # Only convert to Python for JSON (unavoidable copy); encode
+                # with orjson directly rather than via jsonable_encoder.
+                # Columnar output skips building a dict per row
+                result = arrow_table.to_pydict() if query.columnar else arrow_table.to_pylist()
+                return Response(
+                    content=orjson.dumps(
+                        {"result": result},
+                        option=orjson.OPT_SERIALIZE_NUMPY
+                    ),
+                    media_type="application/json"
+                )
         else:
             # Unsupported media type
             raise HTTPException(
                 status_code=406, 
-                detail=f"Unsupported media type: {accept_header}. Supported: application/json, application/vnd.apache.arrow.stream, application/parquet, text/csv"
+                detail=f"Unsupported media type: {accept_header}. Supported: application/json, application/vnd.apache.arrow.stream, application/vnd.apache.parquet, text/csv"
             )
                 
     except Exception as e:
@@ -284,16 +537,16 @@ def query_table(table_name: str, query: Query, request: Request):
 
 # MinIO dataset operations
 @router.post("/datasets/{bucket_name}")
-def create_bucket(bucket_name: str) -> Dict[str, str]:
+async def create_bucket(bucket_name: str) -> Dict[str, str]:
     """Create a new MinIO bucket."""
     try:
-        s3_client.create_bucket(Bucket=bucket_name)
+        await storage_manager.client.create_bucket(Bucket=bucket_name)
         return {"message": f"Bucket '{bucket_name}' created successfully."}
     except ClientError as e:
         raise HTTPException(status_code=400, detail=f"Error creating bucket: {e}")
 
 @router.put("/datasets/{bucket_name}/{object_name}")
-def upload_object(bucket_name: str, object_name: str, file: UploadFile = File(...)) -> Dict[str, str]:
+async def upload_object(bucket_name: str, object_name: str, file: UploadFile = File(...)) -> Dict[str, str]:
     """Upload an object to a MinIO bucket."""
     try:
         with performance_monitor.minio_monitor.track_operation("upload"):
@@ -301,7 +554,9 @@ def upload_object(bucket_name: str, object_name: str, file: UploadFile = File(..
             file_size = file.size if hasattr(file, 'size') else 0
             memory_monitor.track_allocation("minio_upload", file_size or 1024)
             
-            s3_client.upload_fileobj(file.file, bucket_name, object_name)
+            await storage_manager.client.upload_fileobj(
+                file.file, bucket_name, object_name, Config=storage_manager.transfer_config
+            )
             
             log_event("INFO", "Object uploaded successfully", 
                      bucket=bucket_name, object=object_name, size_bytes=file_size)
@@ -312,40 +567,73 @@ def upload_object(bucket_name: str, object_name: str, file: UploadFile = File(..
                  bucket=bucket_name, object=object_name, error=str(e))
         raise HTTPException(status_code=400, detail=f"Error uploading object: {e}")
 
+@router.put("/datasets/{bucket_name}/{object_name}/stream")
+async def upload_object_stream(bucket_name: str, object_name: str, request: Request) -> Dict[str, str]:
+    """Upload a raw request body to a MinIO bucket as it streams in.
+    
+    Unlike the multipart form upload, the body is never spooled to a
+    temporary file; it is sent on to MinIO part by part.
+    """
+    try:
+        with performance_monitor.minio_monitor.track_operation("upload"):
+            size_bytes = await storage_manager.upload_stream(bucket_name, object_name, request.stream())
+            
+            log_event("INFO", "Object uploaded successfully", 
+                     bucket=bucket_name, object=object_name, size_bytes=size_bytes)
+        
+        return {"message": f"Object '{object_name}' uploaded to bucket '{bucket_name}' successfully."}
+    except ClientError as e:
+        log_event("ERROR", "Failed to upload object", 
+                 bucket=bucket_name, object=object_name, error=str(e))
+        raise HTTPException(status_code=400, detail=f"Error uploading object: {e}")
+
+@router.post("/datasets/{bucket_name}/{object_name}/upload-url")
+async def create_upload_url(bucket_name: str, object_name: str) -> Dict[str, Union[str, int]]:
+    """Get a presigned PUT URL to upload an object directly to MinIO."""
+    try:
+        url = await storage_manager.presigned_put_url(bucket_name, object_name)
+        return {
+            "url": url,
+            "method": "PUT",
+            "expires_in": settings.storage.presigned_url_expiry
+        }
+    except ClientError as e:
+        raise HTTPException(status_code=400, detail=f"Error creating upload URL: {e}")
+
 @router.get("/datasets/{bucket_name}/{object_name}")
-def download_object(bucket_name: str, object_name: str) -> Response:
+async def download_object(bucket_name: str, object_name: str) -> Response:
     """Download an object from a MinIO bucket."""
     try:
         with performance_monitor.minio_monitor.track_operation("download"):
-            response = s3_client.get_object(Bucket=bucket_name, Key=object_name)
-            content = response['Body'].read()
+            response = await storage_manager.client.get_object(Bucket=bucket_name, Key=object_name)
+            size_bytes = response.get('ContentLength', 0)
             
-            # Track downloaded data size
-            memory_monitor.track_allocation("minio_download", len(content))
+            # Only one chunk is held in memory at a time
+            memory_monitor.track_allocation("minio_download", min(size_bytes, S3_DOWNLOAD_CHUNK_SIZE))
             
-            log_event("INFO", "Object downloaded successfully", 
-                     bucket=bucket_name, object=object_name, size_bytes=len(content))
+            log_event("INFO", "Object download started", 
+                     bucket=bucket_name, object=object_name, size_bytes=size_bytes)
             
-            return Response(content=content, media_type=response['ContentType'])
+            return stream_s3_object(response)
     except ClientError as e:
         log_event("ERROR", "Failed to download object", 
                  bucket=bucket_name, object=object_name, error=str(e))
         raise HTTPException(status_code=404, detail=f"Error downloading object: {e}")
 
 @router.delete("/datasets/{bucket_name}/{object_name}")
-def delete_object(bucket_name: str, object_name: str) -> Dict[str, str]:
+async def delete_object(bucket_name: str, object_name: str) -> Dict[str, str]:
     """Delete an object from a MinIO bucket."""
     try:
-        s3_client.delete_object(Bucket=bucket_name, Key=object_name)
+        await storage_manager.client.delete_object(Bucket=bucket_name, Key=object_name)
         return {"message": f"Object '{object_name}' from bucket '{bucket_name}' deleted successfully."}
     except ClientError as e:
         raise HTTPException(status_code=400, detail=f"Error deleting object: {e}")
 
 @router.get("/datasets/{bucket_name}")
-def list_objects(bucket_name: str) -> Dict[str, Union[str, List[str]]]:
+async def list_objects(bucket_name: str) -> Dict[str, Union[str, List[str]]]:
     """List objects in a MinIO bucket."""
     try:
-        response = s3_client.list_objects_v2(Bucket=bucket_name)
+        response = await storage_manager.client.list_objects_v2(Bucket=bucket_name)
         objects = [obj['Key'] for obj in response.get('Contents', [])]
         return {"bucket": bucket_name, "objects": objects}
     except ClientError as e:
@@ -374,13 +662,15 @@ class RegisterSnapshotRequest(BaseModel):
 
 
 @router.get("/v1/tables", response_model=List[DetachedTable])
-async def list_detached_tables():
+@duckdb_endpoint
+def list_detached_tables():
     """List all tables the authenticated user is permitted to see (detached mode)."""
     # TODO: Implement RBAC check here
     try:
         # For now, return all tables from DuckLake schema
         tables_query = "SELECT table_name FROM information_schema.tables WHERE table_schema = 'ducklake'"
-        tables_result = con.execute(tables_query).fetch_arrow_table()
+        with get_cursor() as cursor:
+            tables_result = cursor.execute(tables_query).fetch_arrow_table()
         tables = []
         for row in tables_result.to_pylist():
             # Placeholder for latest_snapshot_id, needs actual implementation
@@ -391,13 +681,15 @@ async def list_detached_tables():
         raise HTTPException(status_code=500, detail=f"Error listing tables: {e}")
 
 @router.get("/v1/tables/{table_name}/snapshots/latest", response_model=DetachedSnapshot)
-async def get_latest_detached_snapshot(table_name: str):
+@duckdb_endpoint
+def get_latest_detached_snapshot(table_name: str):
     """Retrieve the metadata for the latest snapshot of a specific table (detached mode)."""
     # TODO: Implement RBAC check here (SELECT privileges)
     try:
         # Get table schema using DuckDB's information_schema for DuckLake tables
-        schema_query = f"SELECT column_name, data_type FROM information_schema.columns WHERE table_name = '{table_name}' AND table_schema = 'ducklake'"
-        schema_result = con.execute(schema_query).fetch_arrow_table()
+        schema_query = "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = ? AND table_schema = 'ducklake'"
+        with get_cursor() as cursor:
+            schema_result = cursor.execute(schema_query, [table_name]).fetch_arrow_table()
         schema = {row["column_name"]: row["data_type"] for row in schema_result.to_pylist()}
 
         # Placeholder for URI, snapshot_id, created_at
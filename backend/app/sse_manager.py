@@ -3,6 +3,8 @@ Server-Sent Events (SSE) Manager for real-time event streaming
 """
 
 import asyncio
+import itertools
+import os
 import time
 import uuid
 from typing import Any, Dict, List, Optional, Set
@@ -13,6 +15,25 @@ from loguru import logger
 from fastapi import Request
 from fastapi.responses import StreamingResponse
 
+# Event and ping ids only need to be unique per process: a random prefix plus
+# a counter avoids a urandom read for every event sent to every client
+_event_id_prefix = uuid.uuid4().hex[:12]
+_event_ids = itertools.count(1)
+
+
+def _reset_event_ids() -> None:
+    global _event_id_prefix, _event_ids
+    _event_id_prefix = uuid.uuid4().hex[:12]
+    _event_ids = itertools.count(1)
+
+
+os.register_at_fork(after_in_child=_reset_event_ids)
+
+
+def next_event_id() -> str:
+    """Process-unique id for an SSE event"""
+    return f"{_event_id_prefix}-{next(_event_ids)}"
+
 
 class EventType(str, Enum):
     """Types of SSE events"""
@@ -36,9 +57,9 @@ class SSEEvent:
     
     def __post_init__(self):
         if self.event_id is None:
-            self.event_id = str(uuid.uuid4())
+            self.event_id = next_event_id()
     
-    def format_sse(self) -> str:
+    def format_sse(self) -> bytes:
         """Format event for SSE transmission"""
         lines = []
         
@@ -58,13 +79,11 @@ class SSEEvent:
             "timestamp": self.timestamp,
             "data": self.data
         }
-        lines.append(f"data: {orjson.dumps(event_data).decode('utf-8')}")
-        
-        # End with double newline
-        lines.append("")
-        lines.append("")
+        lines.append("data: ")
         
-        return "\n".join(lines)
+        # The JSON payload is appended as the bytes orjson produced (no
+        # decode/re-encode round trip), then ended with a double newline
+        return "\n".join(lines).encode() + orjson.dumps(event_data) + b"\n\n"
 
 
 @dataclass
@@ -370,7 +389,7 @@ class SSEManager:
                             event_type=EventType.PING,
                             data={
                                 "timestamp": time.time(),
-                                "ping_id": str(uuid.uuid4()),
+                                "ping_id": next_event_id(),
                                 "expected_pong": True
                             }
                         )
@@ -0,0 +1,164 @@
+"""
+Async MinIO/S3 client for DuckLake
+Owns one aioboto3 client for the lifetime of the application
+"""
+
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aioboto3
+from aiobotocore.config import AioConfig
+from boto3.s3.transfer import TransferConfig
+from fastapi.responses import StreamingResponse
+
+from .config import get_settings
+
+settings = get_settings()
+
+S3_DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+class StorageManager:
+    """Manages the shared async S3 client
+    
+    One client (and so one connection pool) is shared process-wide on
+    purpose; per-request clients would pay a TCP/TLS handshake each time.
+    """
+    
+    def __init__(self) -> None:
+        self.session = aioboto3.Session()
+        self.client: Optional[Any] = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        # Large uploads are split into parts sent over parallel connections
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.storage.multipart_threshold,
+            multipart_chunksize=settings.storage.multipart_chunksize,
+            max_concurrency=settings.storage.max_concurrency
+        )
+    
+    async def initialize(self) -> None:
+        """Open the S3 client"""
+        if self.client is not None:
+            return
+        
+        self._exit_stack = AsyncExitStack()
+        self.client = await self._exit_stack.enter_async_context(
+            self.session.client(
+                's3',
+                endpoint_url=f"{'https' if settings.storage.minio_secure else 'http'}://{settings.storage.minio_endpoint}",
+                aws_access_key_id=settings.storage.minio_access_key,
+                aws_secret_access_key=settings.storage.minio_secret_key.get_secret_value(),
+                region_name=settings.storage.minio_region,
+                config=AioConfig(
+                    signature_version='s3v4',
+                    max_pool_connections=settings.storage.max_pool_connections,
+                    tcp_keepalive=True,
+                    retries={'max_attempts': settings.storage.max_retry_attempts, 'mode': 'adaptive'},
+                    # Keep idle connections (and their TLS sessions) around for reuse
+                    connector_args={'keepalive_timeout': settings.storage.keepalive_timeout}
+                )
+            )
+        )
+    
+    async def presigned_put_url(self, bucket_name: str, object_name: str) -> str:
+        """Presigned PUT URL so clients can upload straight to MinIO"""
+        return await self.client.generate_presigned_url(
+            'put_object',
+            Params={'Bucket': bucket_name, 'Key': object_name},
+            ExpiresIn=settings.storage.presigned_url_expiry
+        )
+    
+    async def upload_stream(self, bucket_name: str, object_name: str, chunks: AsyncIterator[bytes]) -> int:
+        """Upload a byte stream as it arrives, without spooling it to disk
+        
+        The stream is cut into multipart_chunksize parts, at most
+        max_concurrency of them in flight (and so in memory) at once. A body
+        smaller than one part goes up as a single PUT. Returns the byte count.
+        """
+        part_size = settings.storage.multipart_chunksize
+        slots = asyncio.Semaphore(settings.storage.max_concurrency)
+        buffer = bytearray()
+        total = 0
+        upload_id: Optional[str] = None
+        parts: List[asyncio.Task] = []
+        
+        async def upload_part(part_number: int, body: bytes) -> Dict[str, Any]:
+            try:
+                response = await self.client.upload_part(
+                    Bucket=bucket_name, Key=object_name, UploadId=upload_id,
+                    PartNumber=part_number, Body=body
+                )
+            finally:
+                slots.release()
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        
+        async def start_part(body: bytes) -> None:
+            await slots.acquire()
+            parts.append(asyncio.create_task(upload_part(len(parts) + 1, body)))
+        
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                total += len(chunk)
+                while len(buffer) >= part_size:
+                    if upload_id is None:
+                        response = await self.client.create_multipart_upload(Bucket=bucket_name, Key=object_name)
+                        upload_id = response["UploadId"]
+                    await start_part(bytes(memoryview(buffer)[:part_size]))
+                    del buffer[:part_size]
+            
+            if upload_id is None:
+                await self.client.put_object(Bucket=bucket_name, Key=object_name, Body=bytes(buffer))
+                return total
+            
+            if buffer:
+                await start_part(bytes(buffer))
+            completed = await asyncio.gather(*parts)
+            await self.client.complete_multipart_upload(
+                Bucket=bucket_name, Key=object_name, UploadId=upload_id,
+                MultipartUpload={"Parts": completed}
+            )
+            return total
+        except BaseException:
+            # Don't leave orphaned parts (which MinIO keeps, and bills space for) behind
+            for task in parts:
+                task.cancel()
+            # Wait for the cancelled parts to finish, so none lands after the abort
+            await asyncio.gather(*parts, return_exceptions=True)
+            if upload_id is not None:
+                await asyncio.shield(self.client.abort_multipart_upload(
+                    Bucket=bucket_name, Key=object_name, UploadId=upload_id
+                ))
+            raise
+    
+    async def close(self) -> None:
+        """Close the S3 client and its connection pool"""
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+            self.client = None
+
+
+def stream_s3_object(response: Dict[str, Any]):
+    """Stream an S3 get_object body in fixed-size chunks."""
+    body = response['Body']
+    
+    async def generate():
+        async with body:
+            async for chunk in body.iter_chunks(S3_DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+    
+    headers = {}
+    if response.get('ContentLength') is not None:
+        headers["Content-Length"] = str(response['ContentLength'])
+    
+    return StreamingResponse(
+        generate(),
+        media_type=response.get('ContentType', "application/octet-stream"),
+        headers=headers
+    )
+
+
+# Global storage manager instance
+storage_manager = StorageManager()
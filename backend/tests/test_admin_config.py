@@ -0,0 +1,56 @@
+"""Route-level tests for the admin configuration endpoints"""
+
+import importlib
+import sys
+import types
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import clear_settings_cache
+from app.responses import ORJSONResponse
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """TestClient over the admin router alone
+
+    app.main connects to DuckLake on import (and imports the routers back),
+    so the names the router takes from it are provided by a stand-in module.
+    """
+    main = types.ModuleType("app.main")
+    main._ducklake_connection_status = {"connected": False}
+    main.setup_ducklake_connection = lambda: None
+    main.validate_ducklake_connection = lambda: False
+    main.setup_ducklake_fallback = lambda: None
+    main.log_event = lambda level, message, **kwargs: None
+    main.current_request_id = lambda: "test-request"
+    monkeypatch.setitem(sys.modules, "app.main", main)
+    monkeypatch.delitem(sys.modules, "app.routers.admin", raising=False)
+    admin = importlib.import_module("app.routers.admin")
+    monkeypatch.delitem(sys.modules, "app.routers.admin")
+
+    clear_settings_cache()
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.include_router(admin.router)
+    yield TestClient(app)
+    clear_settings_cache()
+
+
+def test_validate_config_returns_the_summary(client):
+    first = client.get("/admin/config/validate")
+    # The second call is served from the cached validation
+    second = client.get("/admin/config/validate")
+
+    assert first.status_code == 200
+    assert first.json()["valid"] is True
+    assert isinstance(first.json()["config_summary"], dict)
+    assert second.json() == first.json()
+
+
+def test_config_summary_endpoint(client):
+    response = client.get("/admin/config/summary")
+
+    assert response.status_code == 200
+    assert "environment" in response.json()
@@ -0,0 +1,161 @@
+"""Tests for the lineage enqueue buffer and its flush loop"""
+
+import asyncio
+
+import orjson
+import pytest
+
+from app import lineage as lineage_module
+from app.lineage import LineageEvent, LineageManager
+
+
+def make_event(run_id: str, event_type: str = "RUNNING", **run: object) -> LineageEvent:
+    return LineageEvent(
+        eventType=event_type,
+        run={"runId": run_id, **run},
+        job={"namespace": "test", "name": "job"}
+    )
+
+
+class FakeQueue:
+    """Stands in for _send_batch: records sent batches, failing the first few sends"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.attempts = 0
+        self.batches = []
+
+    async def send(self, batch):
+        self.attempts += 1
+        if self.failures:
+            self.failures -= 1
+            return False
+        self.batches.append([orjson.loads(raw) for raw in batch])
+        return True
+
+    @property
+    def events(self):
+        return [event for batch in self.batches for event in batch]
+
+
+@pytest.fixture
+def queue_settings(monkeypatch):
+    queue = lineage_module.settings.queue
+    monkeypatch.setattr(queue, "async_insert_max_rows", 2)
+    monkeypatch.setattr(queue, "queue_retry_attempts", 3)
+    monkeypatch.setattr(queue, "queue_retry_delay", 0.001)
+    return queue
+
+
+def start_manager(fake: FakeQueue) -> LineageManager:
+    """Manager with a running flush loop and no database pools"""
+    manager = LineageManager()
+    manager._send_batch = fake.send
+    manager._flush_task = asyncio.create_task(manager._flush_loop())
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_enqueue_without_flush_loop_is_rejected():
+    manager = LineageManager()
+
+    assert await manager.enqueue_event(make_event("run-1")) is False
+    assert manager._current_batch == {}
+
+
+@pytest.mark.asyncio
+async def test_enqueue_keeps_latest_non_terminal_event_per_run_and_type():
+    manager = LineageManager()
+    # A pending future stands in for the flush loop, so nothing is drained
+    manager._flush_task = asyncio.get_running_loop().create_future()
+
+    assert await manager.enqueue_events_batch([
+        make_event("run-1", "START", attempt=1),
+        make_event("run-1", "RUNNING", attempt=1),
+        make_event("run-1", "RUNNING", attempt=2),
+        make_event("run-2", "RUNNING", attempt=1),
+    ])
+
+    batch = {key: orjson.loads(raw) for key, raw in manager._current_batch.items()}
+    assert set(batch) == {("run-1", "START"), ("run-1", "RUNNING"), ("run-2", "RUNNING")}
+    assert batch[("run-1", "RUNNING")]["run"]["attempt"] == 2
+    manager._flush_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_never_coalesces_terminal_events():
+    manager = LineageManager()
+    manager._flush_task = asyncio.get_running_loop().create_future()
+
+    await manager.enqueue_events_batch([make_event("run-1", "COMPLETE") for _ in range(3)])
+    await manager.enqueue_event(make_event("run-1", "FAIL"))
+
+    assert len(manager._current_batch) == 4
+    manager._flush_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_is_refused_once_the_buffer_is_full(monkeypatch):
+    monkeypatch.setattr(lineage_module.settings.queue, "lineage_buffer_max_events", 3)
+    manager = LineageManager()
+    manager._flush_task = asyncio.get_running_loop().create_future()
+
+    assert await manager.enqueue_events_batch([make_event(f"run-{i}") for i in range(2)])
+    assert not await manager.enqueue_events_batch([make_event(f"run-{i}") for i in range(2, 4)])
+    assert await manager.enqueue_event(make_event("run-2"))
+    assert not await manager.enqueue_event(make_event("run-3"))
+
+    assert len(manager._current_batch) == 3
+    manager._flush_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_buffered_events(queue_settings):
+    fake = FakeQueue()
+    manager = start_manager(fake)
+
+    await manager.enqueue_events_batch([make_event(f"run-{i}") for i in range(5)])
+    await manager.close()
+
+    assert [event["run"]["runId"] for event in fake.events] == [f"run-{i}" for i in range(5)]
+    assert max(len(batch) for batch in fake.batches) == 2
+    assert manager._current_batch == {}
+    assert manager._flush_task is None
+
+
+@pytest.mark.asyncio
+async def test_failed_send_is_retried(queue_settings):
+    fake = FakeQueue(failures=2)
+    manager = start_manager(fake)
+
+    await manager.enqueue_events_batch([make_event(f"run-{i}") for i in range(3)])
+    await manager.close()
+
+    assert sorted(event["run"]["runId"] for event in fake.events) == ["run-0", "run-1", "run-2"]
+    assert fake.attempts == 4  # two failures, then both slices
+
+
+@pytest.mark.asyncio
+async def test_retry_prefers_newer_event_for_the_same_key(queue_settings):
+    fake = FakeQueue(failures=1)
+    manager = start_manager(fake)
+
+    await manager.enqueue_event(make_event("run-1", attempt=1))
+    await asyncio.sleep(0)  # the first send fails and its event goes back
+    await manager.enqueue_event(make_event("run-1", attempt=2))
+    await manager.close()
+
+    assert [event["run"]["attempt"] for event in fake.events] == [2]
+
+
+@pytest.mark.asyncio
+async def test_close_gives_up_after_repeated_failures(queue_settings):
+    fake = FakeQueue(failures=100)
+    manager = start_manager(fake)
+
+    await manager.enqueue_event(make_event("run-1"))
+    await asyncio.wait_for(manager.close(), timeout=5)
+
+    assert fake.events == []
+    assert fake.attempts == queue_settings.queue_retry_attempts
+    assert manager._current_batch == {}
@@ -0,0 +1,109 @@
+"""Tests for the lineage listing cache"""
+
+import asyncio
+import types
+
+import pytest
+
+from app.routers import lineage as lineage_router
+from app.routers.lineage import ListingCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the lineage router"""
+    fake = types.SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(lineage_router, "time", fake)
+    return fake
+
+
+class Renderer:
+    """Async render callback that counts calls and returns b"<n>" for the n-th call"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self) -> bytes:
+        self.calls += 1
+        return str(self.calls).encode()
+
+
+@pytest.mark.asyncio
+async def test_listing_cache_serves_body_until_ttl_expires(clock):
+    cache = ListingCache(ttl=10.0)
+    render = Renderer()
+
+    assert await cache.get_or_render("jobs", render) == b"1"
+    clock.now += 9.9
+    assert await cache.get_or_render("jobs", render) == b"1"
+    clock.now += 0.2
+    assert await cache.get_or_render("jobs", render) == b"2"
+
+
+@pytest.mark.asyncio
+async def test_listing_cache_keys_are_independent(clock):
+    cache = ListingCache(ttl=10.0)
+
+    assert await cache.get_or_render("jobs", Renderer()) == b"1"
+    assert await cache.get_or_render("datasets", Renderer()) == b"1"
+    assert await cache.get_or_render("jobs", Renderer()) == b"1"
+
+
+@pytest.mark.asyncio
+async def test_listing_cache_invalidate_forces_refresh(clock):
+    cache = ListingCache(ttl=10.0)
+    render = Renderer()
+    await cache.get_or_render("jobs", render)
+    cache.invalidate()
+
+    assert await cache.get_or_render("jobs", render) == b"2"
+
+
+@pytest.mark.asyncio
+async def test_listing_cache_skips_body_rendered_across_invalidation(clock):
+    cache = ListingCache(ttl=10.0)
+
+    async def render_during_ingest() -> bytes:
+        cache.invalidate()
+        return b"stale"
+
+    assert await cache.get_or_render("jobs", render_during_ingest) == b"stale"
+    assert await cache.get_or_render("jobs", Renderer()) == b"1"
+
+
+@pytest.mark.asyncio
+async def test_listing_cache_renders_concurrent_misses_once():
+    cache = ListingCache(ttl=10.0)
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_render() -> bytes:
+        calls.append(1)
+        await release.wait()
+        return b"[]"
+
+    waiters = [asyncio.create_task(cache.get_or_render("jobs", slow_render)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [b"[]"] * 5
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_listing_cache_retries_after_failed_render():
+    cache = ListingCache(ttl=10.0)
+
+    async def failing() -> bytes:
+        raise RuntimeError("database unavailable")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_render("jobs", failing)
+    assert await cache.get_or_render("jobs", Renderer()) == b"1"
+
+
+def test_listing_cache_disabled_by_zero_ttl():
+    assert not ListingCache(ttl=0).enabled
+    assert not ListingCache(ttl=10.0, enabled=False).enabled
+    assert ListingCache(ttl=10.0).enabled
@@ -0,0 +1,215 @@
+"""Tests for the DuckLake read caches and the read-only classifier"""
+
+import threading
+import types
+
+import pytest
+
+from app import query_cache as query_cache_module
+from app.query_cache import QueryResultCache, TableSchemaCache, is_read_only
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the cache module"""
+    fake = types.SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(query_cache_module, "time", fake)
+    return fake
+
+
+class Counter:
+    """Callable that counts its calls and returns the call number"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT 1",
+    "  select * from ducklake.events where id = ?",
+    "WITH t AS (SELECT 1 AS x) SELECT x FROM t",
+    "DESCRIBE SELECT 1",
+    "SELECT 1;",
+])
+def test_is_read_only_accepts_single_reads(sql):
+    assert is_read_only(sql)
+
+
+@pytest.mark.parametrize("sql", [
+    "INSERT INTO t VALUES (1)",
+    "CREATE TABLE t (x INTEGER)",
+    "SET threads = 1",
+    "SELECT 1; DROP TABLE t",
+    "SELECT 1; SET threads = 1",
+    "SELECT 1; SELECT 2",
+    "SELEC 1",
+    "",
+])
+def test_is_read_only_rejects_everything_else(sql):
+    assert not is_read_only(sql)
+
+
+def test_result_cache_hits_until_ttl_expires(clock):
+    cache = QueryResultCache(maxsize=4, ttl=10.0)
+    compute = Counter()
+
+    assert cache.get_or_compute("q", compute) == 1
+    clock.now += 9.9
+    assert cache.get_or_compute("q", compute) == 1
+    clock.now += 0.2
+    assert cache.get_or_compute("q", compute) == 2
+    assert compute.calls == 2
+
+
+def test_result_cache_evicts_least_recently_used(clock):
+    cache = QueryResultCache(maxsize=2, ttl=60.0)
+    cache.get_or_compute("a", lambda: "a1")
+    cache.get_or_compute("b", lambda: "b1")
+    cache.get_or_compute("a", lambda: "a2")  # refreshes "a"
+    cache.get_or_compute("c", lambda: "c1")  # evicts "b"
+
+    assert cache.get_or_compute("a", lambda: "a3") == "a1"
+    assert cache.get_or_compute("b", lambda: "b2") == "b2"
+
+
+def test_result_cache_invalidate_drops_entries(clock):
+    cache = QueryResultCache(maxsize=4, ttl=60.0)
+    compute = Counter()
+    cache.get_or_compute("q", compute)
+    cache.invalidate()
+
+    assert cache.get_or_compute("q", compute) == 2
+
+
+def test_result_cache_skips_results_computed_across_invalidation(clock):
+    cache = QueryResultCache(maxsize=4, ttl=60.0)
+
+    def compute_during_write():
+        cache.invalidate()
+        return "stale"
+
+    assert cache.get_or_compute("q", compute_during_write) == "stale"
+    assert cache.get_or_compute("q", lambda: "fresh") == "fresh"
+
+
+def test_result_cache_runs_concurrent_misses_once():
+    cache = QueryResultCache(maxsize=4, ttl=60.0)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_compute():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_compute("q", slow_compute)))
+    leader.start()
+    assert started.wait(timeout=5)
+    followers = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("q", slow_compute)))
+        for _ in range(4)
+    ]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(timeout=5)
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+
+
+def test_result_cache_retries_after_failed_compute(clock):
+    cache = QueryResultCache(maxsize=4, ttl=60.0)
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("q", failing)
+    assert cache.get_or_compute("q", lambda: "ok") == "ok"
+
+
+def test_disabled_result_cache_always_computes():
+    cache = QueryResultCache(maxsize=4, ttl=60.0, enabled=False)
+    compute = Counter()
+    cache.get_or_compute("q", compute)
+
+    assert cache.get_or_compute("q", compute) == 2
+    assert not QueryResultCache(maxsize=0, ttl=60.0).enabled
+
+
+def test_schema_cache_loads_once_per_table():
+    cache = TableSchemaCache(ttl=60.0)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"id": "INTEGER"}
+
+    assert cache.get_or_load("events", load) == {"id": "INTEGER"}
+    assert cache.get_or_load("events", load) == {"id": "INTEGER"}
+    assert len(loads) == 1
+
+
+def test_schema_cache_does_not_cache_unknown_tables():
+    cache = TableSchemaCache(ttl=60.0)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {}
+
+    cache.get_or_load("missing", load)
+    cache.get_or_load("missing", load)
+    assert len(loads) == 2
+
+
+def test_schema_cache_discard_and_clear():
+    cache = TableSchemaCache(ttl=60.0)
+    cache.get_or_load("a", lambda: {"x": "INTEGER"})
+    cache.get_or_load("b", lambda: {"y": "INTEGER"})
+
+    cache.discard("a")
+    assert cache.get_or_load("a", lambda: {"x": "BIGINT"}) == {"x": "BIGINT"}
+    assert cache.get_or_load("b", lambda: {"y": "BIGINT"}) == {"y": "INTEGER"}
+
+    cache.clear()
+    assert cache.get_or_load("b", lambda: {"y": "BIGINT"}) == {"y": "BIGINT"}
+
+
+def test_schema_cache_skips_schema_loaded_across_ddl():
+    cache = TableSchemaCache(ttl=60.0)
+
+    def load_during_ddl():
+        cache.discard("a")
+        return {"x": "INTEGER"}
+
+    cache.get_or_load("a", load_during_ddl)
+    assert cache.get_or_load("a", lambda: {"x": "BIGINT"}) == {"x": "BIGINT"}
+
+
+def test_schema_cache_expires_after_ttl(clock):
+    cache = TableSchemaCache(ttl=5.0)
+    cache.get_or_load("a", lambda: {"x": "INTEGER"})
+
+    clock.now += 4.9
+    assert cache.get_or_load("a", lambda: {"x": "BIGINT"}) == {"x": "INTEGER"}
+    clock.now += 0.2
+    assert cache.get_or_load("a", lambda: {"x": "BIGINT"}) == {"x": "BIGINT"}
+
+
+def test_schema_cache_disabled_by_zero_ttl():
+    cache = TableSchemaCache(ttl=0)
+    cache.get_or_load("a", lambda: {"x": "INTEGER"})
+
+    assert not cache.enabled
+    assert cache.get_or_load("a", lambda: {"x": "BIGINT"}) == {"x": "BIGINT"}
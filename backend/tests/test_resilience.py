@@ -0,0 +1,189 @@
+"""Tests for the circuit breaker and retry backoff"""
+
+import asyncio
+import types
+
+import pytest
+
+from app import resilience as resilience_module
+from app.exceptions import ResourceException, TimeoutError
+from app.resilience import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitState,
+    RetryableOperation,
+    RetryConfig,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the resilience module"""
+    fake = types.SimpleNamespace(now_ns=10**12)
+    fake.monotonic_ns = lambda: fake.now_ns
+    fake.monotonic = lambda: fake.now_ns / 1e9
+    monkeypatch.setattr(resilience_module, "time", fake)
+    return fake
+
+
+async def ok(value="ok"):
+    return value
+
+
+async def fail():
+    raise ConnectionError("down")
+
+
+async def trip(breaker: CircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        with pytest.raises(ConnectionError):
+            await breaker.call(fail)
+
+
+def make_breaker(**config) -> CircuitBreaker:
+    config.setdefault("failure_threshold", 3)
+    config.setdefault("recovery_timeout", 60.0)
+    config.setdefault("success_threshold", 2)
+    return CircuitBreaker("test", CircuitBreakerConfig(**config))
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_failure_threshold(clock):
+    breaker = make_breaker()
+
+    await trip(breaker, 2)
+    assert breaker.stats.state is CircuitState.CLOSED
+    await trip(breaker, 1)
+    assert breaker.stats.state is CircuitState.OPEN
+
+    with pytest.raises(ResourceException):
+        await breaker.call(ok)
+    assert breaker.stats.total_requests == 4
+    assert breaker.stats.total_failures == 3
+
+
+@pytest.mark.asyncio
+async def test_breaker_success_resets_failure_count(clock):
+    breaker = make_breaker()
+
+    await trip(breaker, 2)
+    assert await breaker.call(ok) == "ok"
+    await trip(breaker, 2)
+
+    assert breaker.stats.state is CircuitState.CLOSED
+    assert breaker.stats.failure_count == 2
+
+
+@pytest.mark.asyncio
+async def test_breaker_half_opens_after_recovery_timeout_then_closes(clock):
+    breaker = make_breaker()
+    await trip(breaker, 3)
+
+    clock.now_ns += 59 * 10**9
+    with pytest.raises(ResourceException):
+        await breaker.call(ok)
+
+    clock.now_ns += 1 * 10**9
+    assert await breaker.call(ok) == "ok"
+    assert breaker.stats.state is CircuitState.HALF_OPEN
+    assert await breaker.call(ok) == "ok"
+    assert breaker.stats.state is CircuitState.CLOSED
+    assert breaker.stats.failure_count == 0
+
+
+@pytest.mark.asyncio
+async def test_breaker_half_open_failure_reopens(clock):
+    breaker = make_breaker()
+    await trip(breaker, 3)
+    clock.now_ns += 60 * 10**9
+
+    await trip(breaker, 1)
+    assert breaker.stats.state is CircuitState.OPEN
+    # The recovery window restarts from the latest failure
+    clock.now_ns += 30 * 10**9
+    with pytest.raises(ResourceException):
+        await breaker.call(ok)
+
+
+@pytest.mark.asyncio
+async def test_breaker_ignores_unexpected_exceptions(clock):
+    breaker = make_breaker(expected_exceptions=(ConnectionError,))
+
+    async def bad_input():
+        raise ValueError("bad input")
+
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            await breaker.call(bad_input)
+    assert breaker.stats.state is CircuitState.CLOSED
+    assert breaker.stats.total_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_breaker_timeout_counts_as_failure():
+    breaker = make_breaker(failure_threshold=1, timeout=0.01)
+
+    with pytest.raises(TimeoutError):
+        await breaker.call(asyncio.sleep, 1)
+    assert breaker.stats.state is CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_breaker_passes_arguments_through():
+    breaker = make_breaker(timeout=0)
+
+    assert await breaker.call(ok, value="passed") == "passed"
+
+
+def test_calculate_delay_without_jitter_is_capped_exponential():
+    operation = RetryableOperation("test", RetryConfig(
+        max_attempts=6, base_delay=1.0, max_delay=10.0, exponential_base=2.0, jitter=False
+    ))
+
+    assert [operation._calculate_delay(attempt) for attempt in range(1, 7)] == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+    # Attempts past max_attempts reuse the last cap
+    assert operation._calculate_delay(20) == 10.0
+
+
+def test_calculate_delay_full_jitter_stays_below_cap(monkeypatch):
+    operation = RetryableOperation("test", RetryConfig(max_attempts=3, base_delay=1.0, jitter=True))
+
+    monkeypatch.setattr(resilience_module.random, "random", lambda: 0.5)
+    assert operation._calculate_delay(3) == 2.0
+    monkeypatch.setattr(resilience_module.random, "random", lambda: 0.0)
+    assert operation._calculate_delay(3) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_retry_succeeds_after_transient_failures():
+    operation = RetryableOperation("test", RetryConfig(max_attempts=3, base_delay=0.0, jitter=False))
+    attempts = []
+
+    async def flaky(value):
+        attempts.append(value)
+        if len(attempts) < 3:
+            raise ConnectionError("down")
+        return value
+
+    assert await operation.execute(flaky, "done") == "done"
+    assert len(attempts) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_reraises_last_error_and_skips_non_retryable():
+    operation = RetryableOperation("test", RetryConfig(
+        max_attempts=2, base_delay=0.0, jitter=False, retryable_exceptions=(ConnectionError,)
+    ))
+
+    with pytest.raises(ConnectionError):
+        await operation.execute(fail)
+
+    attempts = []
+
+    async def bad_input():
+        attempts.append(1)
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        await operation.execute(bad_input)
+    assert len(attempts) == 1